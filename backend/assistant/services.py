@@ -1,7 +1,7 @@
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 
-from databases.utils import format_schema
+from databases.services.payloads import SchemaRendering, get_schema_payload
 from exercises.models.attempt import Attempt
 from openai import OpenAI
 from openai.types.chat import ChatCompletionMessageParam
@@ -24,10 +24,12 @@ def build_system_prompt(query: Query | Attempt, system_prompt: str | None) -> st
     if system_prompt:
         lines.append(system_prompt)
 
+    # Relational algebra names relations and their attributes as R(a, b)
+    rendering = SchemaRendering.COMPACT if query.language == 'ra' else SchemaRendering.TEXT
     lines += [
         '',
         'The database schema is:',
-        f'{format_schema(query.database.schema)}',
+        get_schema_payload(query.database, rendering).decode(),
         '',
     ]
 
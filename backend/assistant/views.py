@@ -1,18 +1,28 @@
+from django.db import transaction
+
+from assistant.models import Message
 from assistant.serializers import MessageSerializer
 from assistant.services import assist
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.request import Request
 from rest_framework.response import Response
 
 
+class MessagePagination(LimitOffsetPagination):
+    default_limit = 50
+    max_limit = 200
+
+
 class MessagesMixin:
     @extend_schema(
         request=MessageSerializer,
         responses=MessageSerializer,
     )
     @action(detail=True, methods=['post'], url_path='messages')
+    @transaction.non_atomic_requests
     def create_message(self, request: Request, pk: str) -> Response:
         parent = self.get_object()  # type: ignore[attr-defined]
 
@@ -27,5 +37,24 @@ class MessagesMixin:
 
         return Response(MessageSerializer(assistant_msg).data, status=status.HTTP_201_CREATED)
 
+    @extend_schema(
+        request=None,
+        responses=MessageSerializer(many=True),
+    )
+    @create_message.mapping.get
+    # Shares its route with create_message, which only runs outside requests' transactions if
+    # every action of the route does
+    @transaction.non_atomic_requests
+    def list_messages(self, request: Request, pk: str) -> Response:
+        """Messages with the assistant, most recent first."""
+        parent = self.get_object()  # type: ignore[attr-defined]
+        paginator = MessagePagination()
+        messages: list[Message] | None = paginator.paginate_queryset(
+            parent.assistant_messages.order_by('-created', '-id'),
+            request,
+            view=self,  # type: ignore[arg-type]
+        )
+        return paginator.get_paginated_response(MessageSerializer(messages, many=True).data)
+
     def _system_prompt(self) -> str | None:
         return None
@@ -0,0 +1,83 @@
+import json
+import time
+from http.cookiejar import CookieJar
+from typing import Any
+from urllib.error import HTTPError, URLError
+from urllib.request import HTTPCookieProcessor, Request, build_opener
+
+
+class ApiSession:
+    """Cookie-based session against a running instance of the API."""
+
+    def __init__(self, base_url: str, timeout: float = 60.0) -> None:
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self._cookies = CookieJar()
+        self._opener = build_opener(HTTPCookieProcessor(self._cookies))
+        self.server_timings: dict[str, float] = {}
+
+    def login(self, email: str, password: str) -> None:
+        status, _, _ = self.request(
+            'POST', '/api/auth/login/', {'username': email, 'password': password}
+        )
+        if status != 200:
+            raise RuntimeError(f'Could not log in as {email} (HTTP {status})')
+
+    def request(
+        self, method: str, path: str, body: dict[str, Any] | None = None
+    ) -> tuple[int, Any, float]:
+        """Send a request, keeping the ``Server-Timing`` metrics of its response."""
+        data = json.dumps(body).encode() if body is not None else None
+        request = Request(  # noqa: S310
+            f'{self.base_url}{path}',
+            data=data,
+            method=method,
+            headers=self._headers(),
+        )
+
+        self.server_timings = {}
+        start = time.perf_counter()
+        try:
+            with self._opener.open(request, timeout=self.timeout) as response:
+                payload = response.read()
+                status = response.status
+                headers = response.headers
+        except HTTPError as e:
+            payload = e.read()
+            status = e.code
+            headers = e.headers
+        except (URLError, TimeoutError):
+            return 0, None, time.perf_counter() - start
+        elapsed = time.perf_counter() - start
+        self.server_timings = parse_server_timing(headers.get('Server-Timing', ''))
+
+        return status, _decode(payload), elapsed
+
+    def _headers(self) -> dict[str, str]:
+        headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+        csrf_token = next((c.value for c in self._cookies if c.name == 'csrftoken'), None)
+        if csrf_token:
+            headers['X-CSRFToken'] = csrf_token
+        return headers
+
+
+def parse_server_timing(header: str) -> dict[str, float]:
+    """Durations of the metrics of a ``Server-Timing`` header, in seconds."""
+    timings = {}
+    for metric in header.split(','):
+        name, *params = (part.strip() for part in metric.split(';'))
+        for param in params:
+            key, _, value = param.partition('=')
+            if key == 'dur':
+                try:
+                    timings[name] = float(value) / 1000
+                except ValueError:
+                    pass
+    return timings
+
+
+def _decode(payload: bytes) -> Any:
+    try:
+        return json.loads(payload) if payload else None
+    except ValueError:
+        return None
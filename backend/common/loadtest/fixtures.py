@@ -0,0 +1,199 @@
+import random
+import sqlite3
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import queries.services.ra.ast as ra
+from databases.models import Database
+from exercises.models import Attempt, Exercise
+from projects.models import Project, Query
+from queries.models import Language
+from queries.services.ra.ast import attribute
+from queries.services.ra.ast.factory import query
+from users.models import User
+
+
+TARGET_DATABASE_NAME = 'Load test target'
+USER_EMAIL_TEMPLATE = 'loadtest-{}@querycod.com'
+
+_TARGET_DDL = [
+    'CREATE TABLE branch (sortcode INTEGER PRIMARY KEY, bname VARCHAR(20) NOT NULL, cash NUMERIC NOT NULL)',
+    'CREATE TABLE account (no INTEGER PRIMARY KEY, type VARCHAR(10) NOT NULL, cname VARCHAR(20) NOT NULL, rate NUMERIC, sortcode INTEGER NOT NULL REFERENCES branch(sortcode))',
+    'CREATE TABLE movement (mid INTEGER PRIMARY KEY, no INTEGER NOT NULL REFERENCES account(no), amount NUMERIC NOT NULL, tdate DATE NOT NULL)',
+]
+
+SQL_QUERIES: list[tuple[str, list[str]]] = [
+    (
+        'Accounts with branch names',
+        [
+            "SELECT branch.bname, no FROM account JOIN branch ON account.sortcode = branch.sortcode WHERE account.type = 'current'",
+            "SELECT branch.bname, no, cname FROM account JOIN branch ON account.sortcode = branch.sortcode WHERE account.type = 'deposit'",
+        ],
+    ),
+    (
+        'Large withdrawals',
+        [
+            'SELECT no FROM account WHERE no IN (SELECT no FROM movement WHERE amount < -500)',
+            'SELECT no, cname FROM account WHERE no IN (SELECT no FROM movement WHERE amount < -900)',
+        ],
+    ),
+    (
+        'Movements per account',
+        [
+            'SELECT no, COUNT(mid) AS total FROM movement GROUP BY no HAVING COUNT(mid) > 2',
+            'SELECT no, SUM(amount) AS balance FROM movement GROUP BY no',
+        ],
+    ),
+]
+
+RA_QUERIES: list[tuple[str, list[ra.RAQuery]]] = [
+    (
+        'Customers with withdrawals',
+        [
+            query('account')
+            .natural_join('movement')
+            .select(ra.LT(attribute('amount'), 0))
+            .project('cname'),
+            query('account')
+            .natural_join('movement')
+            .select(ra.LT(attribute('amount'), -500))
+            .project('cname', 'no'),
+        ],
+    ),
+    (
+        'Branches without deposit accounts',
+        [
+            query('branch')
+            .project('sortcode')
+            .difference(
+                query('account').select(ra.EQ(attribute('type'), 'deposit')).project('sortcode')
+            ),
+        ],
+    ),
+]
+
+EXERCISES: list[tuple[str, Language, str]] = [
+    (
+        'Current account holders',
+        Language.SQL,
+        "SELECT DISTINCT cname FROM account WHERE type = 'current'",
+    ),
+    (
+        'Accounts with movements',
+        Language.RA,
+        query('account').natural_join('movement').project('no').latex(),
+    ),
+]
+
+
+@dataclass
+class UserFixture:
+    email: str
+    sql_queries: dict[int, list[str]] = field(default_factory=dict)
+    ra_queries: dict[int, list[str]] = field(default_factory=dict)
+    subquery_counts: dict[int, int] = field(default_factory=dict)
+    attempts: dict[int, str] = field(default_factory=dict)
+
+    @property
+    def queries(self) -> dict[int, list[str]]:
+        return self.sql_queries | self.ra_queries
+
+
+def create_target_database(path: Path, rows: int, seed: int = 0) -> None:
+    """Create a SQLite stand-in for a teaching database, with ``rows`` accounts."""
+    path.unlink(missing_ok=True)
+    rng = random.Random(seed)  # noqa: S311
+    branches = max(rows // 50, 1)
+
+    with sqlite3.connect(path) as conn:
+        for statement in _TARGET_DDL:
+            conn.execute(statement)
+
+        conn.executemany(
+            'INSERT INTO branch VALUES (?, ?, ?)',
+            [(i, f'Branch {i}', rng.randint(1_000, 50_000)) for i in range(branches)],
+        )
+        conn.executemany(
+            'INSERT INTO account VALUES (?, ?, ?, ?, ?)',
+            [
+                (
+                    i,
+                    rng.choice(['current', 'deposit']),
+                    f'Customer {rng.randrange(rows)}',
+                    round(rng.uniform(0, 5), 2),
+                    rng.randrange(branches),
+                )
+                for i in range(rows)
+            ],
+        )
+        conn.executemany(
+            'INSERT INTO movement VALUES (?, ?, ?, ?)',
+            [
+                (
+                    i,
+                    rng.randrange(rows),
+                    rng.randint(-1_000, 1_000),
+                    f'2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+                )
+                for i in range(rows * 4)
+            ],
+        )
+
+
+def seed_fixtures(target_path: Path, users: int, password: str) -> list[UserFixture]:
+    """(Re)create load test users with their projects, queries and exercise attempts."""
+    User.objects.filter(email__startswith='loadtest-').delete()
+    Database.objects.filter(name=TARGET_DATABASE_NAME).delete()
+
+    database = Database.objects.create(
+        name=TARGET_DATABASE_NAME,
+        description='Local SQLite stand-in used by the load test harness.',
+        host='',
+        port=0,
+        user='',
+        password='',
+        database_name=str(target_path),
+        database_type=Database.DatabaseType.SQLITE,
+    )
+
+    exercises = [
+        Exercise.objects.create(
+            title=title,
+            description=title,
+            solution=solution,
+            language=language,
+            difficulty=Exercise.Difficulty.EASY,
+            database=database,
+        )
+        for title, language, solution in EXERCISES
+    ]
+
+    fixtures: list[UserFixture] = []
+    for i in range(users):
+        email = USER_EMAIL_TEMPLATE.format(i)
+        user = User.objects.create_user(email=email, password=password)
+        project = Project.objects.create(name='Load test', database=database, user=user)
+        fixture = UserFixture(email=email)
+
+        for name, texts in SQL_QUERIES:
+            sql_query = Query.objects.create(
+                name=name, text=texts[0], project=project, _language=Language.SQL
+            )
+            fixture.sql_queries[sql_query.id] = texts
+            fixture.subquery_counts[sql_query.id] = len(sql_query.subqueries)
+
+        for name, asts in RA_QUERIES:
+            ra_query = Query.objects.create(
+                name=name, text=asts[0].latex(), project=project, _language=Language.RA
+            )
+            fixture.ra_queries[ra_query.id] = [ast.latex() for ast in asts]
+            fixture.subquery_counts[ra_query.id] = len(ra_query.subqueries)
+
+        for exercise in exercises:
+            # Attempts are found by their exercise
+            Attempt.objects.create(user=user, exercise=exercise, text=exercise.solution)
+            fixture.attempts[exercise.id] = exercise.solution
+
+        fixtures.append(fixture)
+
+    return fixtures
@@ -0,0 +1,161 @@
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .client import ApiSession
+from .fixtures import UserFixture
+from .stats import EndpointStats
+
+
+Request = tuple[str, str, dict[str, Any] | None]
+Operation = Callable[[UserFixture, random.Random], Request]
+
+
+def _autosave(fixture: UserFixture, rng: random.Random) -> Request:
+    query_id, texts = rng.choice(list(fixture.queries.items()))
+    return 'PATCH', f'/api/queries/{query_id}/', {'text': rng.choice(texts)}
+
+
+def _tree(fixture: UserFixture, rng: random.Random) -> Request:
+    query_id = rng.choice(list(fixture.queries))
+    return 'GET', f'/api/queries/{query_id}/tree/', None
+
+
+def _execute(fixture: UserFixture, rng: random.Random) -> Request:
+    query_id = rng.choice(list(fixture.queries))
+    return 'POST', f'/api/queries/{query_id}/executions/', None
+
+
+def _execute_subquery(fixture: UserFixture, rng: random.Random) -> Request:
+    query_id = rng.choice(list(fixture.queries))
+    subquery_id = rng.randrange(max(fixture.subquery_counts.get(query_id, 1), 1))
+    return 'POST', f'/api/queries/{query_id}/subqueries/{subquery_id}/executions/', None
+
+
+def _submit(fixture: UserFixture, rng: random.Random) -> Request:
+    exercise_id = rng.choice(list(fixture.attempts))
+    return 'POST', f'/api/attempts/{exercise_id}/submit/', None
+
+
+OPERATIONS: dict[str, Operation] = {
+    'autosave': _autosave,
+    'tree': _tree,
+    'execute': _execute,
+    'execute_subquery': _execute_subquery,
+    'submit': _submit,
+}
+
+DEFAULT_MIX: dict[str, int] = {
+    'autosave': 50,
+    'tree': 15,
+    'execute': 15,
+    'execute_subquery': 10,
+    'submit': 10,
+}
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    mix: dict[str, int] = {}
+    for item in value.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f'Unknown operation: {name}')
+        mix[name] = int(weight)
+    return mix
+
+
+@dataclass
+class LoadResult:
+    stats: dict[str, EndpointStats]
+    elapsed: float
+
+
+def run_load(
+    base_url: str,
+    fixtures: list[UserFixture],
+    password: str,
+    mix: dict[str, int],
+    duration: float,
+    concurrency: int,
+    seed: int = 0,
+) -> LoadResult:
+    """Drive the API with ``concurrency`` simulated students for ``duration`` seconds."""
+    names = [name for name, weight in mix.items() if weight > 0]
+    weights = [mix[name] for name in names]
+
+    def simulate(client_id: int) -> dict[str, EndpointStats]:
+        rng = random.Random(seed + client_id)  # noqa: S311
+        fixture = fixtures[client_id % len(fixtures)]
+        session = ApiSession(base_url)
+        session.login(fixture.email, password)
+
+        stats = {name: EndpointStats(name) for name in names}
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            [name] = rng.choices(names, weights)
+            method, path, body = OPERATIONS[name](fixture, rng)
+            status, _, latency = session.request(method, path, body)
+            db_hold = session.server_timings.get('app-db')
+            stats[name].record(latency, 200 <= status < 300, db_hold)
+        return stats
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(simulate, range(concurrency)))
+    elapsed = time.monotonic() - start
+
+    merged = {name: EndpointStats(name) for name in names}
+    for stats in results:
+        for name, endpoint_stats in stats.items():
+            merged[name].merge(endpoint_stats)
+
+    return LoadResult(merged, elapsed)
+
+
+@contextmanager
+def gunicorn_server(workers: int, port: int, cwd: Path, timeout: float = 30.0) -> Iterator[str]:
+    """Run the ASGI application under gunicorn with ``workers`` worker processes, as deployed."""
+    process = subprocess.Popen(  # noqa: S603
+        [
+            sys.executable,
+            '-m',
+            'gunicorn',
+            'query_cod.asgi:application',
+            '--worker-class',
+            'uvicorn_worker.UvicornWorker',
+            '--workers',
+            str(workers),
+            '--bind',
+            f'127.0.0.1:{port}',
+            '--timeout',
+            '120',
+        ],
+        cwd=cwd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_for_port(port, timeout)
+        yield f'http://127.0.0.1:{port}'
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def _wait_for_port(port: int, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            if sock.connect_ex(('127.0.0.1', port)) == 0:
+                return
+        time.sleep(0.2)
+    raise TimeoutError(f'gunicorn did not start listening on port {port}')
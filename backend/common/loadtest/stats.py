@@ -0,0 +1,70 @@
+from dataclasses import dataclass, field
+from statistics import quantiles
+from typing import TypedDict
+
+
+class EndpointSummary(TypedDict):
+    endpoint: str
+    requests: int
+    errors: int
+    throughput: float
+    p50: float
+    p90: float
+    p99: float
+    max: float
+    db_p90: float
+
+
+@dataclass
+class EndpointStats:
+    endpoint: str
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    # Time each request held the app database, as reported by the server
+    db_holds: list[float] = field(default_factory=list)
+
+    def record(self, latency: float, ok: bool, db_hold: float | None = None) -> None:
+        self.latencies.append(latency)
+        if not ok:
+            self.errors += 1
+        if db_hold is not None:
+            self.db_holds.append(db_hold)
+
+    def merge(self, other: 'EndpointStats') -> None:
+        self.latencies.extend(other.latencies)
+        self.errors += other.errors
+        self.db_holds.extend(other.db_holds)
+
+    def summary(self, elapsed: float) -> EndpointSummary:
+        p50, p90, p99 = _percentiles(self.latencies, [50, 90, 99])
+        [db_p90] = _percentiles(self.db_holds, [90])
+        return {
+            'endpoint': self.endpoint,
+            'requests': len(self.latencies),
+            'errors': self.errors,
+            'throughput': len(self.latencies) / elapsed if elapsed > 0 else 0.0,
+            'p50': p50,
+            'p90': p90,
+            'p99': p99,
+            'max': max(self.latencies, default=0.0),
+            'db_p90': db_p90,
+        }
+
+
+def summarise(stats: dict[str, EndpointStats], elapsed: float) -> list[EndpointSummary]:
+    total = EndpointStats('total')
+    for endpoint_stats in stats.values():
+        total.merge(endpoint_stats)
+
+    rows = [stats[endpoint].summary(elapsed) for endpoint in sorted(stats)]
+    return [*rows, total.summary(elapsed)]
+
+
+def _percentiles(latencies: list[float], percents: list[int]) -> list[float]:
+    if not latencies:
+        return [0.0 for _ in percents]
+    if len(latencies) == 1:
+        return [latencies[0] for _ in percents]
+
+    cut_points = quantiles(latencies, n=100, method='inclusive')
+    return [cut_points[percent - 1] for percent in percents]
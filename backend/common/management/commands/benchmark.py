@@ -0,0 +1,297 @@
+import sqlite3
+import tempfile
+import timeit
+import tracemalloc
+from argparse import ArgumentParser
+from collections.abc import Callable, Iterator
+from datetime import date
+from decimal import Decimal
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+import queries.services.ra.ast as ra
+from common.loadtest.fixtures import create_target_database
+from databases.models.database_connection_info import DatabaseConnectionInfo
+from databases.services.execution import execute_sql
+from databases.services.schema import get_schema
+from databases.types import QueryResult, Schema
+from queries.serializers.execution import QueryResultDataSerializer, render_query_result
+from queries.services.ra.ast import RAQuery, attribute
+from queries.services.ra.ast.factory import query as relation
+from queries.services.ra.optimiser import RAOptimiser
+from queries.services.ra.scope.schema import SchemaInferrer
+from queries.services.ra.transpiler import RAtoSQLTranspiler
+from queries.services.ra.transpiler.division import DivisionStrategy
+from queries.services.sql.parser import parse_sql
+from queries.services.sql.scope import builder
+from queries.services.sql.semantics import validate_sql_semantics
+from queries.services.sql.transpiler import SQLtoRATranspiler
+from queries.services.sql.transpiler.normaliser import alias_tables
+from queries.services.sql.tree.builder import SQLTreeBuilder
+from queries.services.types import (
+    RelationalSchema,
+    SQLQuery,
+    to_primary_keys,
+    to_relational_schema,
+)
+from query_cod.types import DataType
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+
+Case = tuple[str, Callable[[], object]]
+
+SCHEMA: RelationalSchema = {
+    'R': {'A': DataType.INTEGER, 'B': DataType.INTEGER},
+    'S': {'C': DataType.INTEGER, 'D': DataType.INTEGER},
+}
+
+
+def _self_joins(n: int) -> str:
+    joins = ' '.join('JOIN R ON R.A = R.B' for _ in range(n))
+    return f'SELECT R.A FROM R {joins} WHERE R.A > 0'  # noqa: S608
+
+
+def _nested_self_joins(n: int) -> str:
+    query = 'SELECT R.A FROM R, R WHERE R.A = R.B'
+    for _ in range(n):
+        query = f'SELECT R.A FROM R, R WHERE R.A IN ({query}) AND R.B = R.A'  # noqa: S608
+    return query
+
+
+def aliasing_cases() -> Iterator[Case]:
+    for n in [10, 50, 100, 200]:
+        yield f'{n} self-joins', partial(alias_tables, parse_sql(_self_joins(n)))
+    for n in [5, 10, 20]:
+        yield f'{n} nested subqueries', partial(alias_tables, parse_sql(_nested_self_joins(n)))
+
+
+def _alternating_subqueries(n: int) -> str:
+    subquery = 'SELECT * FROM S WHERE S.C = R.B AND S.D = {}'
+    conditions = ' AND '.join(f'(R.A = {i} OR EXISTS ({subquery.format(i)}))' for i in range(n))
+    return f'SELECT * FROM R WHERE {conditions}'  # noqa: S608
+
+
+def _alternating_predicates(n: int) -> str:
+    conditions = ' AND '.join(f'(R.A = {i} OR R.B = {i})' for i in range(n))
+    return f'SELECT * FROM R WHERE {conditions} AND R.A IN (SELECT C FROM S)'  # noqa: S608
+
+
+def _transpile(query: SQLQuery) -> None:
+    SQLtoRATranspiler(SCHEMA).transpile(query)
+
+
+def dnf_cases() -> Iterator[Case]:
+    for n in [2, 4, 5, 8, 16]:
+        yield (
+            f'{n} alternating subqueries',
+            partial(_transpile, parse_sql(_alternating_subqueries(n))),
+        )
+    for n in [4, 16, 64]:
+        yield (
+            f'{n} alternating predicates',
+            partial(_transpile, parse_sql(_alternating_predicates(n))),
+        )
+
+
+PIPELINE_QUERIES = {
+    'grouped join': 'SELECT R.A, COUNT(S.D) AS n FROM R JOIN S ON R.B = S.C GROUP BY R.A '
+    'HAVING COUNT(S.D) > 1',
+    'correlated subqueries': 'SELECT A FROM R WHERE B IN (SELECT C FROM S WHERE D > R.A) '
+    'AND NOT EXISTS (SELECT * FROM S WHERE S.C = R.A)',
+}
+
+
+def _pipeline(text: str, cold: bool) -> None:
+    if cold:
+        builder._scope_cache.clear()
+    query = parse_sql(text)
+    validate_sql_semantics(query, SCHEMA)
+    SQLTreeBuilder(SCHEMA).build(query)
+    SQLtoRATranspiler(SCHEMA).transpile(query)
+
+
+def pipeline_cases() -> Iterator[Case]:
+    for name, text in PIPELINE_QUERIES.items():
+        yield f'{name} (cold scopes)', partial(_pipeline, text, cold=True)
+        yield f'{name} (warm scopes)', partial(_pipeline, text, cold=False)
+
+
+def _wide_schema(tables: int, columns: int) -> RelationalSchema:
+    return {
+        f'T{i}': {'k': DataType.INTEGER} | {f't{i}_c{j}': DataType.INTEGER for j in range(columns)}
+        for i in range(tables)
+    }
+
+
+def _validate_wide_join(query: SQLQuery, schema: RelationalSchema) -> None:
+    builder._scope_cache.clear()
+    validate_sql_semantics(query, schema)
+
+
+def _infer_wide_join(query: RAQuery, schema: RelationalSchema) -> None:
+    SchemaInferrer(schema).infer(query)
+
+
+def schema_cases() -> Iterator[Case]:
+    for tables in [4, 16]:
+        schema = _wide_schema(tables, columns=50)
+        names = [f'T{i}' for i in range(tables)]
+
+        theta_joins = parse_sql('SELECT * FROM T0')
+        natural_joins = parse_sql('SELECT * FROM T0')
+        for name in names[1:]:
+            theta_joins = theta_joins.join(name, on=f'T0.k = {name}.k')
+            natural_joins = natural_joins.join(name, join_type='NATURAL')
+
+        yield f'SQL {tables} x 50 theta joins', partial(_validate_wide_join, theta_joins, schema)
+        yield (
+            f'SQL {tables} x 50 natural joins',
+            partial(_validate_wide_join, natural_joins, schema),
+        )
+
+        ra_query = relation(names[0])
+        for name in names[1:]:
+            ra_query = ra_query.natural_join(name)
+        yield f'RA {tables} x 50 natural joins', partial(_infer_wide_join, ra_query, schema)
+
+
+OPTIMISER_QUERIES: dict[str, RAQuery] = {
+    'cartesian selection': relation('account')
+    .cartesian('branch')
+    .select(
+        ra.And(
+            ra.EQ(attribute('account.sortcode'), attribute('branch.sortcode')),
+            ra.EQ(attribute('type'), 'current'),
+        )
+    )
+    .project('bname', 'no'),
+    'filtered natural join': relation('account')
+    .natural_join('movement')
+    .select(ra.And(ra.LT(attribute('amount'), -900), ra.EQ(attribute('type'), 'deposit')))
+    .project('no', 'cname'),
+    'keyed projection': relation('movement').natural_join('account').project('mid', 'no', 'amount'),
+    'nested projections': relation('account').project('no', 'cname').project('no', optimise=False),
+}
+
+
+def _fetch_all(conn: sqlite3.Connection, sql: str) -> None:
+    conn.execute(sql).fetchall()
+
+
+def _target_database(rows: int) -> tuple[Schema, sqlite3.Connection]:
+    target = Path(tempfile.gettempdir()) / 'query_cod_benchmark.sqlite3'
+    create_target_database(target, rows)
+    db_schema = get_schema(DatabaseConnectionInfo('sqlite', '', None, None, None, str(target)))
+    return db_schema, sqlite3.connect(target)
+
+
+def optimiser_cases() -> Iterator[Case]:
+    db_schema, conn = _target_database(rows=2000)
+    schema = to_relational_schema(db_schema)
+    optimiser = RAOptimiser(schema, to_primary_keys(db_schema))
+
+    for name, ra_query in OPTIMISER_QUERIES.items():
+        written = RAtoSQLTranspiler(schema).transpile(ra_query).sql()
+        optimised = RAtoSQLTranspiler(schema).transpile(optimiser.optimise(ra_query)).sql()
+        yield f'{name} (as written)', partial(_fetch_all, conn, written)
+        yield f'{name} (optimised)', partial(_fetch_all, conn, optimised)
+
+
+DIVISION_QUERIES: dict[str, RAQuery] = {
+    'customers at all branches': relation('account')
+    .project('cname', 'sortcode')
+    .divide(relation('branch').select(ra.LT(attribute('sortcode'), 3)).project('sortcode')),
+    'accounts moving all amounts': relation('movement')
+    .project('no', 'amount')
+    .divide(relation('movement').select(ra.EQ(attribute('mid'), 0)).project('amount')),
+}
+
+
+def division_cases() -> Iterator[Case]:
+    db_schema, conn = _target_database(rows=5000)
+    schema = to_relational_schema(db_schema)
+
+    for name, ra_query in DIVISION_QUERIES.items():
+        for strategy in DivisionStrategy:
+            sql = RAtoSQLTranspiler(schema, division=strategy).transpile(ra_query).sql()
+            yield f'{name} ({strategy.value.lower()})', partial(_fetch_all, conn, sql)
+
+
+def _render_with_encoder(result: QueryResult) -> None:
+    JSONRenderer().render(result)
+
+
+def _render_with_fields(result: QueryResult) -> None:
+    data = serializers.Serializer.to_representation(QueryResultDataSerializer(), result)
+    JSONRenderer().render(data)
+
+
+def _render_by_column(result: QueryResult) -> None:
+    JSONRenderer().render(render_query_result(result))
+
+
+def rendering_cases() -> Iterator[Case]:
+    target = Path(tempfile.gettempdir()) / 'query_cod_benchmark.sqlite3'
+    create_target_database(target, rows=10000)
+    db = DatabaseConnectionInfo('sqlite', '', None, None, None, str(target))
+
+    for limit in [1000, 10000]:
+        result = execute_sql(f'SELECT * FROM movement LIMIT {limit}', db)  # noqa: S608
+        # Cells typed as PostgreSQL drivers return them
+        result['rows'] = [
+            [mid, no, Decimal(amount), date.fromisoformat(tdate)]
+            for mid, no, amount, tdate in result['rows']
+        ]
+        yield f'{limit} rows (encoder fallback)', partial(_render_with_encoder, result)
+        yield f'{limit} rows (per-cell fields)', partial(_render_with_fields, result)
+        yield f'{limit} rows (by column)', partial(_render_by_column, result)
+
+
+SUITES: dict[str, Callable[[], Iterator[Case]]] = {
+    'aliasing': aliasing_cases,
+    'division': division_cases,
+    'dnf': dnf_cases,
+    'optimiser': optimiser_cases,
+    'pipeline': pipeline_cases,
+    'rendering': rendering_cases,
+    'schemas': schema_cases,
+}
+
+
+class Command(BaseCommand):
+    help = 'Time the query processing pipeline on generated worst-case queries.'
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            'suites', nargs='*', help=f'Suites to run, out of: {", ".join(SUITES)} (default: all).'
+        )
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--number', type=int, default=10)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        suites = options['suites'] or list(SUITES)
+        if unknown := set(suites) - SUITES.keys():
+            raise CommandError(f'Unknown suites: {", ".join(sorted(unknown))}')
+
+        for suite in suites:
+            self.stdout.write(f'\n{suite}')
+            self.stdout.write(f'{"case":<40}{"best ms":>12}{"worst ms":>12}{"peak KiB":>12}')
+            for name, run in SUITES[suite]():
+                timings = timeit.repeat(run, repeat=options['repeat'], number=options['number'])
+                best, worst = (t / options['number'] * 1000 for t in (min(timings), max(timings)))
+                peak = _peak_allocation(run) / 1024
+                self.stdout.write(f'{name:<40}{best:>12.3f}{worst:>12.3f}{peak:>12.1f}')
+
+
+def _peak_allocation(run: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
@@ -0,0 +1,109 @@
+import tempfile
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from common.loadtest.fixtures import UserFixture, create_target_database, seed_fixtures
+from common.loadtest.runner import DEFAULT_MIX, gunicorn_server, parse_mix, run_load
+from common.loadtest.stats import EndpointSummary, summarise
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed load test users, projects, queries and exercises against a local SQLite '
+        'target database, then drive the query and attempt endpoints and report '
+        'throughput and latency percentiles per endpoint and per gunicorn worker count.'
+    )
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            '--workers',
+            default='1,2,4',
+            help='Comma-separated gunicorn worker counts to benchmark.',
+        )
+        parser.add_argument(
+            '--url',
+            help='Target an already running server instead of starting gunicorn.',
+        )
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument(
+            '--concurrency', type=int, default=16, help='Number of simulated students.'
+        )
+        parser.add_argument(
+            '--duration', type=float, default=30.0, help='Seconds to run per worker count.'
+        )
+        parser.add_argument(
+            '--rows', type=int, default=1000, help='Accounts in the target database.'
+        )
+        parser.add_argument(
+            '--target',
+            type=Path,
+            default=Path(tempfile.gettempdir()) / 'query_cod_loadtest.sqlite3',
+            help='Path of the SQLite target database.',
+        )
+        parser.add_argument(
+            '--mix',
+            type=parse_mix,
+            default=DEFAULT_MIX,
+            help='Weighted operation mix, e.g. autosave=50,tree=15,execute=15,'
+            'execute_subquery=10,submit=10.',
+        )
+        parser.add_argument('--password', default='loadtest')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        target: Path = options['target'].resolve()
+
+        self.stdout.write(f'Creating target database at {target}...')
+        create_target_database(target, options['rows'])
+
+        self.stdout.write(f'Seeding {options["users"]} users...')
+        fixtures = seed_fixtures(target, options['users'], options['password'])
+
+        if options['url']:
+            runs = [('external', options['url'])]
+        else:
+            try:
+                worker_counts = [int(w) for w in options['workers'].split(',')]
+            except ValueError as e:
+                raise CommandError(f'Invalid worker counts: {options["workers"]}') from e
+            runs = [(str(workers), None) for workers in worker_counts]
+
+        base_dir = Path(settings.BASE_DIR)  # type: ignore[misc]
+        for label, url in runs:
+            self.stdout.write(f'\nWorkers: {label}')
+            if url:
+                summaries = self._run(url, fixtures, options)
+            else:
+                with gunicorn_server(int(label), options['port'], base_dir) as url:
+                    summaries = self._run(url, fixtures, options)
+            self._report(summaries)
+
+    def _run(
+        self, url: str, fixtures: list[UserFixture], options: dict[str, Any]
+    ) -> list[EndpointSummary]:
+        result = run_load(
+            url,
+            fixtures,
+            password=options['password'],
+            mix=options['mix'],
+            duration=options['duration'],
+            concurrency=options['concurrency'],
+        )
+        return summarise(result.stats, result.elapsed)
+
+    def _report(self, summaries: list[EndpointSummary]) -> None:
+        self.stdout.write(
+            f'{"endpoint":<18}{"requests":>10}{"errors":>8}{"req/s":>10}'
+            f'{"p50 ms":>10}{"p90 ms":>10}{"p99 ms":>10}{"max ms":>10}{"db p90 ms":>12}'
+        )
+        for row in summaries:
+            self.stdout.write(
+                f'{row["endpoint"]:<18}{row["requests"]:>10}{row["errors"]:>8}'
+                f'{row["throughput"]:>10.1f}{row["p50"] * 1000:>10.1f}'
+                f'{row["p90"] * 1000:>10.1f}{row["p99"] * 1000:>10.1f}'
+                f'{row["max"] * 1000:>10.1f}{row["db_p90"] * 1000:>12.1f}'
+            )
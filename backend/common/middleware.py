@@ -0,0 +1,126 @@
+import re
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator
+from typing import Any
+
+from django.db import connection, transaction
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.http.response import HttpResponseBase
+from django.utils.cache import patch_vary_headers
+
+import brotli
+
+
+# Fast enough for responses built on each request, unlike the default of 11 meant for static files
+BROTLI_QUALITY = 5
+
+re_accepts_brotli = re.compile(r'\bbr\b')
+
+
+class ConnectionHoldTimer:
+    """Time the app database is held by a request.
+
+    Transactions hold it from their first query until they commit, and queries outside
+    transactions only while they run.
+    """
+
+    def __init__(self) -> None:
+        self.held = 0.0
+        self.transaction_start: float | None = None
+
+    def __call__(
+        self, execute: Callable[..., Any], sql: str, params: Any, many: bool, context: Any
+    ) -> Any:
+        if not connection.in_atomic_block:
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                self.held += time.perf_counter() - start
+
+        if self.transaction_start is None:
+            self.transaction_start = time.perf_counter()
+            transaction.on_commit(self.end_transaction)
+        return execute(sql, params, many, context)
+
+    def end_transaction(self) -> None:
+        if self.transaction_start is not None:
+            self.held += time.perf_counter() - self.transaction_start
+            self.transaction_start = None
+
+
+class ConnectionHoldTimingMiddleware:
+    """Report the time the app database was held in a ``Server-Timing`` header."""
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        timer = ConnectionHoldTimer()
+        with connection.execute_wrapper(timer):
+            response = self.get_response(request)
+        # Transactions rolled back, or still open, hold the connection until the response
+        timer.end_transaction()
+
+        response['Server-Timing'] = f'app-db;dur={timer.held * 1000:.1f}'
+        return response
+
+
+class BrotliMiddleware:
+    """Compress responses with brotli if the client accepts it, or leave them to gzip."""
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        response = self.get_response(request)
+        if (
+            (isinstance(response, HttpResponse) and len(response.content) < 200)
+            or response.has_header('Content-Encoding')
+            # Pages embed CSRF tokens, which gzip pads against BREACH
+            or response.get('Content-Type', '').startswith('text/html')
+        ):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if not re_accepts_brotli.search(request.META.get('HTTP_ACCEPT_ENCODING', '')):
+            return response
+
+        if isinstance(response, StreamingHttpResponse):
+            content = response.streaming_content
+            response.streaming_content = (
+                _compress_sequence(content)
+                if isinstance(content, Iterator)
+                else _acompress_sequence(content)
+            )
+            del response.headers['Content-Length']
+        elif isinstance(response, HttpResponse):
+            compressed = brotli.compress(response.content, quality=BROTLI_QUALITY)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+        else:
+            return response
+
+        # Compressed representations only match ETags weakly
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
+
+
+def _compress_sequence(sequence: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    for chunk in sequence:
+        # Flushed so each chunk still reaches the client as soon as it is produced
+        yield compressor.compress(chunk) + compressor.flush()
+    yield compressor.finish()
+
+
+async def _acompress_sequence(sequence: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    async for chunk in sequence:
+        yield compressor.compress(chunk) + compressor.flush()
+    yield compressor.finish()
@@ -0,0 +1,19 @@
+from typing import Any
+
+from rest_framework import serializers
+
+
+# Renders partial updates as only the fields sent, and the read-only ones the save updates, so
+# autosaves return the few fields they change rather than the whole instance. Not a docstring, as
+# it would describe the serializers in the API schema.
+class ChangedFieldsMixin(serializers.ModelSerializer[Any]):
+    def to_representation(self, instance: Any) -> dict[str, Any]:
+        data: dict[str, Any] = super().to_representation(instance)
+        if not self.partial or not hasattr(self, 'initial_data'):
+            return data
+        changed = {
+            name
+            for name, field in self.fields.items()
+            if field.read_only or name in self.initial_data
+        }
+        return {name: value for name, value in data.items() if name in changed}
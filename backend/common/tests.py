@@ -1,6 +1,20 @@
+from collections.abc import AsyncIterator, Iterator
+from pathlib import Path
+
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
 from django.urls import reverse
 
+import brotli
 import pytest
+from asgiref.sync import async_to_sync
+from common.loadtest.client import parse_server_timing
+from common.loadtest.fixtures import create_target_database, seed_fixtures
+from common.loadtest.stats import EndpointStats, summarise
+from common.middleware import BrotliMiddleware
+from databases.models import Database
+from databases.services.execution import execute_sql
+from projects.models import Query
 from rest_framework.test import APIClient
 
 
@@ -28,3 +42,131 @@ def test_project_detail_returns_200(auth_client: APIClient) -> None:
     url = reverse('common:project-detail', args=[mock_id])
     response = auth_client.get(url)
     assert response.status_code == 200
+
+
+def test_loadtest_summary_reports_percentiles_and_total() -> None:
+    execute = EndpointStats('execute')
+    for latency in range(1, 101):
+        execute.record(latency / 1000, ok=latency <= 95)
+    tree = EndpointStats('tree')
+    tree.record(0.5, ok=True)
+
+    *rows, total = summarise({'tree': tree, 'execute': execute}, elapsed=10.0)
+
+    assert [row['endpoint'] for row in rows] == ['execute', 'tree']
+    assert rows[0]['requests'] == 100
+    assert rows[0]['errors'] == 5
+    assert rows[0]['throughput'] == 10.0
+    assert rows[0]['p50'] == pytest.approx(0.0505)
+    assert rows[0]['max'] == 0.1
+    assert rows[1]['p99'] == 0.5
+    assert total['requests'] == 101
+    assert total['errors'] == 5
+
+
+@pytest.mark.django_db
+def test_loadtest_seeds_executable_fixtures(tmp_path: Path) -> None:
+    target = tmp_path / 'target.sqlite3'
+    create_target_database(target, rows=50)
+
+    fixtures = seed_fixtures(target, users=2, password='loadtest')  # noqa: S106
+
+    assert len(fixtures) == 2
+    database = Database.objects.get(database_type=Database.DatabaseType.SQLITE)
+    for fixture in fixtures:
+        assert fixture.attempts
+        assert fixture.queries.keys() == fixture.subquery_counts.keys()
+        for query_id in fixture.sql_queries:
+            query = Query.objects.get(id=query_id)
+            assert execute_sql(query.text, database.connection_info)['rows']
+
+
+@pytest.mark.django_db
+def test_responses_report_app_database_hold_time(auth_client: APIClient) -> None:
+    response = auth_client.get(reverse('projects-list'))
+
+    name, duration = response['Server-Timing'].split(';dur=')
+    assert name == 'app-db'
+    assert float(duration) >= 0
+
+
+def test_parse_server_timing_returns_durations_in_seconds() -> None:
+    header = 'app-db;dur=12.5, cache;desc="Cache read";dur=2, miss'
+
+    assert parse_server_timing(header) == {'app-db': 0.0125, 'cache': 0.002}
+
+
+@pytest.mark.parametrize(
+    'accept_encoding, content_encoding',
+    [('gzip, deflate, br', 'br'), ('gzip, deflate', None)],
+)
+def test_brotli_compresses_responses_for_clients_accepting_it(
+    accept_encoding: str, content_encoding: str | None
+) -> None:
+    content = b'{"rows": [' + b'["value"], ' * 100 + b']}'
+
+    def get_response(request: HttpRequest) -> HttpResponse:
+        response = HttpResponse(content, content_type='application/json')
+        response['ETag'] = '"abc"'
+        return response
+
+    request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept_encoding)
+    response = BrotliMiddleware(get_response)(request)
+
+    assert isinstance(response, HttpResponse)
+    assert response.get('Content-Encoding') == content_encoding
+    assert response['Vary'] == 'Accept-Encoding'
+    if content_encoding:
+        assert brotli.decompress(response.content) == content
+        assert response['ETag'] == 'W/"abc"'
+    else:
+        assert response.content == content
+
+
+def test_brotli_leaves_pages_to_gzip() -> None:
+    def get_response(request: HttpRequest) -> HttpResponse:
+        return HttpResponse(b'<p>page</p>' * 100)
+
+    request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip, br')
+
+    assert not BrotliMiddleware(get_response)(request).has_header('Content-Encoding')
+
+
+def test_brotli_compresses_streams_a_chunk_at_a_time() -> None:
+    chunks = [b'id,name\r\n', b'1,Ada\r\n' * 100]
+
+    def get_response(request: HttpRequest) -> StreamingHttpResponse:
+        return StreamingHttpResponse(iter(chunks), content_type='text/csv')
+
+    request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='br')
+    response = BrotliMiddleware(get_response)(request)
+
+    assert response['Content-Encoding'] == 'br'
+    assert isinstance(response, StreamingHttpResponse)
+    assert isinstance(response.streaming_content, Iterator)
+    compressed = list(response.streaming_content)
+    assert len(compressed) == len(chunks) + 1
+    assert brotli.decompress(b''.join(compressed)) == b''.join(chunks)
+
+
+def test_brotli_compresses_asynchronous_streams() -> None:
+    chunks = [b'id,name\r\n', b'1,Ada\r\n' * 100]
+
+    async def content() -> AsyncIterator[bytes]:
+        for chunk in chunks:
+            yield chunk
+
+    def get_response(request: HttpRequest) -> StreamingHttpResponse:
+        return StreamingHttpResponse(content(), content_type='text/csv')
+
+    request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='br')
+    response = BrotliMiddleware(get_response)(request)
+
+    async def collect() -> list[bytes]:
+        assert isinstance(response, StreamingHttpResponse)
+        return [chunk async for chunk in response.streaming_content]  # type: ignore[union-attr]
+
+    assert response['Content-Encoding'] == 'br'
+    compressed = async_to_sync(collect)()
+    assert len(compressed) == len(chunks) + 1
+    assert brotli.decompress(b''.join(compressed)) == b''.join(chunks)
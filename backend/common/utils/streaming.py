@@ -0,0 +1,37 @@
+from collections.abc import AsyncIterator, Iterator
+from typing import cast
+
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpRequest
+
+from asgiref.sync import sync_to_async
+
+
+def streaming_content[T](
+    request: HttpRequest, content: Iterator[T]
+) -> Iterator[T] | AsyncIterator[T]:
+    """``content`` as the server ``request`` came through streams it.
+
+    ASGI servers collect synchronous iterators whole before sending them, so they are given
+    asynchronous ones instead.
+    """
+    if isinstance(request, ASGIRequest):
+        return _iterate_in_thread(content)
+    return content
+
+
+async def _iterate_in_thread[T](iterator: Iterator[T]) -> AsyncIterator[T]:
+    # Every item is produced in the thread of the request, as the connections iterators hold are
+    # bound to the threads that opened them
+    done = object()
+
+    def advance() -> T | object:
+        return next(iterator, done)
+
+    try:
+        while (item := await sync_to_async(advance)()) is not done:
+            yield cast(T, item)
+    finally:
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            await sync_to_async(close)()
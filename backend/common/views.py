@@ -1,5 +1,51 @@
+import hashlib
+from collections.abc import Callable
+from typing import Any
+
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.views import generic
 
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.viewsets import ViewSetMixin
+
 
 class IndexView(generic.TemplateView):
     template_name = 'common/index.html'
+
+
+# Runs routes outside ATOMIC_REQUESTS when all their actions opt out with
+# transaction.non_atomic_requests, so the app database is not held while they wait on
+# target databases or external services. Not a docstring, as it would describe every operation
+# of the viewsets in the API schema.
+class NonAtomicActionsMixin(ViewSetMixin):
+    @classmethod
+    def as_view(cls, actions: dict[str, Any] | None = None, **initkwargs: Any) -> Any:
+        view = super().as_view(actions, **initkwargs)
+        handlers = [getattr(cls, action, None) for action in (actions or {}).values()]
+        if handlers and all(hasattr(handler, '_non_atomic_requests') for handler in handlers):
+            return transaction.non_atomic_requests(view)
+        return view
+
+
+def conditional_response(
+    request: Request, version: tuple[object, ...], respond: Callable[[], Response]
+) -> Response:
+    """Respond with ``respond()``, or with 304 if the client already has this ``version``.
+
+    ``version`` holds what the representation is built from, like timestamps and fingerprints,
+    so unchanged representations are never built.
+    """
+    etag = _etag(request.accepted_media_type, *version)
+    not_modified = get_conditional_response(request._request, etag=etag)
+    response = Response(status=not_modified.status_code) if not_modified else respond()
+    response['ETag'] = etag
+    # Browsers keep the representation, but check it is still current before every use
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _etag(*parts: object) -> str:
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
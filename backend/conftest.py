@@ -41,3 +41,10 @@ def mock_get_schema() -> Generator[MagicMock, None, None]:
             }
         }
         yield mock
+
+
+@pytest.fixture(autouse=True)
+def reset_target_connections(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Connections failed by one test must not fail the next one fast
+    monkeypatch.setattr('databases.services.circuit_breaker._breakers', {})
+    monkeypatch.setattr('databases.models.database_connection_info._engines', {})
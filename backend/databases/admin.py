@@ -1,6 +1,37 @@
 from django.contrib import admin
 
+from queries.services.ra.compilation import compilation_cache_stats
+
 from .models import Database
+from .services.bulkhead import bulkhead_stats
+
+
+@admin.register(Database)
+class DatabaseAdmin(admin.ModelAdmin):  # type: ignore[type-arg]
+    list_display = ('name', 'database_type', 'query_load')
+    readonly_fields = ('query_load', 'query_load_stats', 'compilation_cache')
+
+    @admin.display(description='Query load')
+    def query_load(self, db: Database) -> str:
+        stats = bulkhead_stats(db)
+        if stats is None:
+            return 'Unlimited'
+        return f'{stats["active"]}/{db.max_concurrent_queries} running, {stats["queued"]} queued'
 
+    @admin.display(description='Admitted queries')
+    def query_load_stats(self, db: Database) -> str:
+        stats = bulkhead_stats(db)
+        if stats is None:
+            return '-'
+        return (
+            f'{stats["admitted"]} admitted, {stats["rejected"]} turned away, '
+            f'at most {stats["peak_queued"]} queued, {stats["wait_seconds"]:.1f}s spent queued'
+        )
 
-admin.site.register(Database)
+    @admin.display(description='Compiled RA queries in this process')
+    def compilation_cache(self, db: Database) -> str:
+        stats = compilation_cache_stats()
+        return (
+            f'{stats["size"]}/{stats["maxsize"]} cached, {stats["hits"]} hits, '
+            f'{stats["misses"]} misses, {stats["evictions"]} evicted'
+        )
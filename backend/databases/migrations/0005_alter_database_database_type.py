@@ -0,0 +1,21 @@
+# Generated by Django 5.1.7 on 2026-10-19 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('databases', '0004_alter_database_database_type'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='database',
+            name='database_type',
+            field=models.CharField(
+                choices=[('postgresql', 'PostgreSQL'), ('sqlite', 'SQLite')],
+                default='postgresql',
+                max_length=16,
+            ),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('databases', '0005_alter_database_database_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='database',
+            name='capped_query_rows',
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text='Queries estimated to return more rows only fetch this many',
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name='database',
+            name='max_query_cost',
+            field=models.FloatField(
+                blank=True, help_text='Queries estimated to cost more are rejected', null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name='database',
+            name='queued_query_cost',
+            field=models.FloatField(
+                blank=True, help_text='Queries estimated to cost more run one at a time', null=True
+            ),
+        ),
+    ]
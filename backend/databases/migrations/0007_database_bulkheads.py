@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('databases', '0006_database_admission_thresholds'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='database',
+            name='max_concurrent_queries',
+            field=models.PositiveIntegerField(
+                blank=True, help_text='Queries run at once on this database, if limited', null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name='database',
+            name='max_concurrent_queries_per_user',
+            field=models.PositiveIntegerField(
+                blank=True, help_text='Queries each user runs at once on this database', null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name='database',
+            name='max_queued_queries',
+            field=models.PositiveIntegerField(
+                default=16,
+                help_text='Queries waiting for a slot, beyond which queries are turned away',
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('databases', '0007_database_bulkheads'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='database',
+            name='read_replica_url',
+            field=models.CharField(
+                blank=True,
+                default='',
+                help_text='Connection URL of a read replica that student queries run on instead',
+                max_length=512,
+            ),
+        ),
+    ]
@@ -2,15 +2,23 @@ from django.core.cache import cache
 from django.db import models
 
 from common.models import IndexedTimeStampedModel
-from databases.types import Schema
+from databases.types import Schema, TableSizes
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
 
-from ..services.schema import get_schema
+from ..services.schema import get_schema, schema_digest
+from ..services.statistics import get_table_sizes
 from .database_connection_info import DatabaseConnectionInfo
 
 
+# Table sizes drift as the data changes, unlike the schema
+TABLE_SIZES_TIMEOUT = 60 * 60
+
+
 class Database(IndexedTimeStampedModel):
     class DatabaseType(models.TextChoices):
         POSTGRESQL = 'postgresql', 'PostgreSQL'
+        SQLITE = 'sqlite', 'SQLite'
 
     name = models.CharField(max_length=255)
     description = models.TextField()
@@ -24,6 +32,34 @@ class Database(IndexedTimeStampedModel):
         choices=DatabaseType,
         default=DatabaseType.POSTGRESQL,
     )
+    read_replica_url = models.CharField(
+        max_length=512,
+        blank=True,
+        default='',
+        help_text='Connection URL of a read replica that student queries run on instead',
+    )
+    # Admission thresholds, compared with the planner's estimates for each query
+    max_query_cost = models.FloatField(
+        null=True, blank=True, help_text='Queries estimated to cost more are rejected'
+    )
+    queued_query_cost = models.FloatField(
+        null=True, blank=True, help_text='Queries estimated to cost more run one at a time'
+    )
+    capped_query_rows = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text='Queries estimated to return more rows only fetch this many',
+    )
+    # Bulkheads, so a slow database cannot take every worker
+    max_concurrent_queries = models.PositiveIntegerField(
+        null=True, blank=True, help_text='Queries run at once on this database, if limited'
+    )
+    max_queued_queries = models.PositiveIntegerField(
+        default=16, help_text='Queries waiting for a slot, beyond which queries are turned away'
+    )
+    max_concurrent_queries_per_user = models.PositiveIntegerField(
+        null=True, blank=True, help_text='Queries each user runs at once on this database'
+    )
 
     def __str__(self) -> str:
         return f'{self.name}'
@@ -41,13 +77,62 @@ class Database(IndexedTimeStampedModel):
             name=self.database_name,
         )
 
+    @property
+    def execution_connection_info(self) -> DatabaseConnectionInfo:
+        """Connection for student queries, on the read replica if there is one."""
+        if not self.read_replica_url:
+            return self.connection_info
+
+        url = make_url(self.read_replica_url)
+        return DatabaseConnectionInfo(
+            database_type=self.database_type,
+            host=url.host or '',
+            port=url.port,
+            user=url.username,
+            password=url.password,
+            name=url.database or '',
+            query=url.query,
+        )
+
     @property
     def schema(self) -> Schema:
         cache_key = f'database_schema_{self.id}'
         schema: Schema = cache.get(cache_key)
 
         if schema is None:
-            schema = get_schema(self.connection_info)
+            try:
+                schema = get_schema(self.connection_info)
+            except SQLAlchemyError:
+                # Queries are still validated against the last schema seen while the database is down
+                schema = cache.get(f'{cache_key}_last_known')
+                if schema is None:
+                    raise
+                return schema
             cache.set(cache_key, schema)
+            cache.set(f'{cache_key}_fingerprint', schema_digest(schema))
+            cache.set(f'{cache_key}_last_known', schema, None)
 
         return schema
+
+    @property
+    def schema_fingerprint(self) -> str:
+        """Digest of the schema, which changes whenever the schema is introspected differently."""
+        cache_key = f'database_schema_{self.id}_fingerprint'
+        fingerprint: str | None = cache.get(cache_key)
+
+        if fingerprint is None:
+            fingerprint = schema_digest(self.schema)
+            cache.set(cache_key, fingerprint)
+
+        return fingerprint
+
+    @property
+    def table_sizes(self) -> TableSizes:
+        cache_key = f'database_table_sizes_{self.id}'
+        table_sizes: TableSizes = cache.get(cache_key)
+
+        if table_sizes is None:
+            table_sizes = get_table_sizes(self.connection_info)
+            cache.set(cache_key, table_sizes, TABLE_SIZES_TIMEOUT)
+
+        return table_sizes
@@ -1,6 +1,32 @@
-from dataclasses import dataclass
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any
 
-from sqlalchemy import Engine, create_engine
+from sqlalchemy import URL, Connection, Engine, create_engine, event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.pool import ConnectionPoolEntry, NullPool, PoolResetState
+
+from ..services.circuit_breaker import (
+    CircuitBreaker,
+    DatabaseUnavailableError,
+    get_circuit_breaker,
+)
+
+
+# Seconds to wait for a connection, so unreachable hosts fail before requests time out
+CONNECT_TIMEOUT = 3
+# Sessions only read, and give up on locks and idle transactions rather than hold up others
+POSTGRES_SESSION_SETTINGS = {
+    'default_transaction_read_only': 'on',
+    'lock_timeout': '1s',
+    'idle_in_transaction_session_timeout': '10s',
+}
+
+# Sessions are read-only, so engines and their pooled connections are shared by all requests
+_engines: dict[str, Engine] = {}
+_engines_lock = Lock()
 
 
 @dataclass
@@ -11,17 +37,87 @@ class DatabaseConnectionInfo:
     user: str | None
     password: str | None
     name: str
+    # Parameters of the connection URL, like sslmode
+    query: Mapping[str, str | tuple[str, ...]] = field(default_factory=dict)
 
     def to_sqlalchemy_engine(self) -> Engine:
-        return create_engine(self._build_url())
+        url = self._build_url()
+        with _engines_lock:
+            engine = _engines.get(url)
+            if engine is None:
+                engine = _engines[url] = self._create_engine(url)
+            return engine
 
-    def _build_url(self) -> str:
+    @contextmanager
+    def connect(self) -> Iterator[Connection]:
+        """Connect to the database, failing at once if it has recently been unreachable.
+
+        Raises ``DatabaseUnavailableError`` if the database cannot be reached.
+        """
+        breaker = self.circuit_breaker
+        breaker.before_connect()
+        engine = self.to_sqlalchemy_engine()
+        try:
+            connection = engine.connect()
+        except DBAPIError as e:
+            breaker.record_failure()
+            raise DatabaseUnavailableError('Could not connect to the database') from e
+        breaker.record_success()
+
+        with connection as conn:
+            yield conn
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker:
+        return get_circuit_breaker((self.database_type, self.host, self.port, self.name))
+
+    def _create_engine(self, url: str) -> Engine:
         match self.database_type:
             case 'postgresql':
-                return (
-                    f'postgresql://{self.user}:{self.password}@{self.host}:{self.port}/{self.name}'
+                options = ' '.join(f'-c {k}={v}' for k, v in POSTGRES_SESSION_SETTINGS.items())
+                engine = create_engine(
+                    url,
+                    connect_args={'connect_timeout': CONNECT_TIMEOUT, 'options': options},
+                    pool_pre_ping=True,
                 )
+                event.listen(engine, 'reset', _discard_session)
+                return engine
+            case _:
+                # Local files are cheap to open, and may be replaced between connections
+                return create_engine(url, poolclass=NullPool)
+
+    def _build_url(self) -> str:
+        match self.database_type:
+            case 'postgresql':
+                return URL.create(
+                    'postgresql',
+                    username=self.user,
+                    password=self.password,
+                    host=self.host,
+                    port=self.port,
+                    database=self.name,
+                    query=self.query,
+                ).render_as_string(hide_password=False)
             case 'sqlite':
-                return f'sqlite:///{self.name}'
+                return f'sqlite:///file:{self.name}?mode=ro&uri=true'
             case _:
                 raise ValueError(f'Unsupported database type: {self.database_type}')
+
+
+def _discard_session(
+    dbapi_connection: Any, connection_record: ConnectionPoolEntry, reset_state: PoolResetState
+) -> None:
+    """Drop what the last query left on a pooled connection, before the next request gets it.
+
+    Settings go back to those the connection was opened with, so sessions stay read-only.
+    """
+    if reset_state.terminate_only:
+        return
+    # DISCARD cannot run in a transaction
+    dbapi_connection.rollback()
+    dbapi_connection.autocommit = True
+    try:
+        with dbapi_connection.cursor() as cursor:
+            cursor.execute('DISCARD ALL')
+    finally:
+        dbapi_connection.autocommit = False
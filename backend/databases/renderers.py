@@ -0,0 +1,32 @@
+import json
+from collections.abc import Mapping
+from typing import Any
+
+from rest_framework.renderers import JSONRenderer
+
+
+class PreRenderedJSONRenderer(JSONRenderer):
+    """JSON renderer that sends top-level values already rendered as JSON bytes as they are."""
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: str | None = None,
+        renderer_context: Mapping[str, Any] | None = None,
+    ) -> bytes:
+        pre_rendered = (
+            {key: value for key, value in data.items() if isinstance(value, bytes)}
+            if isinstance(data, Mapping)
+            else {}
+        )
+        if not pre_rendered:
+            whole: bytes = super().render(data, accepted_media_type, renderer_context)
+            return whole
+
+        rest = {key: value for key, value in data.items() if key not in pre_rendered}
+        rendered: bytes = super().render(rest, accepted_media_type, renderer_context)
+        members = [json.dumps(key).encode() + b':' + value for key, value in pre_rendered.items()]
+        head = rendered.rstrip()[:-1].rstrip()
+        if rest:
+            members.insert(0, b'')
+        return head + b','.join(members) + b'}'
@@ -1,9 +1,28 @@
+from typing import Any
+
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
 from .models import Database
+from .services.payloads import SchemaRendering, get_schema_payload
+from .types import Schema
+
+
+@extend_schema_field(Schema)
+class SchemaField(serializers.Field[Database, Any, bytes, Database]):
+    """The schema of a database as JSON bytes, rendered once for each version of the schema."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(source='*', read_only=True, **kwargs)
+
+    def to_representation(self, value: Database) -> bytes:
+        return get_schema_payload(value, SchemaRendering.JSON)
 
 
 class DatabaseSerializer(serializers.ModelSerializer[Database]):
+    # Sent as it is by PreRenderedJSONRenderer
+    schema = SchemaField()
+
     class Meta:
         model = Database
         fields = [  # noqa: RUF012
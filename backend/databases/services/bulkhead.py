@@ -0,0 +1,354 @@
+import time
+import uuid
+from collections import Counter, deque
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from functools import cache
+from threading import Condition, Lock
+from typing import TypedDict
+
+from django.conf import settings
+
+from databases.models import Database
+from redis import Redis, RedisError
+
+
+# Seconds a query waits for a free slot before it is turned away
+QUEUE_TIMEOUT = 10
+# Seconds between checks for a free slot by queries queued in Redis
+POLL_INTERVAL = 0.05
+# Seconds slots and places in the queue are kept in Redis for processes that stopped without
+# giving them up. Queued queries renew theirs on each check
+HOLD_LEASE = 10 * 60
+WAIT_LEASE = 5
+# Seconds the state of a bulkhead is kept in Redis after it was last entered
+IDLE_TIMEOUT = 24 * 60 * 60
+# Seconds to wait on Redis, so queries soon fall back to the bulkheads of their process if it is down
+REDIS_TIMEOUT = 1
+
+
+class DatabaseBusyError(Exception):
+    pass
+
+
+class BulkheadStats(TypedDict):
+    active: int
+    queued: int
+    peak_queued: int
+    admitted: int
+    rejected: int
+    wait_seconds: float
+
+
+class Bulkhead:
+    """Limits the queries running at once in this process, queueing a bounded number of the rest.
+
+    Queued queries are admitted in the order they arrived.
+    """
+
+    def __init__(self, max_concurrent: int, max_queued: int) -> None:
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.active = 0
+        self.peak_queued = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+        self._queue: deque[object] = deque()
+        self._condition = Condition()
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    @contextmanager
+    def enter(self, timeout: float) -> Iterator[None]:
+        self._acquire(timeout)
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.active -= 1
+                self._condition.notify_all()
+
+    def stats(self) -> BulkheadStats:
+        with self._condition:
+            return {
+                'active': self.active,
+                'queued': self.queued,
+                'peak_queued': self.peak_queued,
+                'admitted': self.admitted,
+                'rejected': self.rejected,
+                'wait_seconds': self.wait_seconds,
+            }
+
+    def _acquire(self, timeout: float) -> None:
+        with self._condition:
+            # Slots freed while others are queued are theirs
+            if self.active >= self.max_concurrent or self._queue:
+                self._wait(timeout)
+            self.active += 1
+            self.admitted += 1
+
+    def _wait(self, timeout: float) -> None:
+        if self.queued >= self.max_queued:
+            self.rejected += 1
+            raise DatabaseBusyError('Too many queries are waiting for this database')
+
+        start = time.monotonic()
+        ticket = object()
+        self._queue.append(ticket)
+        self.peak_queued = max(self.peak_queued, self.queued)
+        try:
+            admitted = self._condition.wait_for(
+                lambda: self._queue[0] is ticket and self.active < self.max_concurrent, timeout
+            )
+        finally:
+            self._queue.remove(ticket)
+            self.wait_seconds += time.monotonic() - start
+            # The query behind may now be first in the queue
+            self._condition.notify_all()
+
+        if not admitted:
+            self.rejected += 1
+            raise DatabaseBusyError('Timed out waiting for a free slot on this database')
+
+
+# Drops the tickets whose leases ran out, as the processes holding them stopped
+_EXPIRE = """
+local now = tonumber(redis.call('TIME')[1])
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now)
+for _, ticket in ipairs(expired) do
+    redis.call('ZREM', KEYS[1], ticket)
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+"""
+
+# Admits the ticket if it is among the first tickets of the queue, or renews its place otherwise
+_ADMIT = """
+local max_concurrent = tonumber(ARGV[2])
+if redis.call('ZRANK', KEYS[1], ARGV[1]) < max_concurrent then
+    redis.call('ZADD', KEYS[2], now + tonumber(ARGV[5]), ARGV[1])
+    redis.call('HINCRBY', KEYS[4], 'admitted', 1)
+    return 1
+end
+redis.call('ZADD', KEYS[2], now + tonumber(ARGV[4]), ARGV[1])
+local queued = redis.call('ZCARD', KEYS[1]) - max_concurrent
+if queued > tonumber(redis.call('HGET', KEYS[4], 'peak_queued') or 0) then
+    redis.call('HSET', KEYS[4], 'peak_queued', queued)
+end
+return 0
+"""
+
+_ACQUIRE = (
+    _EXPIRE
+    + """
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[2]) + tonumber(ARGV[3]) then
+    redis.call('HINCRBY', KEYS[4], 'rejected', 1)
+    return -1
+end
+redis.call('ZADD', KEYS[1], redis.call('INCR', KEYS[3]), ARGV[1])
+redis.call('ZADD', KEYS[2], now + tonumber(ARGV[4]), ARGV[1])
+redis.call('HSETNX', KEYS[4], 'admitted', 0)
+for _, key in ipairs(KEYS) do
+    redis.call('EXPIRE', key, ARGV[6])
+end
+"""
+    + _ADMIT
+)
+
+_POLL = (
+    _EXPIRE
+    + """
+if not redis.call('ZSCORE', KEYS[1], ARGV[1]) then
+    return -1
+end
+"""
+    + _ADMIT
+)
+
+_STATS = (
+    _EXPIRE
+    + """
+return {redis.call('ZCARD', KEYS[1]), redis.call('HGETALL', KEYS[4])}
+"""
+)
+
+_REJECTED, _QUEUED, _ADMITTED = -1, 0, 1
+
+
+class RedisBulkhead:
+    """Limits the queries running at once in every process, through Redis.
+
+    Each query takes a ticket, and the first ``max_concurrent`` tickets of the queue run.
+    Queued queries check for a free slot every ``POLL_INTERVAL`` seconds.
+    """
+
+    def __init__(self, client: Redis, key: str, max_concurrent: int, max_queued: int):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self._client = client
+        prefix = f'bulkhead:{key}'
+        self._keys = [f'{prefix}:queue', f'{prefix}:leases', f'{prefix}:tickets', f'{prefix}:stats']
+
+    @contextmanager
+    def enter(self, timeout: float) -> Iterator[None]:
+        ticket = uuid.uuid4().hex
+        self._acquire(ticket, timeout)
+        try:
+            yield
+        finally:
+            self._release(ticket)
+
+    def stats(self) -> BulkheadStats:
+        tickets, fields = self._client.register_script(_STATS)(keys=self._keys)
+        values = {fields[i].decode(): fields[i + 1] for i in range(0, len(fields), 2)}
+        return {
+            'active': min(tickets, self.max_concurrent),
+            'queued': max(tickets - self.max_concurrent, 0),
+            'peak_queued': int(values.get('peak_queued', 0)),
+            'admitted': int(values.get('admitted', 0)),
+            'rejected': int(values.get('rejected', 0)),
+            'wait_seconds': float(values.get('wait_seconds', 0)),
+        }
+
+    def _acquire(self, ticket: str, timeout: float) -> None:
+        state = self._run(_ACQUIRE, ticket)
+        if state == _REJECTED:
+            raise DatabaseBusyError('Too many queries are waiting for this database')
+        if state == _QUEUED:
+            self._wait(ticket, timeout)
+
+    def _wait(self, ticket: str, timeout: float) -> None:
+        start = time.monotonic()
+        state = _QUEUED
+        try:
+            while state == _QUEUED and (remaining := start + timeout - time.monotonic()) > 0:
+                time.sleep(min(POLL_INTERVAL, remaining))
+                state = self._run(_POLL, ticket)
+        except BaseException:
+            self._release(ticket)
+            raise
+        finally:
+            self._client.hincrbyfloat(self._keys[3], 'wait_seconds', time.monotonic() - start)
+
+        # Tickets whose lease ran out while waiting are gone from the queue, and time out too
+        if state != _ADMITTED:
+            self._release(ticket)
+            self._client.hincrby(self._keys[3], 'rejected', 1)
+            raise DatabaseBusyError('Timed out waiting for a free slot on this database')
+
+    def _release(self, ticket: str) -> None:
+        queue, leases, *_ = self._keys
+        try:
+            with self._client.pipeline() as pipeline:
+                pipeline.zrem(queue, ticket)
+                pipeline.zrem(leases, ticket)
+                pipeline.execute()  # type: ignore[no-untyped-call]
+        except RedisError:
+            # The query has run, so its slot is left to be freed when its lease runs out
+            pass
+
+    def _run(self, script: str, ticket: str) -> int:
+        args: list[str | int] = [
+            ticket,
+            self.max_concurrent,
+            self.max_queued,
+            WAIT_LEASE,
+            HOLD_LEASE,
+            IDLE_TIMEOUT,
+        ]
+        state: int = self._client.register_script(script)(keys=self._keys, args=args)
+        return state
+
+
+_bulkheads: dict[str, Bulkhead] = {}
+# Requests entering each bulkhead, so those of users are dropped once no request uses them
+_references: Counter[str] = Counter()
+_bulkheads_lock = Lock()
+
+
+@contextmanager
+def database_bulkhead(
+    db: Database, user_id: int | None = None, expensive: bool = False
+) -> Iterator[None]:
+    """Hold a slot of ``db``, and of ``user_id`` on ``db``, while the block runs.
+
+    Expensive queries also hold the database's only slot for expensive queries. Raises
+    ``DatabaseBusyError`` if no slot frees up in time.
+
+    Slots are shared by every process through Redis if ``BULKHEAD_REDIS_URL`` is set, and only
+    limit the queries of this process otherwise, or while Redis is unreachable.
+    """
+    with ExitStack() as stack:
+        if db.max_concurrent_queries_per_user is not None and user_id is not None:
+            limit = db.max_concurrent_queries_per_user
+            # Users over their limit are turned away at once, so they cannot fill the queue
+            stack.enter_context(_enter(f'{db.id}:user:{user_id}', limit, max_queued=0))
+        if expensive:
+            stack.enter_context(_enter(f'{db.id}:expensive', 1, db.max_queued_queries))
+        if db.max_concurrent_queries is not None:
+            stack.enter_context(
+                _enter(str(db.id), db.max_concurrent_queries, db.max_queued_queries)
+            )
+        yield
+
+
+def bulkhead_stats(db: Database) -> BulkheadStats | None:
+    """Statistics of the bulkhead of ``db``, or None if its queries are not limited."""
+    if db.max_concurrent_queries is None:
+        return None
+    if settings.BULKHEAD_REDIS_URL:  # type: ignore[misc]
+        try:
+            return RedisBulkhead(
+                _redis(), str(db.id), db.max_concurrent_queries, db.max_queued_queries
+            ).stats()
+        except RedisError:
+            pass
+    with _bulkheads_lock:
+        bulkhead = _bulkheads.get(str(db.id))
+    if bulkhead is None:
+        bulkhead = Bulkhead(db.max_concurrent_queries, db.max_queued_queries)
+    return bulkhead.stats()
+
+
+@contextmanager
+def _enter(key: str, max_concurrent: int, max_queued: int) -> Iterator[None]:
+    if settings.BULKHEAD_REDIS_URL:  # type: ignore[misc]
+        with ExitStack() as stack:
+            try:
+                shared = RedisBulkhead(_redis(), key, max_concurrent, max_queued)
+                stack.enter_context(shared.enter(QUEUE_TIMEOUT))
+            except RedisError:
+                # Queries are still limited in each process while Redis is unreachable
+                pass
+            else:
+                yield
+                return
+
+    with _bulkheads_lock:
+        bulkhead = _bulkheads.get(key)
+        if bulkhead is None:
+            bulkhead = _bulkheads[key] = Bulkhead(max_concurrent, max_queued)
+        # Limits may have been changed since the bulkhead was created
+        bulkhead.max_concurrent = max_concurrent
+        bulkhead.max_queued = max_queued
+        _references[key] += 1
+    try:
+        with bulkhead.enter(QUEUE_TIMEOUT):
+            yield
+    finally:
+        with _bulkheads_lock:
+            _references[key] -= 1
+            # Databases keep their bulkheads for their statistics
+            if not _references[key] and ':user:' in key:
+                del _bulkheads[key], _references[key]
+
+
+@cache
+def _redis() -> Redis:
+    return Redis.from_url(
+        settings.BULKHEAD_REDIS_URL,  # type: ignore[misc]
+        socket_connect_timeout=REDIS_TIMEOUT,
+        socket_timeout=REDIS_TIMEOUT,
+    )
@@ -0,0 +1,70 @@
+import time
+from collections.abc import Hashable
+from enum import Enum
+from threading import Lock
+
+from sqlalchemy.exc import SQLAlchemyError
+
+
+# Consecutive failed connections after which a database is considered down
+FAILURE_THRESHOLD = 3
+# Seconds before a connection is attempted again on a database considered down
+RESET_TIMEOUT = 30
+
+
+class DatabaseUnavailableError(SQLAlchemyError):
+    pass
+
+
+class CircuitState(Enum):
+    CLOSED = 'CLOSED'
+    OPEN = 'OPEN'
+    # A single probe connection decides whether the database is back
+    HALF_OPEN = 'HALF_OPEN'
+
+
+class CircuitBreaker:
+    """Fails connections to a database immediately while recent connections have failed."""
+
+    def __init__(self) -> None:
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = Lock()
+
+    def before_connect(self) -> None:
+        """Raise ``DatabaseUnavailableError`` unless a connection may be attempted."""
+        with self._lock:
+            match self.state:
+                case CircuitState.CLOSED:
+                    return
+                # A probe that never reported back is replaced by a new one
+                case _ if time.monotonic() - self.opened_at >= RESET_TIMEOUT:
+                    self.state = CircuitState.HALF_OPEN
+                    self.opened_at = time.monotonic()
+                    return
+            raise DatabaseUnavailableError('The database is unreachable, try again later')
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CircuitState.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == CircuitState.HALF_OPEN or self.failures >= FAILURE_THRESHOLD:
+                self.state = CircuitState.OPEN
+                self.opened_at = time.monotonic()
+
+
+_breakers: dict[Hashable, CircuitBreaker] = {}
+_breakers_lock = Lock()
+
+
+def get_circuit_breaker(key: Hashable) -> CircuitBreaker:
+    with _breakers_lock:
+        breaker = _breakers.get(key)
+        if breaker is None:
+            breaker = _breakers[key] = CircuitBreaker()
+        return breaker
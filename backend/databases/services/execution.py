@@ -1,22 +1,57 @@
+from collections.abc import Generator, Sequence
+from itertools import islice
+from typing import Any
+
 from databases.models import DatabaseConnectionInfo
 from databases.types import QueryResult
 from sqlalchemy import text as sql_text
 
 
-def execute_sql(sql: str, db: DatabaseConnectionInfo) -> QueryResult:
-    engine = db.to_sqlalchemy_engine()
+# Rows fetched from the server-side cursor at a time while streaming
+STREAM_BATCH_SIZE = 1000
+
 
-    with engine.connect() as conn:
+def execute_sql(sql: str, db: DatabaseConnectionInfo, max_rows: int | None = None) -> QueryResult:
+    with db.connect() as conn:
+        if max_rows is not None:
+            # Rows past the cap are never transferred from the database
+            conn = conn.execution_options(stream_results=True)
         result = conn.execute(sql_text(sql))
 
+        truncated = False
         if result.returns_rows:
-            rows = result.fetchall()
+            if max_rows is None:
+                rows = result.fetchall()
+            else:
+                rows = result.fetchmany(max_rows)
+                truncated = result.fetchone() is not None
             columns = list(result.keys())
         else:
             rows = []
             columns = []
 
-        return {
+        query_result: QueryResult = {
             'columns': columns,
             'rows': [list(row) for row in rows],
         }
+        if truncated:
+            query_result['truncated'] = True
+        return query_result
+
+
+def stream_sql(
+    sql: str, db: DatabaseConnectionInfo, max_rows: int | None = None
+) -> Generator[Sequence[Any], None, None]:
+    """Yield the names of the columns of ``sql``, then its rows as they are fetched.
+
+    Only a batch of rows is held at a time, and closing the iterator releases the connection.
+    """
+    with db.connect() as conn:
+        conn = conn.execution_options(stream_results=True, yield_per=STREAM_BATCH_SIZE)
+        result = conn.execute(sql_text(sql))
+        if not result.returns_rows:
+            yield []
+            return
+
+        yield list(result.keys())
+        yield from islice(result, max_rows)
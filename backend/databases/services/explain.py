@@ -0,0 +1,23 @@
+import json
+
+from databases.models.database_connection_info import DatabaseConnectionInfo
+from databases.types import PlanEstimate
+
+from .execution import execute_sql
+
+
+def explain_sql(sql: str, db: DatabaseConnectionInfo) -> PlanEstimate | None:
+    """Plan ``sql`` without running it, returning the planner's estimates where available.
+
+    Raises ``SQLAlchemyError`` if the database cannot plan the query.
+    """
+    if db.database_type != 'postgresql':
+        execute_sql(f'EXPLAIN {sql}', db)
+        return None
+
+    [[plans]] = execute_sql(f'EXPLAIN (FORMAT JSON) {sql}', db)['rows']
+    # Drivers that do not decode JSON return the plan as text
+    if isinstance(plans, str):
+        plans = json.loads(plans)
+    plan = plans[0]['Plan']
+    return {'cost': float(plan['Total Cost']), 'rows': float(plan['Plan Rows'])}
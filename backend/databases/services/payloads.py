@@ -0,0 +1,38 @@
+import json
+from collections.abc import Callable
+from enum import StrEnum
+
+from django.core.cache import cache
+
+from databases.models import Database
+from databases.types import Schema
+from databases.utils import compact_schema, format_schema
+
+
+class SchemaRendering(StrEnum):
+    JSON = 'json'
+    TEXT = 'text'
+    COMPACT = 'compact'
+
+
+_RENDERERS: dict[SchemaRendering, Callable[[Schema], str]] = {
+    # As compact as the API's JSON, so it can be sent within its responses as it is
+    SchemaRendering.JSON: lambda schema: json.dumps(
+        schema, ensure_ascii=False, separators=(',', ':')
+    ),
+    SchemaRendering.TEXT: format_schema,
+    SchemaRendering.COMPACT: compact_schema,
+}
+
+
+def get_schema_payload(db: Database, rendering: SchemaRendering) -> bytes:
+    """The schema of ``db`` in ``rendering``, rendered once for each version of the schema."""
+    # Keyed by the fingerprint, so refreshed schemas are rendered again
+    cache_key = f'schema_payload_{rendering}_{db.schema_fingerprint}'
+    payload: bytes | None = cache.get(cache_key)
+
+    if payload is None:
+        payload = _RENDERERS[rendering](db.schema).encode()
+        cache.set(cache_key, payload)
+
+    return payload
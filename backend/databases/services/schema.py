@@ -1,3 +1,5 @@
+import hashlib
+import json
 from typing import Any
 
 from databases.models.database_connection_info import DatabaseConnectionInfo
@@ -23,32 +25,39 @@ from sqlalchemy import (
 from sqlalchemy.types import TypeEngine
 
 
+def schema_digest(schema: Schema) -> str:
+    """Stable digest of ``schema``, independent of key order."""
+    encoded = json.dumps(schema, sort_keys=True).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
 def get_schema(db: DatabaseConnectionInfo) -> Schema:
-    engine = db.to_sqlalchemy_engine()
-    inspector = inspect(engine)
     schema: Schema = {}
 
-    for table_name in inspector.get_table_names():
-        columns = inspector.get_columns(table_name)
-        primary_keys = inspector.get_pk_constraint(table_name).get('constrained_columns', [])
+    with db.connect() as conn:
+        inspector = inspect(conn)
 
-        foreign_keys: dict[str, ForeignKey] = {
-            fk['constrained_columns'][0]: {
-                'table': fk['referred_table'],
-                'column': fk['referred_columns'][0],
+        for table_name in inspector.get_table_names():
+            columns = inspector.get_columns(table_name)
+            primary_keys = inspector.get_pk_constraint(table_name).get('constrained_columns', [])
+
+            foreign_keys: dict[str, ForeignKey] = {
+                fk['constrained_columns'][0]: {
+                    'table': fk['referred_table'],
+                    'column': fk['referred_columns'][0],
+                }
+                for fk in inspector.get_foreign_keys(table_name)
             }
-            for fk in inspector.get_foreign_keys(table_name)
-        }
-
-        schema[table_name] = {
-            col['name']: {
-                'type': _sqlalchemy_type_to_data_type(col['type']),
-                'nullable': col['nullable'],
-                'primary_key': col['name'] in primary_keys,
-                'references': foreign_keys.get(col['name']),
+
+            schema[table_name] = {
+                col['name']: {
+                    'type': _sqlalchemy_type_to_data_type(col['type']),
+                    'nullable': col['nullable'],
+                    'primary_key': col['name'] in primary_keys,
+                    'references': foreign_keys.get(col['name']),
+                }
+                for col in columns
             }
-            for col in columns
-        }
 
     return schema
 
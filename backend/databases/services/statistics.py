@@ -0,0 +1,33 @@
+from databases.models.database_connection_info import DatabaseConnectionInfo
+from databases.types import TableSizes
+from sqlalchemy import Connection, inspect, table
+from sqlalchemy import text as sql_text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.sql import func, select
+
+
+_POSTGRES_TABLE_SIZES = """
+    SELECT c.relname, c.reltuples
+    FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE c.relkind = 'r' AND n.nspname = current_schema() AND c.reltuples >= 0
+"""
+
+
+def get_table_sizes(db: DatabaseConnectionInfo) -> TableSizes:
+    """Estimated number of rows of each table, or an empty mapping if they are unavailable."""
+    try:
+        with db.connect() as conn:
+            if db.database_type == 'postgresql':
+                # Planner statistics are maintained by ANALYZE, so tables are not scanned
+                rows = conn.execute(sql_text(_POSTGRES_TABLE_SIZES)).all()
+                return {row.relname: int(row.reltuples) for row in rows}
+            return _count_rows(conn)
+    except SQLAlchemyError:
+        return {}
+
+
+def _count_rows(conn: Connection) -> TableSizes:
+    return {
+        name: conn.execute(select(func.count()).select_from(table(name))).scalar_one()
+        for name in inspect(conn).get_table_names()
+    }
@@ -0,0 +1,222 @@
+import threading
+import uuid
+from collections.abc import Callable, Iterator
+from typing import cast
+
+from django.test import override_settings
+
+import pytest
+from databases.models import Database
+from databases.services import bulkhead as bulkheads
+from databases.services.bulkhead import (
+    Bulkhead,
+    DatabaseBusyError,
+    RedisBulkhead,
+    bulkhead_stats,
+    database_bulkhead,
+)
+from decouple import config
+from redis import Redis, RedisError
+from redis.backoff import NoBackoff
+from redis.retry import Retry
+
+
+MakeBulkhead = Callable[[int, int], Bulkhead | RedisBulkhead]
+
+
+@pytest.fixture
+def redis() -> Iterator[Redis]:
+    client = Redis.from_url(config('REDIS_URL'))
+    try:
+        client.ping()
+    except RedisError:
+        pytest.skip('Redis is not running')
+    yield client
+    client.close()  # type: ignore[no-untyped-call]
+
+
+@pytest.fixture
+def redis_key(redis: Redis) -> Iterator[str]:
+    key = f'test_{uuid.uuid4().hex}'
+    yield key
+    keys = cast(list[bytes], redis.keys(f'bulkhead:{key}:*'))
+    if keys:
+        redis.delete(*keys)
+
+
+@pytest.fixture(params=['process', 'redis'])
+def make_bulkhead(request: pytest.FixtureRequest) -> MakeBulkhead:
+    if request.param == 'process':
+        return Bulkhead
+    redis, key = request.getfixturevalue('redis'), request.getfixturevalue('redis_key')
+    return lambda max_concurrent, max_queued: RedisBulkhead(redis, key, max_concurrent, max_queued)
+
+
+def test_bulkhead_admits_up_to_limit(make_bulkhead: MakeBulkhead) -> None:
+    bulkhead = make_bulkhead(2, 0)
+
+    with bulkhead.enter(timeout=0), bulkhead.enter(timeout=0):
+        with pytest.raises(DatabaseBusyError), bulkhead.enter(timeout=0):
+            pass
+        assert bulkhead.stats()['active'] == 2
+
+    assert bulkhead.stats() == {
+        'active': 0,
+        'queued': 0,
+        'peak_queued': 0,
+        'admitted': 2,
+        'rejected': 1,
+        'wait_seconds': 0,
+    }
+
+
+def test_queued_query_times_out(make_bulkhead: MakeBulkhead) -> None:
+    bulkhead = make_bulkhead(1, 1)
+
+    with bulkhead.enter(timeout=0):
+        with pytest.raises(DatabaseBusyError, match='Timed out'), bulkhead.enter(timeout=0.01):
+            pass
+
+    stats = bulkhead.stats()
+    assert (stats['peak_queued'], stats['rejected']) == (1, 1)
+    assert stats['wait_seconds'] >= 0.01
+
+
+def test_queued_query_runs_when_slot_frees(make_bulkhead: MakeBulkhead) -> None:
+    bulkhead = make_bulkhead(1, 1)
+    entered = threading.Event()
+    release = threading.Event()
+
+    def hold() -> None:
+        with bulkhead.enter(timeout=0):
+            entered.set()
+            release.wait()
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    entered.wait()
+    threading.Timer(0.05, release.set).start()
+
+    with bulkhead.enter(timeout=5):
+        stats = bulkhead.stats()
+    holder.join()
+
+    assert stats['active'] == 1
+    assert stats['peak_queued'] == 1
+    assert stats['wait_seconds'] > 0
+
+
+def test_queued_queries_run_in_arrival_order(make_bulkhead: MakeBulkhead) -> None:
+    bulkhead = make_bulkhead(1, 3)
+    admitted: list[int] = []
+    release = threading.Event()
+
+    def run(i: int) -> None:
+        with bulkhead.enter(timeout=5):
+            admitted.append(i)
+
+    with bulkhead.enter(timeout=0):
+        threads = []
+        for i in range(3):
+            thread = threading.Thread(target=run, args=(i,))
+            thread.start()
+            threads.append(thread)
+            # Each query is queued before the next one arrives
+            while bulkhead.stats()['queued'] <= i:
+                release.wait(0.01)
+
+    for thread in threads:
+        thread.join()
+
+    assert admitted == [0, 1, 2]
+
+
+def test_redis_bulkhead_is_shared_by_clients(redis: Redis, redis_key: str) -> None:
+    other_process = Redis.from_url(config('REDIS_URL'))
+
+    with RedisBulkhead(redis, redis_key, 1, 0).enter(timeout=0):
+        with pytest.raises(DatabaseBusyError):
+            with RedisBulkhead(other_process, redis_key, 1, 0).enter(timeout=0):
+                pass
+
+    with RedisBulkhead(other_process, redis_key, 1, 0).enter(timeout=0):
+        pass
+    # Bulkheads no one enters any more are dropped after a while
+    assert 0 < cast(int, redis.ttl(f'bulkhead:{redis_key}:stats')) <= bulkheads.IDLE_TIMEOUT
+    other_process.close()  # type: ignore[no-untyped-call]
+
+
+def test_redis_bulkhead_drops_tickets_of_stopped_processes(
+    redis: Redis, redis_key: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    stopped = RedisBulkhead(redis, redis_key, 1, 0)
+    monkeypatch.setattr(bulkheads, 'HOLD_LEASE', -1)
+    # Never releases its slot
+    stopped._acquire('stopped', timeout=0)
+    monkeypatch.undo()
+
+    with RedisBulkhead(redis, redis_key, 1, 0).enter(timeout=0):
+        pass
+
+
+def test_users_are_limited_separately() -> None:
+    db = Database(id=10, max_concurrent_queries=2, max_concurrent_queries_per_user=1)
+
+    with database_bulkhead(db, user_id=1):
+        with pytest.raises(DatabaseBusyError), database_bulkhead(db, user_id=1):
+            pass
+        with database_bulkhead(db, user_id=2):
+            stats = bulkhead_stats(db)
+            assert stats is not None
+            assert stats['active'] == 2
+
+
+def test_idle_user_bulkheads_are_dropped() -> None:
+    db = Database(id=12, max_concurrent_queries=2, max_concurrent_queries_per_user=1)
+
+    with database_bulkhead(db, user_id=1):
+        assert '12:user:1' in bulkheads._bulkheads
+
+    assert '12:user:1' not in bulkheads._bulkheads
+    assert '12' in bulkheads._bulkheads
+
+
+def test_database_bulkhead_is_shared_through_redis(redis: Redis) -> None:
+    db = Database(id=uuid.uuid4().int % 10**9, max_concurrent_queries=1, max_queued_queries=0)
+
+    with override_settings(BULKHEAD_REDIS_URL=config('REDIS_URL')):
+        with database_bulkhead(db):
+            stats = bulkhead_stats(db)
+        assert str(db.id) not in bulkheads._bulkheads
+
+    redis.delete(*cast(list[bytes], redis.keys(f'bulkhead:{db.id}:*')))
+    assert stats is not None
+    assert (stats['active'], stats['admitted']) == (1, 1)
+
+
+def test_bulkheads_fall_back_to_the_process_while_redis_is_unreachable(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    db = Database(id=13, max_concurrent_queries=1, max_queued_queries=0)
+    # Nothing listens on the port
+    unreachable = Redis(port=1, retry=Retry(NoBackoff(), 0))
+    monkeypatch.setattr(bulkheads, '_redis', lambda: unreachable)
+
+    with override_settings(BULKHEAD_REDIS_URL='redis://localhost:1'):
+        with database_bulkhead(db):
+            with pytest.raises(DatabaseBusyError), database_bulkhead(db):
+                pass
+            stats = bulkhead_stats(db)
+
+    assert stats is not None
+    assert (stats['active'], stats['admitted'], stats['rejected']) == (1, 1, 1)
+    # Slots that cannot be given back are left to their leases
+    RedisBulkhead(unreachable, 'test', 1, 0)._release('ticket')
+
+
+def test_unlimited_database_has_no_bulkhead() -> None:
+    db = Database(id=11)
+
+    with database_bulkhead(db):
+        assert bulkhead_stats(db) is None
+        assert '11' not in bulkheads._bulkheads
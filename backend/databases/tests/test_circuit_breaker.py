@@ -0,0 +1,98 @@
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.cache import cache
+
+import pytest
+from databases.models import Database, DatabaseConnectionInfo
+from databases.services.circuit_breaker import (
+    FAILURE_THRESHOLD,
+    CircuitBreaker,
+    CircuitState,
+    DatabaseUnavailableError,
+)
+from databases.services.execution import execute_sql
+from queries.services.sql.validation import validate_sql
+from query_cod.types import DataType
+from sqlalchemy import create_engine
+
+
+@pytest.fixture
+def unreachable(tmp_path: Path) -> DatabaseConnectionInfo:
+    return DatabaseConnectionInfo(
+        'sqlite', host='', port=None, user=None, password=None, name=str(tmp_path / 'no/db.sqlite3')
+    )
+
+
+def test_breaker_opens_after_repeated_failures(unreachable: DatabaseConnectionInfo) -> None:
+    for _ in range(FAILURE_THRESHOLD):
+        with pytest.raises(DatabaseUnavailableError, match='Could not connect'):
+            execute_sql('SELECT 1', unreachable)
+
+    with (
+        patch('databases.models.database_connection_info.create_engine') as mock_create_engine,
+        pytest.raises(DatabaseUnavailableError, match='unreachable'),
+    ):
+        execute_sql('SELECT 1', unreachable)
+    mock_create_engine.assert_not_called()
+    assert unreachable.circuit_breaker.state == CircuitState.OPEN
+
+
+def test_breaker_probes_once_after_reset_timeout() -> None:
+    breaker = CircuitBreaker()
+    for _ in range(FAILURE_THRESHOLD):
+        breaker.record_failure()
+
+    with patch('databases.services.circuit_breaker.RESET_TIMEOUT', 0):
+        breaker.before_connect()
+    with pytest.raises(DatabaseUnavailableError):
+        breaker.before_connect()
+
+    breaker.record_success()
+    breaker.before_connect()
+
+
+def test_failed_probe_reopens_breaker() -> None:
+    breaker = CircuitBreaker()
+    breaker.state = CircuitState.HALF_OPEN
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_postgres_connections_time_out_quickly() -> None:
+    db = DatabaseConnectionInfo('postgresql', 'localhost', 5432, 'user', 'secret', 'db')
+
+    with patch(
+        'databases.models.database_connection_info.create_engine', wraps=create_engine
+    ) as mock_create_engine:
+        db.to_sqlalchemy_engine()
+
+    assert mock_create_engine.call_args.kwargs['connect_args']['connect_timeout'] == 3
+
+
+@pytest.mark.django_db
+def test_validation_works_while_database_is_down(tmp_path: Path) -> None:
+    db = Database.objects.create(
+        name='Down',
+        database_type=Database.DatabaseType.SQLITE,
+        port=0,
+        database_name=str(tmp_path / 'no/db.sqlite3'),
+    )
+    schema = {
+        'users': {
+            'id': {
+                'type': DataType.INTEGER,
+                'nullable': False,
+                'primary_key': True,
+                'references': None,
+            }
+        }
+    }
+    cache.delete(f'database_schema_{db.id}')
+    cache.set(f'database_schema_{db.id}_last_known', schema, None)
+
+    with patch('databases.models.database.get_schema', side_effect=DatabaseUnavailableError()):
+        assert db.schema == schema
+        assert validate_sql('SELECT id FROM users', db)[1] == []
@@ -1,8 +1,16 @@
+import json
+
+from django.core.cache import cache
+from django.test import Client
 from django.urls import reverse
 
 import pytest
 from databases.models import Database
+from databases.renderers import PreRenderedJSONRenderer
+from databases.services.bulkhead import database_bulkhead
+from model_bakery import baker
 from rest_framework.test import APIClient
+from users.models import User
 
 
 @pytest.fixture
@@ -32,3 +40,65 @@ def test_list_databases(auth_client: APIClient, mock_db: Database) -> None:
     expected_fields = ['id', 'name']
     for field in expected_fields:
         assert field in db_data
+
+
+@pytest.mark.django_db
+def test_retrieve_database_is_not_resent_until_its_schema_changes(
+    auth_client: APIClient, mock_db: Database
+) -> None:
+    schema_key = f'database_schema_{mock_db.id}'
+    cache.delete(f'{schema_key}_fingerprint')
+    cache.set(schema_key, {'users': {}})
+    url = reverse('databases-detail', kwargs={'pk': mock_db.id})
+
+    response = auth_client.get(url)
+    assert response.json()['schema'] == {'users': {}}
+    etag = response['ETag']
+
+    response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response['ETag'] == etag
+    assert not response.content
+
+    # The schema is introspected again
+    cache.delete(schema_key)
+    cache.delete(f'{schema_key}_fingerprint')
+    cache.set(schema_key, {'accounts': {}})
+
+    response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.json()['schema'] == {'accounts': {}}
+    assert response['ETag'] != etag
+
+
+@pytest.mark.parametrize('renderer_context', [None, {'indent': 4}])
+def test_pre_rendered_values_are_sent_as_they_are(renderer_context: dict[str, int] | None) -> None:
+    data = {'id': 1, 'schema': b'{"users":{}}'}
+
+    rendered = PreRenderedJSONRenderer().render(data, renderer_context=renderer_context)
+
+    assert json.loads(rendered) == {'id': 1, 'schema': {'users': {}}}
+    assert PreRenderedJSONRenderer().render({'schema': b'{}'}) == b'{"schema":{}}'
+
+
+@pytest.mark.django_db
+def test_admin_lists_query_load(client: Client, mock_db: Database) -> None:
+    mock_db.max_concurrent_queries = 4
+    mock_db.save()
+    client.force_login(baker.make(User, is_staff=True, is_superuser=True))
+
+    with database_bulkhead(mock_db):
+        response = client.get(reverse('admin:databases_database_changelist'))
+
+    assert response.status_code == 200
+    assert '1/4 running, 0 queued' in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_admin_shows_compilation_cache(client: Client, mock_db: Database) -> None:
+    client.force_login(baker.make(User, is_staff=True, is_superuser=True))
+
+    response = client.get(reverse('admin:databases_database_change', args=[mock_db.id]))
+
+    assert response.status_code == 200
+    assert 'Compiled RA queries in this process' in response.content.decode()
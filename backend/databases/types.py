@@ -1,4 +1,4 @@
-from typing import Any, TypedDict
+from typing import Any, NotRequired, TypedDict
 
 from query_cod.types import DataType
 
@@ -6,6 +6,7 @@ from query_cod.types import DataType
 class QueryResult(TypedDict):
     columns: list[str]
     rows: list[list[Any]]
+    truncated: NotRequired[bool]
 
 
 TableName = str
@@ -27,3 +28,10 @@ class Column(TypedDict):
 Columns = dict[ColumnName, Column]
 
 Schema = dict[TableName, Columns]
+
+TableSizes = dict[TableName, int]
+
+
+class PlanEstimate(TypedDict):
+    cost: float
+    rows: float
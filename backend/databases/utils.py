@@ -23,3 +23,25 @@ def format_schema(schema: Schema) -> str:
         lines.append('')  # add empty line between tables
 
     return '\n'.join(lines)
+
+
+def compact_schema(schema: Schema) -> str:
+    """One line per table in relation notation, shorter than ``format_schema`` for prompts."""
+    lines: list[str] = []
+
+    for table_name, columns in schema.items():
+        attributes: list[str] = []
+        for col_name, col_info in columns.items():
+            attribute = f"{col_name} {col_info['type']}"
+
+            if col_info.get('primary_key', False):
+                attribute += ' pk'
+
+            if ref := col_info.get('references'):
+                attribute += f" -> {ref['table']}.{ref['column']}"
+
+            attributes.append(attribute)
+
+        lines.append(f"{table_name}({', '.join(attributes)})")
+
+    return '\n'.join(lines)
@@ -1,6 +1,13 @@
+from typing import Any
+
+from common.views import conditional_response
 from rest_framework import mixins, serializers, viewsets
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
 
 from .models import Database
+from .renderers import PreRenderedJSONRenderer
 from .serializers import DatabaseSerializer, DatabaseSummarySerializer
 
 
@@ -9,8 +16,17 @@ class DatabaseViewSet(
 ):
     queryset = Database.objects.all().order_by('name')
     pagination_class = None
+    renderer_classes = [PreRenderedJSONRenderer, BrowsableAPIRenderer]  # noqa: RUF012
 
     def get_serializer_class(self) -> type[serializers.ModelSerializer[Database]]:
         if self.action == 'list':
             return DatabaseSummarySerializer
         return DatabaseSerializer
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        database = self.get_object()
+        # The schema is introspected, so it changes without the database being modified
+        version = (database.pk, database.modified, database.schema_fingerprint)
+        return conditional_response(
+            request, version, lambda: Response(self.get_serializer(database).data)
+        )
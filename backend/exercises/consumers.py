@@ -0,0 +1,17 @@
+from queries.consumers import LiveValidationConsumer
+
+from .models import Attempt, Exercise
+
+
+class AttemptValidationConsumer(LiveValidationConsumer):
+    def get_query(self, user_id: int, pk: int) -> Attempt | None:
+        """The user's attempt at the exercise ``pk``, unsaved if they have not written to it yet."""
+        attempt = (
+            Attempt.objects.filter(user_id=user_id, exercise_id=pk)
+            .select_related('exercise__database')
+            .first()
+        )
+        if attempt is not None:
+            return attempt
+        exercise = Exercise.objects.select_related('database').filter(pk=pk).first()
+        return None if exercise is None else Attempt(user_id=user_id, exercise=exercise)
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:25
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def merge_duplicate_attempts(apps, schema_editor):
+    # Users opening an exercise twice at once could get two attempts. The latest one is kept, with
+    # the messages of the others, and completed if any of them was
+    Attempt = apps.get_model('exercises', 'Attempt')
+    Message = apps.get_model('assistant', 'Message')
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    attempt_type = ContentType.objects.filter(app_label='exercises', model='attempt').first()
+    duplicates = (
+        Attempt.objects.values('user', 'exercise').annotate(count=Count('id')).filter(count__gt=1)
+    )
+    for duplicate in duplicates:
+        kept, *others = Attempt.objects.filter(
+            user=duplicate['user'], exercise=duplicate['exercise']
+        ).order_by('-modified', '-id')
+        other_ids = [attempt.id for attempt in others]
+        if any(attempt.completed for attempt in others):
+            Attempt.objects.filter(id=kept.id).update(completed=True)
+        if attempt_type is not None:
+            Message.objects.filter(object_type=attempt_type, object_id__in=other_ids).update(
+                object_id=kept.id
+            )
+        Attempt.objects.filter(id__in=other_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assistant', '0002_alter_message_options'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('exercises', '0003_exercise_difficulty_alter_exercise_language'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_attempts, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='attempt',
+            constraint=models.UniqueConstraint(fields=('user', 'exercise'), name='attempt_user_exercise_unique'),
+        ),
+    ]
@@ -17,8 +17,16 @@ class Attempt(AbstractQuery, IndexedTimeStampedModel):
         Exercise, on_delete=models.CASCADE, related_name='attempts'
     )
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='attempts')
+    user_id: int
     completed = models.BooleanField(default=False)
 
+    class Meta:
+        constraints = [  # noqa: RUF012
+            models.UniqueConstraint(
+                fields=['user', 'exercise'], name='attempt_user_exercise_unique'
+            ),
+        ]
+
     @property
     def query(self) -> str:
         return self.text
@@ -31,6 +39,10 @@ class Attempt(AbstractQuery, IndexedTimeStampedModel):
     def database(self) -> Database:
         return cast(Database, self.exercise.database)
 
+    @property
+    def owner_id(self) -> int | None:
+        return self.user_id
+
     objects: models.Manager['Attempt']
 
     assistant_messages = GenericRelation(
@@ -2,13 +2,13 @@ from typing import TYPE_CHECKING
 
 from django.core.cache import cache
 from django.db import models
+from django.db.models import Exists, OuterRef, QuerySet
 
 from common.models import IndexedTimeStampedModel
 from databases.models.database import Database
 from databases.types import QueryResult
 from queries.models import Language
 from queries.services.execution import execute_query
-from users.models import User
 
 from .solution import Solution
 
@@ -36,11 +36,22 @@ class Exercise(IndexedTimeStampedModel):
     description = models.TextField()
     solution = models.TextField()
 
+    @classmethod
+    def for_user(cls, user_id: int | None) -> QuerySet['Exercise']:
+        """Exercises with their database, and whether the user has completed each of them."""
+        from .attempt import Attempt
+
+        completed = Attempt.objects.filter(exercise=OuterRef('pk'), user_id=user_id, completed=True)
+        exercises: QuerySet[Exercise] = cls.objects.select_related('database').annotate(
+            completed=Exists(completed)
+        )
+        return exercises
+
     objects: models.Manager['Exercise']
     attempts: models.Manager['Attempt']
 
-    def completed_by(self, user: User) -> bool:
-        return self.attempts.filter(user=user, completed=True).exists()
+    if TYPE_CHECKING:
+        completed: bool
 
     @property
     def solution_data(self) -> QueryResult | None:
@@ -48,7 +59,8 @@ class Exercise(IndexedTimeStampedModel):
         result: QueryResult = cache.get(cache_key)
 
         if result is None:
-            result = execute_query(Solution(self))
+            # Solutions are trusted, and must not be capped
+            result = execute_query(Solution(self), admission=False)
             cache.set(cache_key, result)
 
         return result
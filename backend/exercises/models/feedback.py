@@ -1,4 +1,4 @@
-from typing import TypedDict
+from typing import NotRequired, TypedDict
 
 from databases.types import QueryResult
 
@@ -6,3 +6,5 @@ from databases.types import QueryResult
 class Feedback(TypedDict):
     correct: bool
     results: QueryResult | None
+    result_id: NotRequired[str]
+    count: NotRequired[int]
@@ -1,14 +1,13 @@
-from assistant.serializers import MessageSerializer
+from common.serializers import ChangedFieldsMixin
 from queries.models import Language
-from queries.serializers.error import QueryErrorSerializer
 from rest_framework import serializers
 
 from ..models.attempt import Attempt
 
 
-class AttemptSerializer(serializers.ModelSerializer[Attempt]):
-    validation_errors = QueryErrorSerializer(many=True, read_only=True)
-    assistant_messages = MessageSerializer(many=True, read_only=True)
+class AttemptSerializer(ChangedFieldsMixin, serializers.ModelSerializer[Attempt]):
+    # Attempts are found by their exercise, as they are only saved once the user writes to them
+    id = serializers.IntegerField(source='exercise_id', read_only=True)  # noqa: A003
     language = serializers.ChoiceField(choices=Language.choices, read_only=True)
 
     class Meta:
@@ -16,8 +15,6 @@ class AttemptSerializer(serializers.ModelSerializer[Attempt]):
         fields = [  # noqa: RUF012
             'id',
             'text',
-            'validation_errors',
             'completed',
             'language',
-            'assistant_messages',
         ]
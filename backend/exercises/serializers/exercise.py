@@ -6,13 +6,14 @@ from queries.models import Language
 from queries.serializers.execution import QueryResultDataSerializer
 from rest_framework import serializers
 
-from ..models import Attempt, Exercise
+from ..models import Exercise
 from .attempt import AttemptSerializer
 
 
 class BaseExerciseSerializer(serializers.ModelSerializer[Exercise]):
     language = serializers.ChoiceField(choices=Language.choices)
-    completed = serializers.SerializerMethodField()
+    # Annotated by Exercise.for_user
+    completed = serializers.BooleanField(read_only=True)
 
     class Meta:
         model = Exercise
@@ -21,9 +22,6 @@ class BaseExerciseSerializer(serializers.ModelSerializer[Exercise]):
             'completed',
         ]
 
-    def get_completed(self, obj: Exercise) -> bool:
-        return obj.completed_by(self.context['request'].user)
-
 
 class ExerciseSerializer(BaseExerciseSerializer):
     database = DatabaseSummarySerializer(read_only=True)
@@ -47,8 +45,7 @@ class ExerciseSerializer(BaseExerciseSerializer):
 
     @extend_schema_field(AttemptSerializer)
     def get_attempt(self, obj: Exercise) -> dict[str, Any]:
-        attempt, _ = Attempt.objects.get_or_create(user=self.context['request'].user, exercise=obj)
-        return AttemptSerializer(attempt).data
+        return AttemptSerializer(self.context['attempt']).data
 
 
 class ExerciseSummarySerializer(BaseExerciseSerializer):
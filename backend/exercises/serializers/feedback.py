@@ -1,4 +1,5 @@
-from queries.serializers.execution import QueryResultDataSerializer
+from drf_spectacular.utils import PolymorphicProxySerializer
+from queries.serializers.execution import QueryExecutionSerializer, QueryResultDataSerializer
 from rest_framework import serializers
 
 from ..models.feedback import Feedback
@@ -7,3 +8,19 @@ from ..models.feedback import Feedback
 class FeedbackSerializer(serializers.Serializer[Feedback]):
     correct = serializers.BooleanField()
     results = QueryResultDataSerializer(required=False)
+    result_id = serializers.CharField(
+        required=False,
+        help_text=(
+            'Identifies the stored result, to fetch its rows a page at a time. Missing if the '
+            'result was too large to keep'
+        ),
+    )
+    count = serializers.IntegerField(required=False, help_text='Number of rows in the whole result')
+
+
+# Attempts too expensive to run are answered as rejected executions are
+SubmissionSerializer = PolymorphicProxySerializer(
+    component_name='Submission',
+    serializers=[FeedbackSerializer, QueryExecutionSerializer],
+    resource_type_field_name=None,
+)
@@ -10,14 +10,23 @@ def _order_result(result: QueryResult) -> QueryResult:
 
 
 def mark_attempt(attempt: Attempt) -> Feedback:
-    attempt_results = execute_query(attempt)
+    """Run ``attempt`` and compare its results with the solution's.
+
+    Raises ``QueryRejectedError`` if the attempt is too expensive to run.
+    """
     solution_results = attempt.exercise.solution_data
+    # Capped results hold a row more than the solution, so those still capped have too many rows
+    min_rows = len(solution_results['rows']) + 1 if solution_results else None
+    attempt_results = execute_query(attempt, min_rows=min_rows)
+    if attempt_results and attempt_results.get('truncated'):
+        return {'correct': False, 'results': attempt_results}
 
     if not attempt.exercise.is_order_significant:
         attempt_results = attempt_results and _order_result(attempt_results)
         solution_results = solution_results and _order_result(solution_results)
 
-    is_correct = attempt_results == solution_results
+    # Attempts that fail to run are never correct, even if the solution failed too
+    is_correct = attempt_results is not None and attempt_results == solution_results
 
     if is_correct:
         attempt.completed = True
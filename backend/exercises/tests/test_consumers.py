@@ -0,0 +1,22 @@
+import pytest
+from exercises.consumers import AttemptValidationConsumer
+from exercises.models import Attempt, Exercise
+from model_bakery import baker
+from users.models import User
+
+
+@pytest.mark.django_db
+def test_attempts_are_validated_before_they_are_saved(user: User) -> None:
+    exercise = baker.make(Exercise, language='sql')
+    consumer = AttemptValidationConsumer()
+
+    attempt = consumer.get_query(user.id, exercise.id)
+
+    assert attempt is not None
+    assert attempt.pk is None
+    assert attempt.database == exercise.database
+    assert not Attempt.objects.exists()
+    assert consumer.get_query(user.id, exercise.id + 1) is None
+
+    saved = baker.make(Attempt, user=user, exercise=exercise)
+    assert consumer.get_query(user.id, exercise.id) == saved
@@ -0,0 +1,89 @@
+import sqlite3
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.cache import cache
+
+import pytest
+from databases.models import Database
+from exercises.models import Attempt, Exercise
+from exercises.services.mark_attempt import mark_attempt
+from model_bakery import baker
+from queries.services.admission import QueryRejectedError
+from query_cod.types import DataType
+
+
+@pytest.fixture
+def exercise(tmp_path: Path) -> Exercise:
+    path = tmp_path / 'target.sqlite3'
+    with sqlite3.connect(path) as conn:
+        conn.execute('CREATE TABLE users (id INTEGER PRIMARY KEY)')
+        conn.executemany('INSERT INTO users VALUES (?)', [(i,) for i in range(5)])
+    database = baker.make(
+        Database,
+        database_type=Database.DatabaseType.SQLITE,
+        database_name=str(path),
+        capped_query_rows=2,
+    )
+    cache.set(
+        f'database_schema_{database.id}',
+        {
+            'users': {
+                'id': {
+                    'type': DataType.INTEGER,
+                    'nullable': False,
+                    'primary_key': True,
+                    'references': None,
+                }
+            }
+        },
+    )
+    cache.delete(f'database_schema_{database.id}_fingerprint')
+    exercise = baker.make(Exercise, language='sql', database=database)
+    cache.set(f'exercise_{exercise.id}', {'columns': ['id'], 'rows': [[i] for i in range(4)]})
+    return exercise
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'text, correct',
+    [
+        ('SELECT id FROM users WHERE id < 4', True),
+        ('SELECT id FROM users', False),
+        ('SELECT id FROM users WHERE id < 3', False),
+    ],
+)
+def test_capped_attempts_are_marked_against_the_whole_solution(
+    exercise: Exercise, text: str, correct: bool
+) -> None:
+    attempt = baker.make(Attempt, exercise=exercise, text=text)
+
+    with patch(
+        'queries.services.admission.get_plan_estimate', return_value={'cost': 1, 'rows': 500}
+    ):
+        feedback = mark_attempt(attempt)
+
+    assert feedback['correct'] is correct
+    attempt.refresh_from_db()
+    assert attempt.completed is correct
+
+
+@pytest.mark.django_db
+def test_rejected_attempts_are_not_marked(exercise: Exercise) -> None:
+    exercise.database.max_query_cost = 10
+    exercise.database.save()
+    attempt = baker.make(Attempt, exercise=exercise, text='SELECT id FROM users WHERE id < 4')
+    # Even when there is no solution to compare with
+    cache.set(f'exercise_{exercise.id}', None)
+
+    with (
+        patch(
+            'queries.services.admission.get_plan_estimate',
+            return_value={'cost': 100, 'rows': 4},
+        ),
+        pytest.raises(QueryRejectedError),
+    ):
+        mark_attempt(attempt)
+
+    attempt.refresh_from_db()
+    assert attempt.completed is False
@@ -0,0 +1,134 @@
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.urls import reverse
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+from exercises.models import Attempt, Exercise
+from model_bakery import baker
+from pytest_django import DjangoAssertNumQueries
+from queries.services.admission import QueryRejectedError
+from rest_framework import status
+from rest_framework.test import APIClient
+from users.models import User
+
+
+@pytest.fixture
+def exercises(user: User) -> list[Exercise]:
+    exercises = baker.make(Exercise, language='sql', _quantity=3)
+    for exercise in exercises:
+        cache.set(f'database_schema_{exercise.database.id}', {})
+        cache.delete(f'database_schema_{exercise.database.id}_fingerprint')
+        cache.set(f'exercise_{exercise.id}', {'columns': ['id'], 'rows': [[1]]})
+    baker.make(Attempt, user=user, exercise=exercises[0], completed=True)
+    # Content types are cached once per process
+    ContentType.objects.get_for_model(Attempt)
+    # Attempts of other users are not the user's
+    baker.make(Attempt, exercise=exercises[1], completed=True)
+    return exercises
+
+
+@pytest.mark.django_db
+def test_list_exercises_reports_completion_without_a_query_per_exercise(
+    auth_client: APIClient,
+    exercises: list[Exercise],
+    django_assert_num_queries: DjangoAssertNumQueries,
+) -> None:
+    url = reverse('exercises-list')
+
+    with django_assert_num_queries(3):
+        response = auth_client.get(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    completed = {exercise['id']: exercise['completed'] for exercise in response.json()}
+    assert completed == {
+        exercises[0].id: True,
+        exercises[1].id: False,
+        exercises[2].id: False,
+    }
+    assert all(exercise['database']['name'] for exercise in response.json())
+
+
+@pytest.mark.django_db
+def test_retrieve_exercise_does_not_save_the_attempt(
+    auth_client: APIClient,
+    user: User,
+    exercises: list[Exercise],
+    django_assert_num_queries: DjangoAssertNumQueries,
+) -> None:
+    url = reverse('exercises-detail', kwargs={'pk': exercises[2].id})
+
+    with django_assert_num_queries(4):
+        response = auth_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['completed'] is False
+    assert response.json()['attempt'] == {
+        'id': exercises[2].id,
+        'text': '',
+        'completed': False,
+        'language': 'sql',
+    }
+
+    validation = auth_client.get(reverse('attempts-validation', kwargs={'pk': exercises[2].id}))
+    assert validation.status_code == status.HTTP_200_OK
+    assert not Attempt.objects.filter(user=user, exercise=exercises[2]).exists()
+
+
+@pytest.mark.django_db
+def test_first_write_saves_the_attempt_once(
+    auth_client: APIClient, user: User, exercises: list[Exercise]
+) -> None:
+    url = reverse('attempts-detail', kwargs={'pk': exercises[2].id})
+
+    for text in ['SELECT 1', 'SELECT 2']:
+        response = auth_client.patch(url, {'text': text}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+
+    attempt = Attempt.objects.get(user=user, exercise=exercises[2])
+    assert attempt.text == 'SELECT 2'
+    detail = auth_client.get(reverse('exercises-detail', kwargs={'pk': exercises[2].id}))
+    assert detail.json()['attempt']['text'] == 'SELECT 2'
+
+
+@pytest.mark.django_db
+def test_attempts_are_found_by_their_exercise(
+    auth_client: APIClient, user: User, exercises: list[Exercise]
+) -> None:
+    for exercise in exercises[:2]:
+        url = reverse('attempts-detail', kwargs={'pk': exercise.id})
+        response = auth_client.patch(url, {'text': 'SELECT 1'}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['id'] == exercise.id
+
+    own = Attempt.objects.filter(user=user)
+    assert sorted(own.values_list('exercise', 'text')) == [
+        (exercises[0].id, 'SELECT 1'),
+        (exercises[1].id, 'SELECT 1'),
+    ]
+    assert own.get(exercise=exercises[0]).completed is True
+    # Attempts of other users at the same exercise are left alone
+    assert Attempt.objects.exclude(user=user).get(exercise=exercises[1]).text == ''
+    missing = reverse('attempts-detail', kwargs={'pk': max(e.id for e in exercises) + 1})
+    assert auth_client.patch(missing, {'text': 'x'}, format='json').status_code == 404
+
+
+@pytest.mark.django_db
+def test_submit_explains_rejected_attempts(
+    auth_client: APIClient, exercises: list[Exercise], monkeypatch: MonkeyPatch
+) -> None:
+    def reject(attempt: Attempt) -> None:
+        raise QueryRejectedError('The query is estimated to cost too much')
+
+    monkeypatch.setattr('exercises.views.attempt.mark_attempt', reject)
+    url = reverse('attempts-submit', kwargs={'pk': exercises[2].id})
+
+    response = auth_client.post(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        'success': False,
+        'error': {
+            'title': 'Query rejected',
+            'description': 'The query is estimated to cost too much',
+        },
+    }
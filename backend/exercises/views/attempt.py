@@ -1,20 +1,35 @@
+from typing import Any
+
+from django.db import transaction
 from django.db.models import QuerySet
+from django.http import Http404
 
 from assistant.views import MessagesMixin
+from common.views import NonAtomicActionsMixin
+from databases.services.bulkhead import DatabaseBusyError
+from databases.services.circuit_breaker import DatabaseUnavailableError
 from drf_spectacular.utils import extend_schema
-from exercises.serializers.feedback import FeedbackSerializer
-from queries.views import SubqueriesMixin
+from exercises.serializers.feedback import SubmissionSerializer
+from queries.serializers.execution import QueryExecutionSerializer
+from queries.services.admission import QueryRejectedError
+from queries.views import LIMIT_PARAMETER, SubqueriesMixin, stored_results
 from rest_framework import mixins, viewsets
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from ..models import Attempt
+from ..models import Attempt, Exercise
 from ..serializers import AttemptSerializer
 from ..services.mark_attempt import mark_attempt
 
 
+# Actions that save the attempt, so create it if the user has not written to it yet
+WRITE_ACTIONS = frozenset({'update', 'partial_update', 'submit', 'create_message'})
+
+
 class AttemptViewSet(
+    NonAtomicActionsMixin,
     MessagesMixin,
     SubqueriesMixin,
     mixins.UpdateModelMixin,
@@ -22,18 +37,57 @@ class AttemptViewSet(
 ):
     queryset = Attempt.objects.all()
     serializer_class = AttemptSerializer
+    # Users have one attempt at each exercise, found by the exercise as it may not be saved yet
+    lookup_field = 'exercise'
+    lookup_url_kwarg = 'pk'
 
     def get_queryset(self) -> QuerySet[Attempt]:
-        return Attempt.objects.filter(user=self.request.user)
+        return Attempt.objects.filter(user=self.request.user).select_related('exercise__database')
+
+    def get_object(self) -> Attempt:
+        try:
+            return super().get_object()
+        except Http404:
+            exercise = get_object_or_404(
+                Exercise.objects.select_related('database'), pk=self.kwargs['pk']
+            )
+
+        user_id = self.request.user.pk
+        if self.action not in WRITE_ACTIONS:
+            attempt = Attempt(user_id=user_id, exercise=exercise)
+        else:
+            attempt, _ = Attempt.objects.get_or_create(user_id=user_id, exercise=exercise)
+            attempt.exercise = exercise
+        self.check_object_permissions(self.request, attempt)
+        return attempt
+
+    @extend_schema(responses=AttemptSerializer(partial=True))
+    def partial_update(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Save the fields sent, responding with only those and the ones the save updates."""
+        return super().partial_update(request, *args, **kwargs)
 
     @extend_schema(
         request=None,
-        responses=FeedbackSerializer,
+        responses={200: SubmissionSerializer, 503: QueryExecutionSerializer},
+        parameters=[LIMIT_PARAMETER],
     )
     @action(detail=True, methods=['post'], url_path='submit')
+    @transaction.non_atomic_requests
     def submit(self, request: Request, pk: str) -> Response:
         attempt = self.get_object()
-        return Response(mark_attempt(attempt), status=200)
+        try:
+            feedback = mark_attempt(attempt)
+        except QueryRejectedError as e:
+            return self._handle_rejection(e)
+        except DatabaseBusyError as e:
+            return self._handle_unavailable('Database busy', e)
+        except DatabaseUnavailableError as e:
+            return self._handle_unavailable('Database unavailable', e)
+
+        results = feedback['results']
+        if not results:
+            return Response(feedback)
+        return Response({'correct': feedback['correct'], **stored_results(results, request)})
 
     def _system_prompt(self) -> str | None:
         exercise = self.get_object().exercise
@@ -1,5 +1,13 @@
+from typing import Any
+
+from django.db.models import QuerySet
+
+from common.views import conditional_response
 from rest_framework import mixins, serializers, viewsets
+from rest_framework.request import Request
+from rest_framework.response import Response
 
+from ..models import Attempt
 from ..models.exercise import Exercise
 from ..serializers.exercise import ExerciseSerializer, ExerciseSummarySerializer
 
@@ -10,7 +18,35 @@ class ExerciseViewSet(
     queryset = Exercise.objects.all()
     pagination_class = None
 
+    def get_queryset(self) -> QuerySet[Exercise]:
+        return Exercise.for_user(self.request.user.pk)
+
     def get_serializer_class(self) -> type[serializers.ModelSerializer[Exercise]]:
         if self.action == 'list':
             return ExerciseSummarySerializer
         return ExerciseSerializer
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        exercise = self.get_object()
+        attempt = self._get_attempt(exercise)
+        version = (
+            exercise.pk,
+            exercise.modified,
+            exercise.database.modified,
+            attempt.pk,
+            attempt.modified,
+        )
+        context = {**self.get_serializer_context(), 'attempt': attempt}
+        return conditional_response(
+            request, version, lambda: Response(self.get_serializer(exercise, context=context).data)
+        )
+
+    def _get_attempt(self, exercise: Exercise) -> Attempt:
+        user_id = self.request.user.pk
+        attempt = Attempt.objects.filter(user_id=user_id, exercise=exercise).first()
+        if attempt is None:
+            # Saved the first time the user writes to it, so opening exercises writes nothing
+            attempt = Attempt(user_id=user_id, exercise=exercise)
+        # Validated against the database already loaded with the exercise
+        attempt.exercise = exercise
+        return attempt
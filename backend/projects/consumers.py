@@ -0,0 +1,12 @@
+from queries.consumers import LiveValidationConsumer
+
+from .models import Query
+
+
+class QueryValidationConsumer(LiveValidationConsumer):
+    def get_query(self, user_id: int, pk: int) -> Query | None:
+        return (
+            Query.objects.filter(project__user_id=user_id, pk=pk)
+            .select_related('project__database')
+            .first()
+        )
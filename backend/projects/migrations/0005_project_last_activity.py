@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:22
+
+import django.utils.timezone
+import model_utils.fields
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+
+def backfill_last_activity(apps, schema_editor):
+    Project = apps.get_model('projects', 'Project')
+    Query = apps.get_model('projects', 'Query')
+    latest_query = (
+        Query.objects.filter(project=OuterRef('pk'))
+        .values('project')
+        .annotate(latest=Max('modified'))
+        .values('latest')
+    )
+    Project.objects.update(
+        last_activity=Greatest(F('modified'), Coalesce(Subquery(latest_query), F('modified')))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('databases', '0008_database_read_replica_url'),
+        ('projects', '0004_query'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='last_activity',
+            field=model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='last activity'),
+        ),
+        migrations.RunPython(backfill_last_activity, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['user', '-last_activity'], name='project_user_activity_idx'),
+        ),
+    ]
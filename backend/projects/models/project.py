@@ -1,12 +1,13 @@
 from datetime import datetime
-from typing import TYPE_CHECKING
+from typing import cast
 
 from django.db import models
-from django.db.models import DateTimeField, Max, QuerySet
-from django.db.models.functions import Greatest
+from django.db.models import Prefetch, QuerySet
+from django.utils.translation import gettext_lazy as _
 
 from common.models import IndexedTimeStampedModel
 from databases.models import Database
+from model_utils.fields import AutoLastModifiedField
 from users.models import User
 
 
@@ -14,19 +15,36 @@ class Project(IndexedTimeStampedModel):
     name = models.CharField(max_length=255)
     database = models.ForeignKey(Database, on_delete=models.CASCADE, related_name='projects')
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='projects')
+    user_id: int
+    # Latest change to the project or its queries, kept up to date by Query
+    last_activity = cast(datetime, AutoLastModifiedField(_('last activity')))  # type: ignore[no-untyped-call]
+
+    class Meta:
+        indexes = [  # noqa: RUF012
+            models.Index(fields=['user', '-last_activity'], name='project_user_activity_idx'),
+        ]
 
     @classmethod
-    def with_last_modified(cls) -> QuerySet['Project']:
-        return cls.objects.annotate(
-            last_modified=Greatest(
-                Max('queries__created'),
-                Max('queries__modified'),
-                Max('modified'),
-                output_field=DateTimeField(),
+    def for_listing(cls) -> QuerySet['Project']:
+        """Projects by latest activity, loading only what their summaries show."""
+        from .query import Query
+
+        queries = Query.objects.only('id', 'name', '_language', 'project_id')
+        return (
+            cls.objects.select_related('database')
+            .only(
+                'id',
+                'created',
+                'modified',
+                'name',
+                'last_activity',
+                'user_id',
+                'database__id',
+                'database__name',
+                'database__description',
             )
-        ).order_by('-last_modified')
+            .prefetch_related(Prefetch('queries', queryset=queries))
+            .order_by('-last_activity')
+        )
 
     objects: models.Manager['Project']
-
-    if TYPE_CHECKING:
-        last_modified: datetime
@@ -1,7 +1,11 @@
-from typing import cast
+from datetime import datetime
+from typing import Any, cast
 
 from django.contrib.contenttypes.fields import GenericRelation
 from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
 
 from common.models import IndexedTimeStampedModel
 from databases.models.database import Database
@@ -14,6 +18,7 @@ class Query(AbstractQuery, IndexedTimeStampedModel):
     text = models.TextField(blank=True, default='')
     name = models.CharField(max_length=255)
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='queries')
+    project_id: int
     _language = models.CharField(
         max_length=16,
         choices=Language,
@@ -33,6 +38,25 @@ class Query(AbstractQuery, IndexedTimeStampedModel):
     def database(self) -> Database:
         return cast(Database, self.project.database)
 
+    @property
+    def owner_id(self) -> int | None:
+        return cast(int, self.project.user_id)
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        super().save(*args, **kwargs)
+        self._record_activity(self.modified)
+
+    def delete(self, *args: Any, **kwargs: Any) -> tuple[int, dict[str, int]]:
+        deleted = super().delete(*args, **kwargs)
+        self._record_activity(timezone.now())
+        return deleted
+
+    def _record_activity(self, time: datetime) -> None:
+        # Never moved back by concurrent changes that are saved out of order
+        Project.objects.filter(pk=self.project_id).update(
+            last_activity=Greatest(F('last_activity'), Value(time))
+        )
+
     objects: models.Manager['Query']
 
     assistant_messages = GenericRelation(
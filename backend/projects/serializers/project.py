@@ -12,10 +12,11 @@ class ProjectSerializer(serializers.ModelSerializer[Project]):
     )
     database = DatabaseSummarySerializer(read_only=True)
     queries = QuerySummarySerializer(many=True, read_only=True)
-    last_modified = serializers.DateTimeField(read_only=True)
+    last_modified = serializers.DateTimeField(source='last_activity', read_only=True)
 
     class Meta:
         model = Project
         exclude = [  # noqa: RUF012
-            'user'
+            'user',
+            'last_activity',
         ]
@@ -1,14 +1,11 @@
-from assistant.serializers import MessageSerializer
+from common.serializers import ChangedFieldsMixin
 from queries.models import Language
-from queries.serializers.error import QueryErrorSerializer
 from rest_framework import serializers
 
 from ..models import Query
 
 
-class QuerySerializer(serializers.ModelSerializer[Query]):
-    validation_errors = QueryErrorSerializer(many=True, read_only=True)
-    assistant_messages = MessageSerializer(many=True, read_only=True)
+class QuerySerializer(ChangedFieldsMixin, serializers.ModelSerializer[Query]):
     language = serializers.ChoiceField(source='_language', choices=Language.choices)
 
     class Meta:
@@ -20,8 +17,6 @@ class QuerySerializer(serializers.ModelSerializer[Query]):
             'language',
             'created',
             'modified',
-            'validation_errors',
-            'assistant_messages',
         ]
 
 
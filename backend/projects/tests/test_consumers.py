@@ -0,0 +1,167 @@
+from collections.abc import Callable, Coroutine, Iterator
+from typing import Any
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import override_settings
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+from asgiref.sync import async_to_sync
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from model_bakery import baker
+from projects.models import Query
+from queries.services import validation
+from query_cod.routing import websocket_urlpatterns
+from query_cod.types import DataType
+from sqlalchemy.exc import OperationalError
+from users.models import User
+
+
+application = URLRouter(websocket_urlpatterns)
+
+
+def run(test: Callable[[], Coroutine[Any, Any, None]]) -> None:
+    async_to_sync(test)()
+
+
+def connect(user: User | AnonymousUser, query_id: int) -> WebsocketCommunicator:
+    communicator = WebsocketCommunicator(application, f'/ws/queries/{query_id}/validation/')
+    communicator.scope['user'] = user
+    return communicator
+
+
+@pytest.fixture
+def query(user: User, monkeypatch: MonkeyPatch) -> Iterator[Query]:
+    query = baker.make(
+        Query,
+        project__user=user,
+        project__database__database_type='sqlite',
+        _language='sql',
+    )
+    # Validations are cached by text, so are kept between tests of databases with the same id
+    cache.clear()
+    cache.set(
+        f'database_schema_{query.project.database.id}',
+        {'users': {'id': {'type': DataType.INTEGER, 'nullable': False}}},
+    )
+    monkeypatch.setattr('queries.consumers.DEBOUNCE', 0.05)
+    # Planned without connecting to the target database
+    with override_settings(SQL_VALIDATION_MODE='catalog'):
+        yield query
+
+
+@pytest.fixture
+def validated(monkeypatch: MonkeyPatch) -> list[str]:
+    texts: list[str] = []
+    validate_query = validation.validate_query
+
+    def spy(query: Any) -> Any:
+        texts.append(query.query)
+        return validate_query(query)
+
+    monkeypatch.setattr('queries.services.validation.validate_query', spy)
+    return texts
+
+
+@pytest.mark.django_db
+class TestQueryValidationConsumer:
+    def test_validates_only_the_last_edit_of_a_burst(
+        self, user: User, query: Query, validated: list[str]
+    ) -> None:
+        async def test() -> None:
+            communicator = connect(user, query.id)
+            connected, _ = await communicator.connect()
+            assert connected
+
+            for revision, text in enumerate(['SELECT', 'SELECT id', 'SELECT id FROM users']):
+                await communicator.send_json_to({'text': text, 'revision': revision})
+
+            message = await communicator.receive_json_from()
+            assert message['revision'] == 2
+            assert message['validation_errors'] == []
+            assert message['tree']['root'] is not None
+            assert message['tree']['nodes']
+            assert message['tree']['removed'] == []
+            assert await communicator.receive_nothing()
+            await communicator.disconnect()
+
+        run(test)
+        assert validated == ['SELECT id FROM users']
+
+    def test_pushes_errors_and_only_the_changes_to_the_tree(
+        self, user: User, query: Query, validated: list[str]
+    ) -> None:
+        async def test() -> None:
+            communicator = connect(user, query.id)
+            await communicator.connect()
+
+            await communicator.send_json_to({'text': 'SELECT id FROM users', 'revision': 0})
+            first = await communicator.receive_json_from()
+            await communicator.send_json_to({'text': 'SELECT name FROM users', 'revision': 1})
+            second = await communicator.receive_json_from()
+            await communicator.send_json_to({'text': 'SELECT id FROM users', 'revision': 2})
+            third = await communicator.receive_json_from()
+            await communicator.disconnect()
+
+            assert second['validation_errors']
+            assert 0 < len(third['tree']['nodes']) < len(first['tree']['nodes'])
+            assert third['validation_errors'] == []
+
+        run(test)
+        # Texts edited back to are validated once
+        assert validated == ['SELECT id FROM users', 'SELECT name FROM users']
+
+    def test_reports_texts_that_fail_to_validate(
+        self, user: User, query: Query, monkeypatch: MonkeyPatch
+    ) -> None:
+        def validate_text(query: Query, text: str) -> None:
+            raise OperationalError('SELECT', {}, Exception('Connection refused'))
+
+        monkeypatch.setattr('queries.consumers.validate_text', validate_text)
+
+        async def test() -> None:
+            communicator = connect(user, query.id)
+            await communicator.connect()
+
+            await communicator.send_json_to({'text': 'SELECT id FROM users', 'revision': 3})
+
+            message = await communicator.receive_json_from()
+            assert message['type'] == 'error'
+            assert message['revision'] == 3
+            await communicator.disconnect()
+
+        run(test)
+
+    def test_rejects_edits_without_text(self, user: User, query: Query) -> None:
+        async def test() -> None:
+            communicator = connect(user, query.id)
+            await communicator.connect()
+
+            await communicator.send_json_to({'revision': 0})
+
+            assert (await communicator.receive_json_from())['type'] == 'error'
+            await communicator.disconnect()
+
+        run(test)
+
+    def test_closes_sockets_of_anonymous_users(self, query: Query) -> None:
+        async def test() -> None:
+            connected, code = await connect(AnonymousUser(), query.id).connect()
+
+            assert not connected
+            assert code == 4403
+
+        run(test)
+
+    def test_closes_sockets_of_other_users_queries(self, query: Query) -> None:
+        other_user = baker.make(User)
+
+        async def test() -> None:
+            connected, code = await connect(other_user, query.id).connect()
+
+            assert not connected
+            assert code == 4404
+
+        run(test)
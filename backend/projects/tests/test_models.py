@@ -4,32 +4,44 @@ from django.utils import timezone
 
 import pytest
 from model_bakery import baker
-from projects.models import Project
+from projects.models import Project, Query
 
 
 @pytest.mark.django_db
-def test_with_last_modified_returns_ordered_projects() -> None:
-    # Create two projects with different query timestamps
+def test_for_listing_orders_projects_by_latest_query_activity() -> None:
     project1 = baker.make(Project)
     project2 = baker.make(Project)
+    query = baker.make(Query, project=project1)
+    baker.make(Query, project=project2)
 
-    baker.make(
-        'projects.Query',
-        project=project1,
-        created=timezone.now() - timedelta(days=2),
-        modified=timezone.now() - timedelta(days=2),
-    )
-
-    baker.make(
-        'projects.Query',
-        project=project2,
-        created=timezone.now(),
-        modified=timezone.now(),
-    )
-
-    projects = Project.with_last_modified()
-
-    assert len(projects) == 2
-    assert projects[0].id == project2.id  # most recently modified project comes first
-    assert hasattr(projects[0], 'last_modified')
-    assert projects[0].last_modified >= projects[1].last_modified
+    projects = Project.for_listing()
+    assert [project.id for project in projects] == [project2.id, project1.id]
+
+    query.text = 'SELECT 1'
+    query.save()
+
+    projects = Project.for_listing()
+    assert [project.id for project in projects] == [project1.id, project2.id]
+    assert projects[0].last_activity == Query.objects.get(id=query.id).modified
+
+
+@pytest.mark.django_db
+def test_deleting_a_query_is_project_activity() -> None:
+    project = baker.make(Project)
+    query = baker.make(Query, project=project)
+    before = Project.objects.get(id=project.id).last_activity
+
+    query.delete()
+
+    assert Project.objects.get(id=project.id).last_activity > before
+
+
+@pytest.mark.django_db
+def test_activity_is_never_moved_back() -> None:
+    project = baker.make(Project)
+    query = baker.make(Query, project=project)
+    latest = Project.objects.get(id=project.id).last_activity
+
+    query._record_activity(timezone.now() - timedelta(days=1))
+
+    assert Project.objects.get(id=project.id).last_activity == latest
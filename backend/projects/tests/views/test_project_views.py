@@ -3,7 +3,8 @@ from django.urls import reverse
 import pytest
 from databases.models.database import Database
 from model_bakery import baker
-from projects.models import Project
+from projects.models import Project, Query
+from pytest_django import DjangoAssertNumQueries
 from rest_framework import status
 from rest_framework.test import APIClient
 from users.models import User
@@ -27,6 +28,29 @@ def test_list_projects_returns_only_user_projects(auth_client: APIClient, user:
     assert data[0]['id'] == user_project.id
 
 
+@pytest.mark.django_db
+@pytest.mark.parametrize('projects', [1, 5])
+def test_list_projects_takes_the_same_queries_however_many_projects(
+    auth_client: APIClient,
+    user: User,
+    django_assert_num_queries: DjangoAssertNumQueries,
+    projects: int,
+) -> None:
+    for project in baker.make(Project, user=user, _quantity=projects):
+        baker.make(Query, project=project, _quantity=2)
+
+    with django_assert_num_queries(4):
+        response = auth_client.get(reverse('projects-list'))
+
+    data = response.json()
+    assert len(data) == projects
+    assert all(len(project['queries']) == 2 for project in data)
+    assert all(project['database']['name'] for project in data)
+    assert [project['last_modified'] for project in data] == sorted(
+        (project['last_modified'] for project in data), reverse=True
+    )
+
+
 @pytest.mark.django_db
 def test_create_project_sets_user(auth_client: APIClient, user: User) -> None:
     url = reverse('projects-list')
@@ -1,14 +1,30 @@
-from django.urls import reverse
+import json
+import threading
+from collections.abc import AsyncIterator, Callable, Iterator
+from typing import Any
+
+from django.core.cache import cache
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.test import AsyncClient
+from django.urls import resolve, reverse
 from django.utils.dateparse import parse_datetime
 
+import msgpack
 import pytest
 from _pytest.monkeypatch import MonkeyPatch
+from asgiref.sync import async_to_sync
+from assistant.models import Message
+from databases.services.bulkhead import DatabaseBusyError
 from model_bakery import baker
 from projects.models import Project, Query
 from projects.views import QueryViewSet
+from queries.services.admission import QueryRejectedError
 from queries.types import QueryError
+from query_cod.types import DataType
 from rest_framework import status
 from rest_framework.test import APIClient
+from sqlalchemy.exc import OperationalError
 from users.models import User
 
 
@@ -29,16 +45,22 @@ class TestProjectQueries:
 
 
 class TestQueryCRUD:
+    @pytest.fixture
+    def validate_query(self, monkeypatch: MonkeyPatch) -> list[Query]:
+        validated: list[Query] = []
+
+        def validate_query(query: Query) -> tuple[None, list[QueryError]]:
+            validated.append(query)
+            return None, [QueryError(title='Error')]
+
+        monkeypatch.setattr('queries.services.validation.validate_query', validate_query)
+        return validated
+
     @pytest.mark.django_db
-    def test_retrieve_query_returns_query_with_errors(
-        self, auth_client: APIClient, user: User, monkeypatch: MonkeyPatch
+    def test_retrieve_query_does_not_validate_it(
+        self, auth_client: APIClient, user: User, validate_query: list[Query]
     ) -> None:
         query = baker.make(Query, project__user=user)
-        errors = [QueryError(title='Error')]
-        monkeypatch.setattr(
-            'queries.models.AbstractQuery.validation_result',
-            (None, errors),
-        )
 
         url = reverse('queries-detail', kwargs={'pk': query.id})
         response = auth_client.get(url)
@@ -50,26 +72,95 @@ class TestQueryCRUD:
         assert data['text'] == query.query
         assert parse_datetime(data['created']) == query.created
         assert parse_datetime(data['modified']) == query.modified
-        assert data['validation_errors'] == errors
+        assert 'validation_errors' not in data
+        assert validate_query == []
 
     @pytest.mark.django_db
-    def test_partial_update_query_returns_query_with_errors(
-        self, auth_client: APIClient, user: User, monkeypatch: MonkeyPatch
+    def test_partial_update_query_returns_only_changed_fields(
+        self, auth_client: APIClient, user: User, validate_query: list[Query]
     ) -> None:
         query = baker.make(Query, project__user=user)
-        errors = [QueryError(title='Error')]
-        monkeypatch.setattr(
-            'queries.models.AbstractQuery.validation_result',
-            (None, errors),
-        )
 
         url = reverse('queries-detail', kwargs={'pk': query.id})
-        response = auth_client.patch(url, {'name': 'Updated!'}, content_type='application/json')
+        response = auth_client.patch(url, {'text': 'SELECT 1'}, content_type='application/json')
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert set(data) == {'id', 'text', 'created', 'modified'}
+        assert data['text'] == 'SELECT 1'
+        query.refresh_from_db()
+        assert parse_datetime(data['modified']) == query.modified
+        assert validate_query == []
+
+    @pytest.mark.django_db
+    def test_validation_returns_query_errors(
+        self, auth_client: APIClient, user: User, validate_query: list[Query]
+    ) -> None:
+        query = baker.make(Query, project__user=user)
+        schema_key = f'database_schema_{query.project.database.id}'
+        cache.set(schema_key, {})
+        cache.delete(f'{schema_key}_fingerprint')
+
+        url = reverse('queries-validation', kwargs={'pk': query.id})
+        response = auth_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {'validation_errors': [{'title': 'Error'}]}
+        assert auth_client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code == 304
+        assert len(validate_query) == 1
+
+
+class TestQueryMessages:
+    @pytest.mark.django_db
+    def test_list_messages_pages_the_most_recent_first(
+        self, auth_client: APIClient, user: User
+    ) -> None:
+        query = baker.make(Query, project__user=user)
+        messages = [
+            baker.make(Message, parent=query, author='user', content=str(i)) for i in range(3)
+        ]
+
+        url = reverse('queries-create-message', kwargs={'pk': query.id})
+        response = auth_client.get(url, {'limit': 2})
 
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
-        assert data['name'] == 'Updated!'
-        assert data['validation_errors'] == errors
+        assert data['count'] == 3
+        assert [message['id'] for message in data['results']] == [
+            messages[2].id,
+            messages[1].id,
+        ]
+
+    def test_messages_run_outside_atomic_requests(self) -> None:
+        view = resolve(reverse('queries-create-message', kwargs={'pk': 1})).func
+
+        assert hasattr(view, '_non_atomic_requests')
+
+
+class TestQueryTree:
+    @pytest.mark.django_db
+    def test_tree_is_revalidated_when_the_query_changes(
+        self, auth_client: APIClient, user: User
+    ) -> None:
+        query = baker.make(
+            Query,
+            project__user=user,
+            project__database__database_type='sqlite',
+            text='SELECT id FROM users',
+        )
+        schema_key = f'database_schema_{query.project.database.id}'
+        cache.set(schema_key, {'users': {'id': {'type': DataType.INTEGER, 'nullable': False}}})
+        cache.delete(f'{schema_key}_fingerprint')
+        url = reverse('queries-tree', kwargs={'pk': query.id})
+
+        etag = auth_client.get(url)['ETag']
+        assert auth_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        query.text = 'SELECT * FROM users'
+        query.save()
+        response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response['ETag'] != etag
 
 
 class TestQueryExecution:
@@ -81,13 +172,7 @@ class TestQueryExecution:
 
         monkeypatch.setattr(
             'projects.views.query.execute_query',
-            lambda query: {
-                'success': True,
-                'results': {
-                    'columns': ['id'],
-                    'rows': [['1']],
-                },
-            },
+            lambda query: {'columns': ['id'], 'rows': [[1]]},
         )
 
         def get_object(self: QueryViewSet) -> Query:
@@ -101,7 +186,44 @@ class TestQueryExecution:
         assert response.status_code == 200
         data = response.json()
         assert data['success'] is True
-        assert 'results' in data
+        assert data['results'] == {'columns': ['id'], 'rows': [['1']]}
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize(
+        'media_type, decode',
+        [
+            ('application/vnd.query-cod.columnar+json', json.loads),
+            ('application/vnd.msgpack', msgpack.unpackb),
+        ],
+    )
+    def test_execute_query_negotiates_columnar_results(
+        self,
+        auth_client: APIClient,
+        user: User,
+        monkeypatch: MonkeyPatch,
+        media_type: str,
+        decode: Callable[[bytes], Any],
+    ) -> None:
+        query = baker.make(Query, project__user=user)
+        monkeypatch.setattr(
+            'projects.views.query.execute_query',
+            lambda query: {'columns': ['id', 'type'], 'rows': [[1, 'a'], [2, 'a']]},
+        )
+
+        url = reverse('queries-execute', kwargs={'pk': query.id})
+        response = auth_client.post(url, HTTP_ACCEPT=media_type)
+
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith(media_type)
+        data = decode(response.content)
+        assert data['success'] is True
+        assert data['results'] == {
+            'columns': [
+                {'name': 'id', 'type': 'integer', 'values': [1, 2]},
+                {'name': 'type', 'type': 'varchar', 'dictionary': ['a'], 'indices': [0, 0]},
+            ],
+            'length': 2,
+        }
 
     @pytest.mark.django_db
     def test_execute_query_invalid(
@@ -117,3 +239,253 @@ class TestQueryExecution:
 
         assert response.status_code == 200
         assert response.json() == {'success': False}
+
+    @pytest.mark.django_db
+    def test_execute_query_rejected(
+        self, auth_client: APIClient, user: User, monkeypatch: MonkeyPatch
+    ) -> None:
+        query = baker.make(Query, project__user=user)
+
+        def execute_query(query: Query) -> None:
+            raise QueryRejectedError('Too expensive')
+
+        monkeypatch.setattr('projects.views.query.execute_query', execute_query)
+        monkeypatch.setattr('projects.views.QueryViewSet.get_object', lambda self: query)
+
+        url = reverse('queries-execute', kwargs={'pk': query.id})
+        response = auth_client.post(url)
+
+        assert response.status_code == 200
+        assert response.json() == {
+            'success': False,
+            'error': {'title': 'Query rejected', 'description': 'Too expensive'},
+        }
+
+    @pytest.mark.django_db
+    def test_execute_query_database_busy(
+        self, auth_client: APIClient, user: User, monkeypatch: MonkeyPatch
+    ) -> None:
+        query = baker.make(Query, project__user=user)
+
+        def execute_query(query: Query) -> None:
+            raise DatabaseBusyError('Too many queries')
+
+        monkeypatch.setattr('projects.views.query.execute_query', execute_query)
+        monkeypatch.setattr('projects.views.QueryViewSet.get_object', lambda self: query)
+
+        url = reverse('queries-execute', kwargs={'pk': query.id})
+        response = auth_client.post(url)
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response['Retry-After'] == '5'
+        assert response.json()['error']['title'] == 'Database busy'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_execute_query_runs_outside_atomic_requests(
+        self, auth_client: APIClient, user: User, monkeypatch: MonkeyPatch
+    ) -> None:
+        query = baker.make(Query, project__user=user)
+        monkeypatch.setitem(connection.settings_dict, 'ATOMIC_REQUESTS', True)
+        in_atomic_block = []
+
+        def execute_query(query: Query) -> None:
+            in_atomic_block.append(connection.in_atomic_block)
+
+        monkeypatch.setattr('projects.views.query.execute_query', execute_query)
+
+        url = reverse('queries-execute', kwargs={'pk': query.id})
+        auth_client.post(url)
+
+        assert in_atomic_block == [False]
+
+    def test_export_runs_outside_atomic_requests(self) -> None:
+        view = resolve(reverse('queries-export', kwargs={'pk': 1})).func
+
+        assert hasattr(view, '_non_atomic_requests')
+
+    def test_other_query_actions_keep_atomic_requests(self) -> None:
+        view = resolve(reverse('queries-detail', kwargs={'pk': 1})).func
+
+        assert not hasattr(view, '_non_atomic_requests')
+
+
+class TestQueryExport:
+    @pytest.fixture
+    def query(self, user: User, monkeypatch: MonkeyPatch) -> Query:
+        query = baker.make(Query, project__user=user, name='Accounts')
+
+        def get_object(self: QueryViewSet) -> Query:
+            return query
+
+        monkeypatch.setattr('projects.views.QueryViewSet.get_object', get_object)
+        return query
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize(
+        'file_format, content_type, content',
+        [
+            ('csv', 'text/csv', 'id,name\r\n1,Ada\r\n2,\r\n'),
+            (
+                'ndjson',
+                'application/x-ndjson',
+                '{"id": 1, "name": "Ada"}\n{"id": 2, "name": null}\n',
+            ),
+        ],
+    )
+    def test_export_streams_rows(
+        self,
+        auth_client: APIClient,
+        query: Query,
+        monkeypatch: MonkeyPatch,
+        file_format: str,
+        content_type: str,
+        content: str,
+    ) -> None:
+        closed = []
+
+        def stream_query(query: Query) -> Iterator[list[Any]]:
+            try:
+                yield ['id', 'name']
+                yield [1, 'Ada']
+                yield [2, None]
+            finally:
+                closed.append(True)
+
+        monkeypatch.setattr('projects.views.query.stream_query', stream_query)
+
+        url = reverse('queries-export', kwargs={'pk': query.id})
+        response = auth_client.get(url, {'file_format': file_format})
+
+        assert response.status_code == 200
+        assert response.streaming
+        assert response['Content-Type'] == content_type
+        assert response['Content-Disposition'] == (f'attachment; filename="Accounts.{file_format}"')
+        assert response.getvalue().decode() == content
+        response.close()
+        assert closed == [True]
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize(
+        'file_format, last_line',
+        [
+            ('csv', 'ERROR: The export was interrupted and is incomplete'),
+            ('ndjson', '{"error": "The export was interrupted and is incomplete"}'),
+        ],
+    )
+    def test_export_marks_files_interrupted_mid_stream(
+        self,
+        auth_client: APIClient,
+        query: Query,
+        monkeypatch: MonkeyPatch,
+        file_format: str,
+        last_line: str,
+    ) -> None:
+        closed = []
+
+        def stream_query(query: Query) -> Iterator[list[Any]]:
+            try:
+                yield ['id']
+                yield [1]
+                # As when the session is ended while the client stalls
+                raise OperationalError('FETCH', {}, Exception('idle-in-transaction timeout'))
+            finally:
+                closed.append(True)
+
+        monkeypatch.setattr('projects.views.query.stream_query', stream_query)
+        monkeypatch.setattr('queries.services.export.CHUNK_ROWS', 1)
+
+        url = reverse('queries-export', kwargs={'pk': query.id})
+        response = auth_client.get(url, {'file_format': file_format})
+
+        assert response.status_code == 200
+        lines = response.getvalue().decode().splitlines()
+        assert len(lines) == (3 if file_format == 'csv' else 2)
+        assert lines[-1] == last_line
+        response.close()
+        assert closed == [True]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_export_streams_rows_asynchronously_under_asgi(
+        self, user: User, query: Query, monkeypatch: MonkeyPatch
+    ) -> None:
+        threads = set()
+        closed = []
+
+        def stream_query(query: Query) -> Iterator[list[Any]]:
+            try:
+                yield ['id', 'name']
+                for row in ([1, 'Ada'], [2, None]):
+                    threads.add(threading.get_ident())
+                    yield row
+            finally:
+                closed.append(True)
+
+        monkeypatch.setattr('projects.views.query.stream_query', stream_query)
+        client = AsyncClient()
+        client.force_login(user)
+
+        async def export() -> tuple[bool, bytes]:
+            url = reverse('queries-export', kwargs={'pk': query.id})
+            response = await client.get(url, {'file_format': 'csv'})
+            assert isinstance(response, StreamingHttpResponse)
+            streaming_content = response.streaming_content
+            assert isinstance(streaming_content, AsyncIterator)
+            content = b''.join([chunk async for chunk in streaming_content])
+            return response.is_async, content
+
+        is_async, content = async_to_sync(export)()
+
+        assert is_async
+        assert content == b'id,name\r\n1,Ada\r\n2,\r\n'
+        # Rows are fetched in one thread, which their connection is bound to
+        assert len(threads) == 1
+        assert closed == [True]
+
+    @pytest.mark.django_db
+    def test_export_rejects_unknown_formats(self, auth_client: APIClient, query: Query) -> None:
+        url = reverse('queries-export', kwargs={'pk': query.id})
+        response = auth_client.get(url, {'file_format': 'xlsx'})
+
+        assert response.status_code == 400
+
+    @pytest.mark.django_db
+    def test_export_invalid_query(
+        self, auth_client: APIClient, query: Query, monkeypatch: MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr('projects.views.query.stream_query', lambda query: None)
+
+        url = reverse('queries-export', kwargs={'pk': query.id})
+        response = auth_client.get(url)
+
+        assert response.status_code == 400
+        assert response.json() == {'success': False}
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize(
+        'error, status_code',
+        [
+            (QueryRejectedError('Too expensive'), 400),
+            (DatabaseBusyError('Too many queries'), 503),
+        ],
+    )
+    def test_export_reports_admission_errors_before_streaming(
+        self,
+        auth_client: APIClient,
+        query: Query,
+        monkeypatch: MonkeyPatch,
+        error: Exception,
+        status_code: int,
+    ) -> None:
+        def stream_query(query: Query) -> Iterator[list[Any]]:
+            raise error
+            yield []
+
+        monkeypatch.setattr('projects.views.query.stream_query', stream_query)
+
+        url = reverse('queries-export', kwargs={'pk': query.id})
+        response = auth_client.get(url)
+
+        assert response.status_code == status_code
+        data = response.json()
+        assert data['success'] is False
+        assert data['error']['description'] == str(error)
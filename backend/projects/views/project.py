@@ -8,12 +8,12 @@ from ..serializers import ProjectSerializer
 
 
 class ProjectViewSet(viewsets.ModelViewSet[Project]):
-    queryset = Project.with_last_modified()
+    queryset = Project.for_listing()
     serializer_class = ProjectSerializer
     pagination_class = None
 
     def get_queryset(self) -> QuerySet[Project]:
-        return Project.with_last_modified().filter(user=self.request.user)
+        return Project.for_listing().filter(user=self.request.user)
 
     def perform_create(self, serializer: BaseSerializer[Project]) -> None:
         serializer.save(user=self.request.user)
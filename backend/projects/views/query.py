@@ -1,18 +1,36 @@
+from collections.abc import Iterator
+from contextlib import closing
+from typing import Any
+
+from django.db import transaction
 from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from django.http.response import HttpResponseBase
 from django.shortcuts import get_object_or_404
+from django.utils.http import content_disposition_header
 
 from assistant.views import MessagesMixin
-from drf_spectacular.utils import OpenApiParameter, extend_schema
+from common.utils.streaming import streaming_content
+from common.views import NonAtomicActionsMixin
+from databases.services.bulkhead import DatabaseBusyError
+from databases.services.circuit_breaker import DatabaseUnavailableError
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
 from queries.models import Language
+from queries.renderers import EXECUTION_RENDERERS
 from queries.serializers.execution import QueryExecutionSerializer
-from queries.services.execution import execute_query
+from queries.services.admission import QueryRejectedError
+from queries.services.execution import execute_query, stream_query
+from queries.services.export import EXPORT_CONTENT_TYPES, export_error, export_rows
 from queries.services.transpiler import transpile_query
-from queries.views import SubqueriesMixin
+from queries.views import EXECUTION_RESPONSES, LIMIT_PARAMETER, SubqueriesMixin
 from rest_framework import mixins, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.serializers import BaseSerializer
+from sqlalchemy.exc import SQLAlchemyError
 
 from ..models import Project, Query
 from ..serializers import QuerySerializer
@@ -37,6 +55,7 @@ class ProjectQueryViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet[Query
 
 
 class QueryViewSet(
+    NonAtomicActionsMixin,
     MessagesMixin,
     SubqueriesMixin,
     mixins.RetrieveModelMixin,
@@ -48,18 +67,108 @@ class QueryViewSet(
     serializer_class = QuerySerializer
 
     def get_queryset(self) -> QuerySet[Query]:
-        return Query.objects.filter(project__user=self.request.user)
+        return Query.objects.filter(project__user=self.request.user).select_related(
+            'project__database'
+        )
+
+    @extend_schema(responses=QuerySerializer(partial=True))
+    def partial_update(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """Save the fields sent, responding with only those and the ones the save updates."""
+        return super().partial_update(request, *args, **kwargs)
 
     @extend_schema(
         request=None,
-        responses=QueryExecutionSerializer,
+        responses=EXECUTION_RESPONSES,
+        parameters=[LIMIT_PARAMETER],
     )
-    @action(detail=True, methods=['post'], url_path='executions')
+    @action(
+        detail=True,
+        methods=['post'],
+        url_path='executions',
+        renderer_classes=EXECUTION_RENDERERS,
+    )
+    @transaction.non_atomic_requests
     def execute(self, request: Request, pk: str) -> Response:
         query = self.get_object()
-        results = execute_query(query)
+        try:
+            results = execute_query(query)
+        except QueryRejectedError as e:
+            return self._handle_rejection(e)
+        except DatabaseBusyError as e:
+            return self._handle_unavailable('Database busy', e)
+        except DatabaseUnavailableError as e:
+            return self._handle_unavailable('Database unavailable', e)
         return self._handle_execution(results)
 
+    @extend_schema(
+        request=None,
+        responses={
+            **{
+                (200, content_type): OpenApiResponse(OpenApiTypes.STR)
+                for content_type in EXPORT_CONTENT_TYPES.values()
+            },
+            (400, 'application/json'): QueryExecutionSerializer,
+            (503, 'application/json'): QueryExecutionSerializer,
+        },
+        parameters=[
+            OpenApiParameter(
+                name='file_format',
+                type=str,
+                location=OpenApiParameter.QUERY,
+                enum=list(EXPORT_CONTENT_TYPES),
+                default='csv',
+            ),
+        ],
+    )
+    @action(detail=True, methods=['get'], url_path='export')
+    @transaction.non_atomic_requests
+    def export(self, request: Request, pk: str) -> HttpResponseBase:
+        """Rows of the query as a file, streamed from the database as they are fetched.
+
+        Results are capped as they are when the query is executed.
+        """
+        file_format = request.query_params.get('file_format', 'csv')
+        if file_format not in EXPORT_CONTENT_TYPES:
+            raise ValidationError({'file_format': f'Unsupported export format: {file_format}'})
+
+        query = self.get_object()
+        rows = stream_query(query)
+        if rows is None:
+            return Response({'success': False}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            # Admits the query, so it can still be turned away before the response starts
+            columns = next(rows)
+        except QueryRejectedError as e:
+            rejection = self._handle_rejection(e)
+            rejection.status_code = status.HTTP_400_BAD_REQUEST
+            return rejection
+        except DatabaseBusyError as e:
+            return self._handle_unavailable('Database busy', e)
+        except DatabaseUnavailableError as e:
+            return self._handle_unavailable('Database unavailable', e)
+
+        def content() -> Iterator[str]:
+            # Closing the response closes the rows, releasing the connection and its slot
+            with closing(rows):
+                try:
+                    yield from export_rows(file_format, columns, rows)
+                except SQLAlchemyError:
+                    # The response has started, so failures are marked at the end of the file.
+                    # Sessions idle in their transaction for too long, as when clients stop
+                    # reading, are ended by the database
+                    yield export_error(file_format, 'The export was interrupted and is incomplete')
+
+        response = StreamingHttpResponse(
+            streaming_content(request._request, content()),
+            content_type=EXPORT_CONTENT_TYPES[file_format],
+        )
+        disposition = content_disposition_header(
+            as_attachment=True, filename=f'{query.name}.{file_format}'
+        )
+        if disposition is not None:
+            response['Content-Disposition'] = disposition
+        return response
+
     @extend_schema(
         request=None,
         responses=QuerySerializer,
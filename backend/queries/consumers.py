@@ -0,0 +1,120 @@
+import asyncio
+import hashlib
+from typing import Any, TypedDict
+
+from django.core.cache import cache
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .models import AbstractQuery
+from .serializers.tree import QueryTreeSerializer
+from .serializers.validation import QueryValidationSerializer
+from .services.live import DraftQuery, FlatTree, diff_tree
+
+
+# Seconds without edits before the text is validated, so bursts of edits are validated once
+DEBOUNCE = 0.3
+# Seconds validations of texts are kept, as editors often go back to texts they had moments before
+LIVE_VALIDATION_TIMEOUT = 60 * 60
+# Close codes for sockets that are not allowed to open, as HTTP responds with 403 and 404
+FORBIDDEN = 4403
+NOT_FOUND = 4404
+
+
+class LiveValidation(TypedDict):
+    validation_errors: list[dict[str, Any]]
+    tree: dict[str, Any] | None
+
+
+def validate_text(query: AbstractQuery, text: str) -> LiveValidation:
+    """Errors in ``text`` as the text of ``query``, and the tree it builds.
+
+    Validated once for each text and version of the schema, however often it is edited back to.
+    """
+    database = query.database
+    digest = hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+    cache_key = (
+        f'live_validation_{database.pk}_{database.schema_fingerprint}_{query.language}_{digest}'
+    )
+    validation: LiveValidation | None = cache.get(cache_key)
+
+    if validation is None:
+        draft = DraftQuery(text, query.language, database)
+        trees = QueryTreeSerializer(draft).data
+        validation = {
+            'validation_errors': QueryValidationSerializer(draft).data['validation_errors'],
+            'tree': trees['sql_tree'] or trees['ra_tree'],
+        }
+        cache.set(cache_key, validation, LIVE_VALIDATION_TIMEOUT)
+
+    return validation
+
+
+class LiveValidationConsumer(AsyncJsonWebsocketConsumer):  # type: ignore[misc]
+    """Validate the text of a query as it is edited, pushing its errors and the changes to its tree.
+
+    Clients send ``{"text": ..., "revision": ...}`` on each edit, and are sent
+    ``{"type": "validation", "revision": ..., "validation_errors": [...], "tree": {...}}`` for the
+    last edit of each burst. Edits supersede the validation of those before them.
+    """
+
+    query: AbstractQuery
+    nodes: FlatTree
+    pending: asyncio.Task[None] | None = None
+
+    def get_query(self, user_id: int, pk: int) -> AbstractQuery | None:
+        raise NotImplementedError()
+
+    async def connect(self) -> None:
+        user = self.scope['user']
+        if not user.is_authenticated:
+            await self.close(code=FORBIDDEN)
+            return
+
+        pk = self.scope['url_route']['kwargs']['pk']
+        query = await database_sync_to_async(self.get_query)(user.pk, pk)
+        if query is None:
+            await self.close(code=NOT_FOUND)
+            return
+
+        self.query = query
+        # The client is sent the whole tree first, and then only the nodes that change
+        self.nodes = {}
+        await self.accept()
+
+    async def disconnect(self, code: int) -> None:
+        if self.pending:
+            self.pending.cancel()
+
+    async def receive_json(self, content: Any, **kwargs: Any) -> None:
+        text = content.get('text') if isinstance(content, dict) else None
+        if not isinstance(text, str):
+            await self.send_json({'type': 'error', 'detail': 'Edits must have a text'})
+            return
+
+        if self.pending:
+            self.pending.cancel()
+        self.pending = asyncio.create_task(self.validate(text, content.get('revision')))
+
+    async def validate(self, text: str, revision: Any) -> None:
+        await asyncio.sleep(DEBOUNCE)
+        # Superseded validations already running still finish, and are cached, but are not sent
+        try:
+            validation = await database_sync_to_async(validate_text)(self.query, text)
+        except Exception:  # noqa: BLE001
+            # Such as the schema failing to load from an unreachable database. The task has no one
+            # to raise to, so the client is told instead
+            await self.send_json(
+                {'type': 'error', 'revision': revision, 'detail': 'The text could not be validated'}
+            )
+            return
+        diff, self.nodes = diff_tree(self.nodes, validation['tree'])
+        await self.send_json(
+            {
+                'type': 'validation',
+                'revision': revision,
+                'validation_errors': validation['validation_errors'],
+                'tree': diff,
+            }
+        )
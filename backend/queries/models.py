@@ -30,6 +30,10 @@ class AbstractQuery:
     def database(self) -> Database:
         raise NotImplementedError()
 
+    @property
+    def owner_id(self) -> int | None:
+        return None
+
     @cached_property
     def validation_result(self) -> tuple[QueryAST | None, list[QueryError]]:
         from .services.validation import validate_query
@@ -0,0 +1,41 @@
+from collections.abc import Mapping
+from typing import Any, cast
+
+import msgpack
+from rest_framework.renderers import BaseRenderer, BrowsableAPIRenderer, JSONRenderer
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    """JSON of query results stored column-wise."""
+
+    media_type = 'application/vnd.query-cod.columnar+json'
+    format = 'columnar'
+
+
+class MessagePackRenderer(BaseRenderer):
+    """MessagePack of query results stored column-wise."""
+
+    media_type = 'application/vnd.msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: str | None = None,
+        renderer_context: Mapping[str, Any] | None = None,
+    ) -> bytes:
+        if data is None:
+            return b''
+        return cast(bytes, msgpack.packb(data))
+
+
+COLUMNAR_RENDERERS = (ColumnarJSONRenderer, MessagePackRenderer)
+
+# Rows of JSON remain the default, and columnar results are negotiated with ``Accept``
+EXECUTION_RENDERERS: list[type[BaseRenderer]] = [
+    JSONRenderer,
+    BrowsableAPIRenderer,
+    *COLUMNAR_RENDERERS,
+]
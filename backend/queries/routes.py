@@ -0,0 +1,7 @@
+from common.types import RouteConfig
+from queries.views import ResultViewSet
+
+
+routes: list[RouteConfig] = [
+    {'regex': r'results', 'viewset': ResultViewSet, 'basename': 'results'},
+]
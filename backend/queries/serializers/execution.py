@@ -1,7 +1,18 @@
+from collections.abc import Iterable
+from typing import Any
+
 from databases.types import QueryResult
-from queries.types import QueryExecutionResponse
+from queries.types import (
+    ColumnarQueryResult,
+    QueryExecutionResponse,
+    QueryResultPage,
+    ResultColumn,
+)
+from query_cod.types import DataType
 from rest_framework import serializers
 
+from .error import QueryErrorSerializer
+
 
 class QueryResultDataSerializer(serializers.Serializer[QueryResult]):
     columns = serializers.ListField(
@@ -13,10 +24,108 @@ class QueryResultDataSerializer(serializers.Serializer[QueryResult]):
         ),
         help_text='List of query result rows',
     )
+    truncated = serializers.BooleanField(
+        required=False, help_text='Set when only the first rows of the result were fetched'
+    )
+
+    def to_representation(self, instance: QueryResult) -> dict[str, Any]:
+        # Rendering each cell through its field dominates large results
+        return dict(render_query_result(instance))
+
+
+class ResultColumnSerializer(serializers.Serializer[ResultColumn]):
+    name = serializers.CharField()
+    type = serializers.ChoiceField(choices=[data_type.value for data_type in DataType])
+    values = serializers.ListField(
+        child=serializers.JSONField(allow_null=True),
+        required=False,
+        help_text='Values of the column, unless it is dictionary-encoded',
+    )
+    dictionary = serializers.ListField(
+        child=serializers.CharField(),
+        required=False,
+        help_text='Distinct values of a dictionary-encoded column',
+    )
+    indices = serializers.ListField(
+        child=serializers.IntegerField(allow_null=True),
+        required=False,
+        help_text='Position in the dictionary of the value in each row',
+    )
+
+
+class ColumnarQueryResultSerializer(serializers.Serializer[ColumnarQueryResult]):
+    columns = ResultColumnSerializer(many=True)
+    length = serializers.IntegerField(help_text='Number of rows in the result')
+    truncated = serializers.BooleanField(
+        required=False, help_text='Set when only the first rows of the result were fetched'
+    )
 
 
 class QueryExecutionSerializer(serializers.Serializer[QueryExecutionResponse]):
     results = QueryResultDataSerializer(
         required=False, help_text='Query result data if the query execution was successful'
     )
+    result_id = serializers.CharField(
+        required=False,
+        help_text=(
+            'Identifies the stored result, to fetch its rows a page at a time. Missing if the '
+            'result was too large to keep'
+        ),
+    )
+    count = serializers.IntegerField(required=False, help_text='Number of rows in the whole result')
+    error = QueryErrorSerializer(
+        required=False, help_text='Reason the query was not executed, if it was rejected'
+    )
     success = serializers.BooleanField(help_text='Indicates if the query execution was successful')
+
+
+def render_query_result(result: QueryResult) -> QueryResult:
+    """Convert the cells of ``result`` to text, a column at a time."""
+    columns = [_render_column(column) for column in zip(*result['rows'], strict=True)]
+    rendered: QueryResult = {
+        'columns': [str(column) for column in result['columns']],
+        'rows': [list(row) for row in zip(*columns, strict=True)],
+    }
+    if 'truncated' in result:
+        rendered['truncated'] = result['truncated']
+    return rendered
+
+
+def _render_column(values: tuple[Any, ...]) -> Iterable[str | None]:
+    if all(isinstance(value, str) for value in values):
+        return values
+    if None in values:
+        return [None if value is None else str(value) for value in values]
+    return map(str, values)
+
+
+class ColumnarQueryExecutionSerializer(serializers.Serializer[QueryExecutionResponse]):
+    results = ColumnarQueryResultSerializer(
+        required=False, help_text='Query result data if the query execution was successful'
+    )
+    result_id = serializers.CharField(
+        required=False,
+        help_text=(
+            'Identifies the stored result, to fetch its rows a page at a time. Missing if the '
+            'result was too large to keep'
+        ),
+    )
+    count = serializers.IntegerField(required=False, help_text='Number of rows in the whole result')
+    error = QueryErrorSerializer(
+        required=False, help_text='Reason the query was not executed, if it was rejected'
+    )
+    success = serializers.BooleanField(help_text='Indicates if the query execution was successful')
+
+
+class QueryResultPageSerializer(serializers.Serializer[QueryResultPage]):
+    count = serializers.IntegerField(help_text='Number of rows in the whole result')
+    next = serializers.URLField(allow_null=True, help_text='Link to the next page of rows')
+    previous = serializers.URLField(allow_null=True, help_text='Link to the previous page of rows')
+    results = QueryResultDataSerializer()
+
+
+class ColumnarQueryResultPageSerializer(serializers.Serializer[QueryResultPage]):
+    count = serializers.IntegerField(help_text='Number of rows in the whole result')
+    next = serializers.URLField(allow_null=True, help_text='Link to the next page of rows')
+    previous = serializers.URLField(allow_null=True, help_text='Link to the previous page of rows')
+    results = ColumnarQueryResultSerializer()
@@ -0,0 +1,8 @@
+from rest_framework import serializers
+
+from ..models import AbstractQuery
+from .error import QueryErrorSerializer
+
+
+class QueryValidationSerializer(serializers.Serializer[AbstractQuery]):
+    validation_errors = QueryErrorSerializer(many=True, read_only=True)
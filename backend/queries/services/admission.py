@@ -0,0 +1,103 @@
+import hashlib
+from collections.abc import Generator, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from django.core.cache import cache
+
+from databases.models import Database
+from databases.services.bulkhead import database_bulkhead
+from databases.services.execution import execute_sql, stream_sql
+from databases.services.explain import explain_sql
+from databases.types import PlanEstimate, QueryResult
+from sqlalchemy.exc import SQLAlchemyError
+
+
+# Plans go stale as the data changes, like table sizes
+PLAN_TIMEOUT = 60 * 60
+
+
+class QueryRejectedError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class Admission:
+    # Queued queries of a database run one at a time
+    queued: bool = False
+    max_rows: int | None = None
+
+
+def execute_admitted(
+    sql: str, db: Database, user_id: int | None = None, min_rows: int | None = None
+) -> QueryResult:
+    """Execute ``sql`` within the thresholds of ``db`` for its estimated cost and rows.
+
+    Capped results still hold at least ``min_rows`` rows.
+    """
+    admission = admit(get_plan_estimate(sql, db), db)
+    max_rows = admission.max_rows
+    if max_rows is not None and min_rows is not None:
+        max_rows = max(max_rows, min_rows)
+    with database_bulkhead(db, user_id, expensive=admission.queued):
+        return execute_sql(sql, db.execution_connection_info, max_rows)
+
+
+def stream_admitted(
+    sql: str, db: Database, user_id: int | None = None
+) -> Generator[Sequence[Any], None, None]:
+    """Stream the columns and rows of ``sql`` within the same thresholds as ``execute_admitted``.
+
+    The query is admitted when the first item is requested, and holds its slot until the
+    iterator is exhausted or closed.
+    """
+    admission = admit(get_plan_estimate(sql, db), db)
+    with database_bulkhead(db, user_id, expensive=admission.queued):
+        yield from stream_sql(sql, db.execution_connection_info, admission.max_rows)
+
+
+def execute_trusted(sql: str, db: Database) -> QueryResult:
+    """Execute ``sql`` regardless of its estimates, still within the bulkheads of ``db``."""
+    with database_bulkhead(db):
+        return execute_sql(sql, db.execution_connection_info)
+
+
+def admit(estimate: PlanEstimate | None, db: Database) -> Admission:
+    if estimate is None:
+        return Admission()
+
+    if db.max_query_cost is not None and estimate['cost'] > db.max_query_cost:
+        raise QueryRejectedError(
+            f'The query is estimated to cost {estimate["cost"]:.0f}, '
+            f'more than the limit of {db.max_query_cost:.0f} for this database'
+        )
+
+    queued = db.queued_query_cost is not None and estimate['cost'] > db.queued_query_cost
+    capped = db.capped_query_rows is not None and estimate['rows'] > db.capped_query_rows
+    return Admission(queued=queued, max_rows=db.capped_query_rows if capped else None)
+
+
+def cache_plan_estimate(sql: str, db: Database, estimate: PlanEstimate) -> None:
+    cache.set(_plan_key(sql, db), estimate, PLAN_TIMEOUT)
+
+
+def get_plan_estimate(sql: str, db: Database) -> PlanEstimate | None:
+    """Planner estimates for ``sql``, reusing those captured during validation."""
+    if db.database_type != Database.DatabaseType.POSTGRESQL:
+        return None
+
+    estimate: PlanEstimate | None = cache.get(_plan_key(sql, db))
+    if estimate is None:
+        try:
+            estimate = explain_sql(sql, db.execution_connection_info)
+        except SQLAlchemyError:
+            # Executing the query reports the error
+            return None
+        if estimate is not None:
+            cache_plan_estimate(sql, db, estimate)
+    return estimate
+
+
+def _plan_key(sql: str, db: Database) -> str:
+    digest = hashlib.blake2b(sql.encode(), digest_size=16).hexdigest()
+    return f'query_plan_{db.id}_{digest}'
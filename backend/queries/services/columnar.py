@@ -0,0 +1,76 @@
+import math
+from collections.abc import Sequence
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+
+from databases.types import QueryResult
+from query_cod.types import DataType
+
+from ..types import ColumnarQueryResult, ResultColumn
+
+
+_TYPES: dict[type, DataType] = {
+    bool: DataType.BOOLEAN,
+    int: DataType.INTEGER,
+    float: DataType.DOUBLE_PRECISION,
+    Decimal: DataType.DECIMAL,
+    datetime: DataType.TIMESTAMP,
+    date: DataType.DATE,
+    time: DataType.TIME,
+    str: DataType.VARCHAR,
+}
+# Values without a counterpart in JSON or MessagePack are sent as text
+_TEXT_TYPES = {DataType.DECIMAL, DataType.TIMESTAMP, DataType.DATE, DataType.TIME, DataType.VARCHAR}
+# JSON has no NaN or infinities, so floats without a number are sent as the text PostgreSQL uses
+_NON_FINITE_TEXT = {'nan': 'NaN', 'inf': 'Infinity', '-inf': '-Infinity'}
+
+
+def to_columnar(result: QueryResult) -> ColumnarQueryResult:
+    """Store ``result`` column-wise, typing each column by the values in it."""
+    rows = result['rows']
+    values_by_column = zip(*rows, strict=True) if rows else [() for _ in result['columns']]
+    columnar: ColumnarQueryResult = {
+        'columns': [
+            _to_column(str(name), values)
+            for name, values in zip(result['columns'], values_by_column, strict=True)
+        ],
+        'length': len(rows),
+    }
+    if 'truncated' in result:
+        columnar['truncated'] = result['truncated']
+    return columnar
+
+
+def _to_column(name: str, values: Sequence[Any]) -> ResultColumn:
+    data_type = _infer_type(values)
+    if data_type == DataType.DOUBLE_PRECISION:
+        return {'name': name, 'type': data_type, 'values': [_number(value) for value in values]}
+    if data_type not in _TEXT_TYPES:
+        return {'name': name, 'type': data_type, 'values': list(values)}
+
+    text = [None if value is None else str(value) for value in values]
+    codes: dict[str, int] = {}
+    indices = [None if value is None else codes.setdefault(value, len(codes)) for value in text]
+    # Dictionaries only pay off when values repeat
+    if len(codes) * 2 > len(text):
+        return {'name': name, 'type': data_type, 'values': text}
+    return {'name': name, 'type': data_type, 'dictionary': list(codes), 'indices': indices}
+
+
+def _number(value: Any) -> Any:
+    if isinstance(value, float) and not math.isfinite(value):
+        return _NON_FINITE_TEXT[str(value)]
+    return value
+
+
+def _infer_type(values: Sequence[Any]) -> DataType:
+    types = {type(value) for value in values if value is not None}
+    if not types:
+        return DataType.NULL
+    if len(types) == 1:
+        return _TYPES.get(types.pop(), DataType.VARCHAR)
+    if types <= {int, float}:
+        return DataType.DOUBLE_PRECISION
+    # Columns mixing types, as SQLite allows, are sent as text
+    return DataType.VARCHAR
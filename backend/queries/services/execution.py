@@ -1,28 +1,62 @@
+from collections.abc import Generator, Sequence
+from typing import Any
+
 from databases.models.database import Database
 from databases.types import QueryResult
 from queries.models import AbstractQuery as Query
 
+from .admission import stream_admitted
 from .ra.ast import RAQuery
-from .ra.execution import execute_ra
+from .ra.execution import compile_ra, execute_ra
 from .sql.execution import execute_sql
 from .types import QueryAST, SQLQuery
 
 
-def execute_query(query: Query) -> QueryResult | None:
+def execute_query(
+    query: Query, admission: bool = True, min_rows: int | None = None
+) -> QueryResult | None:
+    """Execute a valid query, subject to the admission thresholds of its database.
+
+    Raises ``QueryRejectedError`` if the query is estimated to be too expensive, and
+    ``DatabaseBusyError`` if the database has no free slot. Results capped by the thresholds
+    still hold at least ``min_rows`` rows.
+    """
+    if not (query.is_valid and query.ast):
+        return None
+
+    return _execute(query.ast, query.database, admission, query.owner_id, min_rows)
+
+
+def stream_query(query: Query) -> Generator[Sequence[Any], None, None] | None:
+    """Stream the columns and then the rows of a valid query, admitted as in ``execute_query``.
+
+    Admission errors are raised when the columns are requested.
+    """
     if not (query.is_valid and query.ast):
         return None
 
-    return _execute(query.ast, query.database)
+    match query.ast:
+        case sql_query if isinstance(sql_query, SQLQuery):
+            sql = sql_query.sql()
+        case RAQuery():
+            sql = compile_ra(query.ast, query.database)
+    return stream_admitted(sql, query.database, query.owner_id)
 
 
 def execute_subquery(query: Query, subquery_id: int) -> QueryResult | None:
     subquery = query.subqueries.get(subquery_id)
-    return _execute(subquery, query.database) if subquery else None
+    return _execute(subquery, query.database, user_id=query.owner_id) if subquery else None
 
 
-def _execute(ast: QueryAST, database: Database) -> QueryResult:
+def _execute(
+    ast: QueryAST,
+    database: Database,
+    admission: bool = True,
+    user_id: int | None = None,
+    min_rows: int | None = None,
+) -> QueryResult:
     match ast:
         case sql_query if isinstance(sql_query, SQLQuery):
-            return execute_sql(sql_query, database)
+            return execute_sql(sql_query, database, admission, user_id, min_rows)
         case RAQuery():
-            return execute_ra(ast, database)
+            return execute_ra(ast, database, admission, user_id, min_rows)
@@ -0,0 +1,67 @@
+import csv
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import batched
+from typing import Any
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+EXPORT_CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+# Rows written to each chunk of a streamed export
+CHUNK_ROWS = 500
+
+
+class _Echo:
+    # The CSV writer returns each line instead of buffering it
+    def write(self, value: str) -> str:
+        return value
+
+
+class _ExportEncoder(DjangoJSONEncoder):
+    def default(self, o: Any) -> Any:
+        try:
+            return super().default(o)
+        except TypeError:
+            return str(o)
+
+
+def export_rows(
+    file_format: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]
+) -> Iterator[str]:
+    """Encode ``rows`` in ``file_format`` a chunk at a time, as they are consumed."""
+    match file_format:
+        case 'csv':
+            return _export_csv(columns, rows)
+        case 'ndjson':
+            return _export_ndjson(columns, rows)
+        case _:
+            raise ValueError(f'Unsupported export format: {file_format}')
+
+
+def export_error(file_format: str, message: str) -> str:
+    """A last line for an export that failed after it started, saying the file is incomplete."""
+    match file_format:
+        case 'csv':
+            line: str = csv.writer(_Echo()).writerow([f'ERROR: {message}'])
+            return line
+        case 'ndjson':
+            return _ExportEncoder().encode({'error': message}) + '\n'
+        case _:
+            raise ValueError(f'Unsupported export format: {file_format}')
+
+
+def _export_csv(columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for chunk in batched(rows, CHUNK_ROWS):
+        yield ''.join(writer.writerow(row) for row in chunk)
+
+
+def _export_ndjson(columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+    encoder = _ExportEncoder()
+    for chunk in batched(rows, CHUNK_ROWS):
+        yield ''.join(encoder.encode(dict(zip(columns, row, strict=True))) + '\n' for row in chunk)
@@ -0,0 +1,64 @@
+from typing import Any, TypedDict
+
+from databases.models import Database
+
+from ..models import AbstractQuery, Language
+
+
+class TreeDiff(TypedDict):
+    root: int | None
+    nodes: list[dict[str, Any]]
+    removed: list[int]
+
+
+# Nodes of a tree by id, each with the ids of its children in place of the children themselves
+FlatTree = dict[int, dict[str, Any]]
+
+
+class DraftQuery(AbstractQuery):
+    """Text being edited in a query, validated without saving it."""
+
+    def __init__(self, text: str, language: Language, database: Database) -> None:
+        self.text = text
+        self._language = language
+        self._database = database
+
+    @property
+    def query(self) -> str:
+        return self.text
+
+    @property
+    def language(self) -> Language:
+        return self._language
+
+    @property
+    def database(self) -> Database:
+        return self._database
+
+
+def flatten_tree(tree: dict[str, Any] | None) -> FlatTree:
+    nodes: FlatTree = {}
+    pending = [tree] if tree else []
+    while pending:
+        node = pending.pop()
+        children = node.get('children')
+        nodes[node['id']] = {
+            **node,
+            'children': None if children is None else [child['id'] for child in children],
+        }
+        pending.extend(children or [])
+    return nodes
+
+
+def diff_tree(previous: FlatTree, tree: dict[str, Any] | None) -> tuple[TreeDiff, FlatTree]:
+    """Changes from the ``previous`` nodes of a tree to ``tree``, and the nodes of ``tree``.
+
+    Nodes are sent with the ids of their children, so only nodes that changed are sent.
+    """
+    nodes = flatten_tree(tree)
+    diff: TreeDiff = {
+        'root': tree['id'] if tree else None,
+        'nodes': [node for node_id, node in nodes.items() if previous.get(node_id) != node],
+        'removed': [node_id for node_id in previous if node_id not in nodes],
+    }
+    return diff, nodes
@@ -0,0 +1,68 @@
+import hashlib
+from collections.abc import Callable
+from contextlib import suppress
+from typing import TypedDict
+
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+
+from common.utils.lru import LRUCache
+from redis import RedisError
+
+from .ast import RAQuery
+
+
+SHARED_CACHE_ALIAS = 'compilation'
+
+_compiled: LRUCache[str, str] = LRUCache(maxsize=settings.COMPILATION_CACHE_SIZE)  # type: ignore[misc]
+
+
+class CompilationCacheStats(TypedDict):
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+def compilation_key(query: RAQuery, schema_fingerprint: str, bag: bool, target: str) -> str:
+    """Key of the SQL compiled from ``query`` for ``target``, stable across processes.
+
+    The key depends on the structure of the query only, so equal queries share their SQL.
+    """
+    structure = hashlib.blake2b(repr(query).encode(), digest_size=16).hexdigest()
+    return f'ra_sql:{target}:{int(bag)}:{schema_fingerprint}:{structure}'
+
+
+def compile_cached(key: str, compile_: Callable[[], str]) -> str:
+    if (sql := _compiled.get(key)) is not None:
+        return sql
+
+    shared = _shared_cache()
+    try:
+        sql = shared.get(key) if shared is not None else None
+    except RedisError:
+        # The shared cache only saves work, so queries are compiled here while it is down
+        shared = None
+    if sql is None:
+        sql = compile_()
+        if shared is not None:
+            with suppress(RedisError):
+                shared.set(key, sql)
+
+    _compiled.set(key, sql)
+    return sql
+
+
+def compilation_cache_stats() -> CompilationCacheStats:
+    return {
+        'size': len(_compiled),
+        'maxsize': _compiled.maxsize,
+        'hits': _compiled.hits,
+        'misses': _compiled.misses,
+        'evictions': _compiled.evictions,
+    }
+
+
+def _shared_cache() -> BaseCache | None:
+    return caches[SHARED_CACHE_ALIAS] if SHARED_CACHE_ALIAS in settings.CACHES else None
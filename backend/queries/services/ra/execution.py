@@ -1,13 +1,46 @@
 from databases.models import Database
-from databases.services.execution import execute_sql
 from databases.types import QueryResult
-from queries.services.types import to_relational_schema
+from queries.services.types import (
+    schema_fingerprint,
+    statistics_fingerprint,
+    to_primary_keys,
+    to_relational_schema,
+)
 
+from ..admission import execute_admitted, execute_trusted
 from .ast import RAQuery
+from .compilation import compilation_key, compile_cached
+from .optimiser import RAOptimiser
 from .transpiler import RAtoSQLTranspiler
 
 
-def execute_ra(ast: RAQuery, db: Database) -> QueryResult:
+def execute_ra(
+    ast: RAQuery,
+    db: Database,
+    admission: bool = True,
+    user_id: int | None = None,
+    min_rows: int | None = None,
+) -> QueryResult:
+    sql = compile_ra(ast, db)
+    if admission:
+        return execute_admitted(sql, db, user_id, min_rows)
+    return execute_trusted(sql, db)
+
+
+def compile_ra(ast: RAQuery, db: Database) -> str:
+    """SQL executed for ``ast`` on ``db``."""
     schema = to_relational_schema(db.schema)
-    select = RAtoSQLTranspiler(schema).transpile(ast)
-    return execute_sql(select.sql(), db.connection_info)
+    primary_keys = to_primary_keys(db.schema)
+    table_sizes = db.table_sizes
+
+    def compile_() -> str:
+        # Only the executed copy is optimised, the student's query is left as written
+        optimised = RAOptimiser(schema, primary_keys).optimise(ast)
+        transpiler = RAtoSQLTranspiler(schema, flatten=True, table_sizes=table_sizes)
+        return transpiler.transpile(optimised).sql()
+
+    # Keys and table sizes also decide how the query is optimised and transpiled
+    fingerprint = schema_fingerprint(schema) + statistics_fingerprint(primary_keys, table_sizes)
+    return compile_cached(
+        compilation_key(ast, fingerprint, bag=False, target='execution'), compile_
+    )
@@ -0,0 +1,197 @@
+from collections.abc import Iterator
+from dataclasses import dataclass, replace
+from functools import reduce, singledispatchmethod
+
+from queries.services.types import PrimaryKeys, RelationalSchema
+
+from ..ast import (
+    And,
+    Attribute,
+    BinaryBooleanExpression,
+    BinaryOperator,
+    BooleanExpression,
+    Comparison,
+    Join,
+    JoinKind,
+    Not,
+    Projection,
+    RAQuery,
+    Rename,
+    Selection,
+    SetOperator,
+    SetOperatorKind,
+    ThetaJoin,
+    TopN,
+    UnaryOperator,
+)
+from ..scope.schema import SchemaInferrer
+from .keys import KeyInferrer
+
+
+@dataclass(frozen=True)
+class UniqueProjection(Projection):
+    """Projection whose rows are known to be unique, so it needs no duplicate elimination."""
+
+
+class RAOptimiser:
+    """Rewrites a relational algebra query into an equivalent one that is cheaper to execute.
+
+    The rewritten query is only meant to be executed: it may differ from the query the student
+    wrote, so it must not be shown back to them.
+    """
+
+    def __init__(self, schema: RelationalSchema, primary_keys: PrimaryKeys | None = None):
+        self._schema_inferrer = SchemaInferrer(schema)
+        self._key_inferrer = KeyInferrer(self._schema_inferrer, primary_keys or {})
+
+    def optimise(self, query: RAQuery) -> RAQuery:
+        return self._optimise(query)
+
+    @singledispatchmethod
+    def _optimise(self, query: RAQuery) -> RAQuery:
+        return query
+
+    @_optimise.register
+    def _(self, op: UnaryOperator) -> RAQuery:
+        return replace(op, operand=self._optimise(op.operand))
+
+    @_optimise.register
+    def _(self, op: BinaryOperator) -> RAQuery:
+        return replace(op, left=self._optimise(op.left), right=self._optimise(op.right))
+
+    @_optimise.register
+    def _(self, proj: Projection) -> RAQuery:
+        operand = self._optimise(proj.operand)
+
+        # Merge projections, as long as the outer attributes still resolve unambiguously
+        if isinstance(operand, Projection) and self._resolves(operand.operand, proj.attributes):
+            operand = operand.operand
+
+        if self._is_unique(operand, proj.attributes):
+            return UniqueProjection(operand, proj.attributes)
+        return Projection(operand, proj.attributes)
+
+    @_optimise.register
+    def _(self, rename: Rename) -> RAQuery:
+        operand = self._optimise(rename.operand)
+        # Only the outermost of consecutive renames is visible
+        if isinstance(operand, Rename):
+            operand = operand.operand
+        return Rename(operand, rename.alias)
+
+    @_optimise.register
+    def _(self, selection: Selection) -> RAQuery:
+        return self._push_selection(self._optimise(selection.operand), selection.condition)
+
+    def _push_selection(self, operand: RAQuery, condition: BooleanExpression) -> RAQuery:
+        match operand:
+            case Selection():
+                return self._push_selection(operand.operand, And(operand.condition, condition))
+            case SetOperator(kind=SetOperatorKind.CARTESIAN) | ThetaJoin():
+                left, rest = self._partition(operand.left, operand.right, condition, False)
+                left_operand = self._filter(operand.left, left)
+                if not rest:
+                    return replace(operand, left=left_operand)
+                # A selection over a cartesian product is a theta join
+                if isinstance(operand, ThetaJoin):
+                    rest.insert(0, operand.condition)
+                return ThetaJoin(left_operand, operand.right, _conjunction(rest))
+            case Join(kind=JoinKind.NATURAL):
+                left, rest = self._partition(operand.left, operand.right, condition, True)
+                right: list[BooleanExpression] = []
+                if self._is_single_relation(operand.right):
+                    right, rest = self._partition(operand.right, operand.left, rest, True)
+                join = replace(
+                    operand,
+                    left=self._filter(operand.left, left),
+                    right=self._filter_right(operand.right, right),
+                )
+                return Selection(join, _conjunction(rest)) if rest else join
+            case Join(kind=JoinKind.SEMI | JoinKind.ANTI):
+                left, rest = self._partition(operand.left, operand.right, condition, False)
+                join = replace(operand, left=self._filter(operand.left, left))
+                return Selection(join, _conjunction(rest)) if rest else join
+            case _:
+                return Selection(operand, condition)
+
+    def _partition(
+        self,
+        side: RAQuery,
+        other: RAQuery,
+        condition: BooleanExpression | list[BooleanExpression],
+        shared: bool,
+    ) -> tuple[list[BooleanExpression], list[BooleanExpression]]:
+        """Split ``condition`` into the conjuncts that only refer to ``side`` and the rest.
+
+        With ``shared``, unqualified attributes of both operands may be pushed to either of
+        them, since a natural join only keeps the rows where they are equal.
+        """
+        conjuncts = condition if isinstance(condition, list) else list(_conjuncts(condition))
+        if isinstance(side, TopN):
+            # A selection below a limit would change which rows are kept
+            return [], conjuncts
+
+        side_schema = self._schema_inferrer.infer(side)
+        other_schema = self._schema_inferrer.infer(other)
+
+        def only_refers_to_side(attr: Attribute) -> bool:
+            if len(side_schema.resolve(attr)) != 1:
+                return False
+            return not other_schema.resolve(attr) or (shared and attr.relation is None)
+
+        pushed: list[BooleanExpression] = []
+        rest: list[BooleanExpression] = []
+        for conjunct in conjuncts:
+            if all(only_refers_to_side(attr) for attr in _attributes(conjunct)):
+                pushed.append(conjunct)
+            else:
+                rest.append(conjunct)
+        return pushed, rest
+
+    def _filter(self, operand: RAQuery, conjuncts: list[BooleanExpression]) -> RAQuery:
+        return self._push_selection(operand, _conjunction(conjuncts)) if conjuncts else operand
+
+    def _filter_right(self, operand: RAQuery, conjuncts: list[BooleanExpression]) -> RAQuery:
+        if not conjuncts:
+            return operand
+        # Derived right operands are aliased when joined, so the filtered operand is renamed
+        # after its relation to keep qualified attributes resolvable
+        [relation] = self._schema_inferrer.infer(operand).schema.keys()
+        filtered = self._filter(operand, conjuncts)
+        return Rename(filtered, relation) if relation else filtered
+
+    def _is_single_relation(self, query: RAQuery) -> bool:
+        return len(self._schema_inferrer.infer(query).schema) == 1
+
+    def _resolves(self, query: RAQuery, attributes: list[Attribute]) -> bool:
+        schema = self._schema_inferrer.infer(query)
+        return all(len(schema.resolve(attr)) == 1 for attr in attributes)
+
+    def _is_unique(self, operand: RAQuery, attributes: list[Attribute]) -> bool:
+        projected = self._key_inferrer.qualify(operand, attributes)
+        return any(key <= projected for key in self._key_inferrer.infer(operand))
+
+
+def _conjuncts(condition: BooleanExpression) -> Iterator[BooleanExpression]:
+    if isinstance(condition, And):
+        yield from _conjuncts(condition.left)
+        yield from _conjuncts(condition.right)
+    else:
+        yield condition
+
+
+def _conjunction(conjuncts: list[BooleanExpression]) -> BooleanExpression:
+    return reduce(And, conjuncts)
+
+
+def _attributes(condition: BooleanExpression) -> Iterator[Attribute]:
+    match condition:
+        case Attribute():
+            yield condition
+        case BinaryBooleanExpression():
+            yield from _attributes(condition.left)
+            yield from _attributes(condition.right)
+        case Not():
+            yield from _attributes(condition.expression)
+        case Comparison():
+            yield from (v for v in (condition.left, condition.right) if isinstance(v, Attribute))
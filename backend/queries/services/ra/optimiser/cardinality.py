@@ -0,0 +1,102 @@
+from functools import singledispatchmethod
+
+from databases.types import TableSizes
+
+from ..ast import (
+    Division,
+    GroupedAggregation,
+    Join,
+    JoinKind,
+    OuterJoin,
+    Projection,
+    RAQuery,
+    Relation,
+    Rename,
+    Selection,
+    SetOperator,
+    SetOperatorKind,
+    ThetaJoin,
+    TopN,
+)
+
+
+# Fraction of rows assumed to satisfy a condition, in the absence of column statistics
+SELECTIVITY = 1 / 3
+
+
+class CardinalityEstimator:
+    """Estimates the number of rows of a query's result from the sizes of its tables.
+
+    Estimates are ``None`` when the size of a table the query reads is unknown.
+    """
+
+    def __init__(self, table_sizes: TableSizes):
+        self._table_sizes = table_sizes
+
+    def estimate(self, query: RAQuery) -> float | None:
+        try:
+            return self._estimate(query)
+        except KeyError:
+            return None
+
+    @singledispatchmethod
+    def _estimate(self, query: RAQuery) -> float:
+        raise NotImplementedError(f'No estimate for {type(query).__name__}')
+
+    @_estimate.register
+    def _(self, rel: Relation) -> float:
+        return self._table_sizes[rel.name]
+
+    @_estimate.register
+    def _(self, proj: Projection) -> float:
+        return self._estimate(proj.operand)
+
+    @_estimate.register
+    def _(self, rename: Rename) -> float:
+        return self._estimate(rename.operand)
+
+    @_estimate.register
+    def _(self, sel: Selection) -> float:
+        return self._estimate(sel.operand) * SELECTIVITY
+
+    @_estimate.register
+    def _(self, top: TopN) -> float:
+        return min(top.limit, self._estimate(top.operand))
+
+    @_estimate.register
+    def _(self, agg: GroupedAggregation) -> float:
+        return self._estimate(agg.operand)
+
+    @_estimate.register
+    def _(self, op: SetOperator) -> float:
+        left = self._estimate(op.left)
+        right = self._estimate(op.right)
+        match op.kind:
+            case SetOperatorKind.UNION:
+                return left + right
+            case SetOperatorKind.INTERSECT:
+                return min(left, right)
+            case SetOperatorKind.DIFFERENCE:
+                return left
+            case SetOperatorKind.CARTESIAN:
+                return left * right
+
+    @_estimate.register
+    def _(self, join: Join) -> float:
+        left = self._estimate(join.left)
+        if join.kind in {JoinKind.SEMI, JoinKind.ANTI}:
+            return left
+        # Natural joins usually follow a foreign key
+        return max(left, self._estimate(join.right))
+
+    @_estimate.register
+    def _(self, join: ThetaJoin) -> float:
+        return self._estimate(join.left) * self._estimate(join.right) * SELECTIVITY
+
+    @_estimate.register
+    def _(self, join: OuterJoin) -> float:
+        return max(self._estimate(join.left), self._estimate(join.right))
+
+    @_estimate.register
+    def _(self, div: Division) -> float:
+        return self._estimate(div.dividend) / max(self._estimate(div.divisor), 1)
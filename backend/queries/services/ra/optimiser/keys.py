@@ -0,0 +1,153 @@
+from collections.abc import KeysView
+from functools import singledispatchmethod
+
+from queries.services.types import AttributeName, PrimaryKeys, RelationName
+
+from ..ast import (
+    Attribute,
+    Division,
+    GroupedAggregation,
+    Join,
+    JoinKind,
+    OuterJoin,
+    Projection,
+    RAQuery,
+    Relation,
+    Rename,
+    Selection,
+    SetOperator,
+    SetOperatorKind,
+    ThetaJoin,
+    TopN,
+)
+from ..scope.schema import SchemaInferrer
+
+
+QualifiedName = tuple[RelationName | None, AttributeName]
+Key = frozenset[QualifiedName]
+
+
+class KeyInferrer:
+    """Infers sets of attributes that uniquely identify the rows of a query's result."""
+
+    def __init__(self, schema_inferrer: SchemaInferrer, primary_keys: PrimaryKeys):
+        self._schema_inferrer = schema_inferrer
+        self._primary_keys = primary_keys
+        self._cache: dict[int, tuple[RAQuery, list[Key]]] = {}
+
+    def infer(self, query: RAQuery) -> list[Key]:
+        key = id(query)
+        if key not in self._cache:
+            self._cache[key] = (query, self._infer(query))
+        return self._cache[key][1]
+
+    def qualify(self, query: RAQuery, attributes: list[Attribute]) -> Key:
+        """Qualify ``attributes`` with the relation they resolve to in the result of ``query``."""
+        input_ = self._schema_inferrer.infer(query)
+        qualified = set()
+        for attr in attributes:
+            [(relation, _)] = input_.resolve(attr)
+            qualified.add((relation, attr.name))
+        return frozenset(qualified)
+
+    @singledispatchmethod
+    def _infer(self, query: RAQuery) -> list[Key]:
+        return []
+
+    @_infer.register
+    def _(self, rel: Relation) -> list[Key]:
+        key = self._primary_keys.get(rel.name)
+        return [frozenset((rel.name, name) for name in key)] if key else []
+
+    @_infer.register
+    def _(self, proj: Projection) -> list[Key]:
+        # Projections are duplicate-free, so every projected attribute together forms a key
+        projected = self.qualify(proj.operand, proj.attributes)
+        keys = [key for key in self.infer(proj.operand) if key <= projected]
+        return [*keys, projected]
+
+    @_infer.register
+    def _(self, sel: Selection) -> list[Key]:
+        return self.infer(sel.operand)
+
+    @_infer.register
+    def _(self, top: TopN) -> list[Key]:
+        return self.infer(top.operand)
+
+    @_infer.register
+    def _(self, rename: Rename) -> list[Key]:
+        return _relabel(self.infer(rename.operand), rename.alias)
+
+    @_infer.register
+    def _(self, op: SetOperator) -> list[Key]:
+        if op.kind == SetOperatorKind.CARTESIAN:
+            return self._combine(op.left, op.right)
+        # SQL set operations remove duplicates
+        attrs = self._schema_inferrer.infer(op).attrs
+        return [frozenset((None, attr.name) for attr in attrs)]
+
+    @_infer.register
+    def _(self, join: Join) -> list[Key]:
+        if join.kind in {JoinKind.SEMI, JoinKind.ANTI}:
+            return self.infer(join.left)
+
+        left = self._schema_inferrer.infer(join.left)
+        right = self._schema_inferrer.infer(join.right)
+        if not _disjoint(left.schema.keys(), right.schema.keys()):
+            return []
+        shared = {a.name for a in left.attrs} & {a.name for a in right.attrs}
+
+        def merge_shared(keys: list[Key]) -> list[Key]:
+            # Shared attributes are merged into a single unqualified attribute
+            return [
+                frozenset((None if name in shared else relation, name) for relation, name in key)
+                for key in keys
+            ]
+
+        keys = merge_shared(self._combine(join.left, join.right))
+        # Rows joining on a key of one operand match at most one row of that operand
+        shared_key = frozenset((None, name) for name in shared)
+        for side, other in [(join.left, join.right), (join.right, join.left)]:
+            if any(key <= shared_key for key in merge_shared(self.infer(other))):
+                keys += merge_shared(self.infer(side))
+        return keys
+
+    @_infer.register
+    def _(self, join: ThetaJoin) -> list[Key]:
+        return self._combine(join.left, join.right)
+
+    @_infer.register
+    def _(self, join: OuterJoin) -> list[Key]:
+        # Padding with nulls can repeat the attributes of the preserved side
+        return []
+
+    @_infer.register
+    def _(self, div: Division) -> list[Key]:
+        attrs = self._schema_inferrer.infer(div).attrs
+        return [frozenset((None, attr.name) for attr in attrs)]
+
+    @_infer.register
+    def _(self, agg: GroupedAggregation) -> list[Key]:
+        return [frozenset((attr.relation, attr.name) for attr in agg.group_by)]
+
+    def _combine(self, left: RAQuery, right: RAQuery) -> list[Key]:
+        left_relations = self._schema_inferrer.infer(left).schema.keys()
+        right_relations = self._schema_inferrer.infer(right).schema.keys()
+        if not _disjoint(left_relations, right_relations):
+            return []
+        return [lk | rk for lk in self.infer(left) for rk in self.infer(right)]
+
+
+def _disjoint(left: KeysView[RelationName | None], right: KeysView[RelationName | None]) -> bool:
+    # Attributes of relations on both sides are merged, so they no longer identify their rows
+    return not left & right
+
+
+def _relabel(keys: list[Key], relation: RelationName) -> list[Key]:
+    relabelled: list[Key] = []
+    for key in keys:
+        renamed = frozenset((relation, name) for _, name in key)
+        # Attributes sharing a name are merged by the rename
+        if len(renamed) == len(key):
+            relabelled.append(renamed)
+    return relabelled
@@ -29,13 +29,14 @@ from .utils import merge_schemas
 class SchemaInferrer:
     def __init__(self, schema: RelationalSchema):
         self.schema = schema
-        self._cache: dict[int, ResultSchema] = {}
+        # Entries keep their query alive so that its id cannot be reused by another node
+        self._cache: dict[int, tuple[RAQuery, ResultSchema]] = {}
 
     def infer(self, query: RAQuery) -> ResultSchema:
         key = id(query)
         if key not in self._cache:
-            self._cache[key] = self._infer(query)
-        return self._cache[key]
+            self._cache[key] = (query, self._infer(query))
+        return self._cache[key][1]
 
     @singledispatchmethod
     def _infer(self, query: RAQuery) -> ResultSchema:
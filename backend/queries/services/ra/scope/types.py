@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 
 from queries.services.ra.ast import Attribute
-from queries.services.types import RelationalSchema, RelationName
+from queries.services.types import RelationName, SchemaView
 from query_cod.types import DataType
 
 
@@ -16,7 +16,7 @@ Match = tuple[RelationName | None, DataType]
 
 @dataclass
 class ResultSchema:
-    schema: RelationalSchema
+    schema: SchemaView
     attrs: list[TypedAttribute]
 
     def resolve(self, attr: Attribute) -> list[Match]:
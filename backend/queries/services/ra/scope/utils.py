@@ -1,17 +1,9 @@
-import copy
+from queries.services.types import SchemaView, SharedSchema
 
-from queries.services.types import RelationalSchema
 
-
-def merge_schemas(
-    left: RelationalSchema,
-    right: RelationalSchema,
-) -> RelationalSchema:
-    merged: RelationalSchema = copy.deepcopy(left)
+def merge_schemas(left: SchemaView, right: SchemaView) -> SharedSchema:
+    # Only relations present on both sides get a new attribute mapping
+    merged: SharedSchema = dict(left)
     for rel, attrs in right.items():
-        if rel in merged:
-            for attr, t in attrs.items():
-                merged[rel][attr] = t
-        else:
-            merged[rel] = dict(attrs)
+        merged[rel] = {**merged[rel], **attrs} if rel in merged else attrs
     return merged
@@ -3,6 +3,7 @@ from typing import cast
 
 import queries.services.ra.ast as ra
 import sqlglot.expressions as sql
+from databases.types import TableSizes
 from queries.services.sql.types import aggregate_functions
 from queries.services.types import (
     RelationalSchema,
@@ -13,17 +14,43 @@ from queries.services.types import (
 from sqlglot.expressions import Exists, Expression, Select, column, select, subquery, table_
 
 from ..ast import RAQuery, Relation
+from ..optimiser import UniqueProjection
+from ..optimiser.cardinality import CardinalityEstimator
 from ..scope.schema import SchemaInferrer
+from .division import DivisionStrategy, choose_division_strategy
+from .flatten import inline_aliases, realias, share_subqueries
 from .renamer import RAExpressionRenamer
 
 
 class RAtoSQLTranspiler:
-    def __init__(self, schema: RelationalSchema, bag: bool = False):
+    """Transpiles relational algebra into SQL.
+
+    With ``flatten``, renames and selections are folded into the query they apply to where SQL
+    allows, and derived tables that occur more than once are shared through a ``WITH`` clause.
+
+    Divisions are transpiled with the strategy that is cheapest for the estimated sizes of their
+    operands, unless ``division`` forces one.
+    """
+
+    def __init__(
+        self,
+        schema: RelationalSchema,
+        bag: bool = False,
+        flatten: bool = False,
+        table_sizes: TableSizes | None = None,
+        division: DivisionStrategy | None = None,
+    ):
         self._schema_inferrer = SchemaInferrer(schema)
+        self._cardinality_estimator = CardinalityEstimator(table_sizes or {})
+        self._relations = [name for name in schema if name]
         self._bag = bag
+        self._flatten = flatten
+        self._division = division
 
     def transpile(self, query: RAQuery) -> SQLQuery:
         transpiled = self._transpile(query)
+        if self._flatten:
+            transpiled = share_subqueries(transpiled, reserved=self._relations)
         return transpiled
 
     @singledispatchmethod
@@ -54,7 +81,7 @@ class RAtoSQLTranspiler:
 
         query.select(*expressions, append=False, copy=False)
 
-        if not self._bag:
+        if not (self._bag or isinstance(proj, UniqueProjection)):
             query.distinct(copy=False)
 
         return query
@@ -65,6 +92,9 @@ class RAtoSQLTranspiler:
         condition = self._transpile_condition(selection.condition)
 
         if self._refers_to(condition, query.expressions):
+            if self._flatten and query.args.get('group') and not query.args.get('limit'):
+                # Aggregates can be filtered by the grouped query itself
+                return query.having(inline_aliases(condition, query))
             query = subquery(query, 'sub').select('*')
 
         if query.args.get('group'):
@@ -97,13 +127,37 @@ class RAtoSQLTranspiler:
 
     @_transpile.register
     def _(self, div: ra.Division) -> Select:
-        # Get tables with aliases
-        dividend, dividend_alias = self._transpile_relation(div.dividend, 'dividend')
-        dividend_sub, dividend_sub_alias = self._transpile_relation(div.dividend, 'missing_divisor')
-
         output_attrs = [a.name for a in self._schema_inferrer.infer(div).attrs]
         divisor_attrs = [a.name for a in self._schema_inferrer.infer(div.divisor).attrs]
 
+        strategy = self._division or choose_division_strategy(
+            self._cardinality_estimator.estimate(div.dividend),
+            self._cardinality_estimator.estimate(div.divisor),
+            len(divisor_attrs),
+        )
+        match strategy:
+            case DivisionStrategy.NOT_EXISTS:
+                return self._transpile_division_not_exists(div, output_attrs, divisor_attrs)
+            case DivisionStrategy.COUNT if len(divisor_attrs) == 1:
+                return self._transpile_division_count(div, output_attrs, divisor_attrs[0])
+            case _:
+                return self._transpile_division_join(div, output_attrs, divisor_attrs)
+
+    def _transpile_division_not_exists(
+        self, div: ra.Division, output_attrs: list[str], divisor_attrs: list[str]
+    ) -> Select:
+        # Get tables with aliases
+        dividend, dividend_alias = self._transpile_relation(div.dividend, 'dividend')
+        # The second instance needs an alias of its own, even if the dividend is a base table
+        dividend_sub_alias = 'missing_divisor'
+        match div.dividend:
+            case Relation() as relation:
+                dividend_sub = cast(Select, self._transpile(relation, alias=dividend_sub_alias))
+            case _:
+                dividend_sub = subquery(self._transpile(div.dividend), dividend_sub_alias).select(
+                    '*'
+                )
+
         # Create join conditions between the two dividend instances
         match_conditions = [
             sql.EQ(
@@ -123,6 +177,80 @@ class RAtoSQLTranspiler:
         candidates = dividend.select(*output_attrs, append=False).distinct()
         return candidates.where(sql.not_(Exists(this=missing_divisors)))
 
+    def _transpile_division_count(
+        self, div: ra.Division, output_attrs: list[str], divisor_attr: str
+    ) -> Select:
+        dividend, dividend_alias = self._transpile_relation(div.dividend, 'dividend')
+        divisor_values = select(divisor_attr).from_(
+            self._transpile(div.divisor).subquery('divisors')
+        )
+
+        # Count the distinct divisor values of each candidate, so an empty divisor keeps them all
+        value = column(divisor_attr, table=dividend_alias)
+        matched = sql.Case().when(value.isin(query=divisor_values), value)
+        total = divisor_values.select(
+            sql.Count(this=sql.Distinct(expressions=[column(divisor_attr)])), append=False
+        )
+
+        outputs = [column(attr, table=dividend_alias) for attr in output_attrs]
+        return (
+            dividend.select(*outputs, append=False)
+            .group_by(*outputs)
+            .having(
+                sql.EQ(
+                    this=sql.Count(this=sql.Distinct(expressions=[matched])),
+                    expression=total.subquery(),
+                )
+            )
+        )
+
+    def _transpile_division_join(
+        self, div: ra.Division, output_attrs: list[str], divisor_attrs: list[str]
+    ) -> Select:
+        dividend, dividend_alias = self._transpile_relation(div.dividend, 'dividend')
+        divisors = (
+            select(*divisor_attrs)
+            .from_(self._transpile(div.divisor).subquery('divisor'))
+            .distinct()
+        )
+
+        # Pair each candidate with the divisor tuples it has, or with nulls if it has none
+        matched = (
+            dividend.select(
+                *[column(attr, table=dividend_alias) for attr in output_attrs],
+                *[column(attr, table='divisors') for attr in divisor_attrs],
+                append=False,
+            )
+            .distinct()
+            .join(
+                divisors,
+                join_type='LEFT',
+                join_alias='divisors',
+                on=sql.and_(
+                    *[
+                        sql.EQ(
+                            this=column(attr, table=dividend_alias),
+                            expression=column(attr, table='divisors'),
+                        )
+                        for attr in divisor_attrs
+                    ]
+                ),
+            )
+        )
+        total = select(sql.Count(this=sql.Star())).from_(divisors.subquery('divisors'))
+
+        return (
+            select(*output_attrs)
+            .from_(matched.subquery('matched'))
+            .group_by(*output_attrs)
+            .having(
+                sql.EQ(
+                    this=sql.Count(this=column(divisor_attrs[0])),
+                    expression=total.subquery(),
+                )
+            )
+        )
+
     def _transpile_attribute(self, attr: ra.Attribute) -> Expression:
         return column(attr.name, table=attr.relation)
 
@@ -149,7 +277,7 @@ class RAtoSQLTranspiler:
             case ra.SetOperatorKind.DIFFERENCE:
                 return left.except_(right)
             case ra.SetOperatorKind.CARTESIAN:
-                left = self._transpile_select(op.left)
+                left, _ = self._transpile_join_left(op.left)
                 match op.right:
                     case Relation() as relation:
                         return left.join(relation.name, join_type='CROSS')
@@ -200,9 +328,15 @@ class RAtoSQLTranspiler:
         return self._transpile_conditional_join(join.left, join.right, join.condition, 'INNER')
 
     def _transpile_join_left(self, operand: RAQuery) -> tuple[Select, str | None]:
-        transpiled = self.transpile(operand)
-        if not isinstance(transpiled, Select) or any(
-            transpiled.args.get(clause) for clause in ('group', 'having', 'order')
+        transpiled = self._transpile(operand)
+        # Joins extend the left query in place, so it must keep every column and row of its tables
+        if (
+            not isinstance(transpiled, Select)
+            or not transpiled.is_star
+            or any(
+                transpiled.args.get(clause)
+                for clause in ('distinct', 'group', 'having', 'order', 'limit')
+            )
         ):
             subquery_alias = 'l'
             return subquery(transpiled, subquery_alias).select('*'), subquery_alias
@@ -215,10 +349,13 @@ class RAtoSQLTranspiler:
                 return operand.name, None
             case ra.Rename(Relation() as base_relation, alias=alias):
                 return base_relation.name, alias
+            case ra.Rename() if self._flatten:
+                # The join aliases the operand itself
+                return self._transpile(operand.operand), operand.alias
             case ra.Rename():
-                return self.transpile(operand), operand.alias
+                return self._transpile(operand), operand.alias
             case _:
-                return self.transpile(operand), 'r'
+                return self._transpile(operand), 'r'
 
     def _transpile_natural_join(
         self,
@@ -302,6 +439,8 @@ class RAtoSQLTranspiler:
             case _:
                 # rename is a derived relation
                 query = self._transpile(rename.operand)
+                if self._flatten and (folded := realias(query, rename.alias)):
+                    return folded
                 return subquery(query, rename.alias).select('*')
 
     def _transpile_relation(self, relation: RAQuery, alias: str) -> tuple[Select, str]:
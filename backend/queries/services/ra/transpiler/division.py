@@ -0,0 +1,31 @@
+from enum import Enum
+
+
+class DivisionStrategy(Enum):
+    # Keep candidates for which no divisor tuple is missing, checked per candidate
+    NOT_EXISTS = 'NOT_EXISTS'
+    # Count the distinct divisor values of each candidate; single attribute divisors only
+    COUNT = 'COUNT'
+    # Count the divisor tuples each candidate joins with
+    JOIN = 'JOIN'
+
+
+# Rows worth of work spent on grouping, which the correlated strategy avoids
+GROUPING_OVERHEAD = 1000
+
+
+def choose_division_strategy(
+    dividend_rows: float | None, divisor_rows: float | None, divisor_attributes: int
+) -> DivisionStrategy:
+    """Pick the cheapest strategy for the estimated sizes of the dividend and divisor."""
+    if dividend_rows is None or divisor_rows is None:
+        return DivisionStrategy.NOT_EXISTS
+
+    costs = {
+        # Each candidate compares the whole divisor against its dividend tuples
+        DivisionStrategy.NOT_EXISTS: dividend_rows * max(divisor_rows, 1),
+        DivisionStrategy.JOIN: dividend_rows + 2 * divisor_rows + GROUPING_OVERHEAD,
+    }
+    if divisor_attributes == 1:
+        costs[DivisionStrategy.COUNT] = dividend_rows + divisor_rows + GROUPING_OVERHEAD
+    return min(costs, key=lambda strategy: costs[strategy])
@@ -0,0 +1,92 @@
+from collections import Counter
+from collections.abc import Collection
+from itertools import count
+from typing import cast
+
+import sqlglot.expressions as sql
+from queries.services.types import SQLQuery
+from sqlglot.expressions import Expression, Select, Subquery
+
+
+_CLAUSES = ('distinct', 'group', 'having', 'order', 'limit', 'joins', 'with')
+
+
+def realias(query: SQLQuery, alias: str) -> Select | None:
+    """Fold a rename of ``query`` into it, if it only filters the rows of a single table."""
+    if (
+        not isinstance(query, Select)
+        or any(query.args.get(clause) for clause in _CLAUSES)
+        or not query.is_star
+        or any(select is not query for select in query.find_all(Select))
+    ):
+        return None
+
+    from_ = query.args.get('from')
+    source = from_.this if from_ else None
+    if not isinstance(source, sql.Table):
+        return None
+
+    name = source.alias_or_name
+    source.set('alias', sql.TableAlias(this=sql.to_identifier(alias)))
+    # Columns are all of the one table, and are qualified so they stay unambiguous once the query
+    # is joined with others
+    for col in query.find_all(sql.Column):
+        if col.table in ('', name):
+            col.set('table', sql.to_identifier(alias))
+    return query
+
+
+def inline_aliases(condition: Expression, query: Select) -> Expression:
+    """Replace references to the aliased expressions of ``query`` with the expressions."""
+    aliased: dict[str, Expression] = {
+        expr.alias: expr.this for expr in query.expressions if isinstance(expr, sql.Alias)
+    }
+
+    def inline(node: Expression) -> Expression:
+        if isinstance(node, sql.Column) and not node.table and node.name in aliased:
+            return aliased[node.name].copy()
+        return node
+
+    return condition.transform(inline)
+
+
+def share_subqueries(query: SQLQuery, reserved: Collection[str]) -> SQLQuery:
+    """Hoist derived tables that occur more than once into common table expressions."""
+    names = (name for i in count(1) if (name := f'shared_{i}') not in reserved)
+    ctes: list[sql.CTE] = []
+
+    while repeated := _largest_repeated(query, ctes):
+        name = next(names)
+        for scope in [query, *ctes]:
+            for derived in list(scope.find_all(Subquery)):
+                if _is_derived_table(derived) and derived.this == repeated:
+                    derived.replace(
+                        sql.Table(this=sql.to_identifier(name), alias=derived.args.get('alias'))
+                    )
+        # Larger tables are hoisted first, so tables they contain must be defined before them
+        ctes.insert(0, sql.CTE(this=repeated, alias=sql.TableAlias(this=sql.to_identifier(name))))
+
+    if ctes:
+        query.set('with', sql.With(expressions=ctes))
+    return query
+
+
+def _largest_repeated(query: SQLQuery, ctes: list[sql.CTE]) -> Expression | None:
+    occurrences = Counter(
+        cast(Expression, derived.this)
+        for scope in [query, *ctes]
+        for derived in scope.find_all(Subquery)
+        if _is_derived_table(derived)
+    )
+    repeated = [expr for expr, count in occurrences.items() if count > 1]
+    if not repeated:
+        return None
+    return max(repeated, key=_size)
+
+
+def _is_derived_table(expr: Subquery) -> bool:
+    return isinstance(expr.parent, sql.From | sql.Join)
+
+
+def _size(expr: Expression) -> int:
+    return sum(1 for _ in expr.walk())
@@ -0,0 +1,51 @@
+import pickle
+import uuid
+from typing import TypedDict
+
+from django.core.cache import caches
+
+from databases.types import QueryResult
+
+
+# Seconds a result is kept for its pages to be fetched
+RESULT_TIMEOUT = 10 * 60
+# Bytes of larger results, which are not kept, so only their first page is returned
+MAX_STORED_BYTES = 4 * 1024 * 1024
+
+
+class StoredResult(TypedDict):
+    owner_id: int | None
+    # Pickled once, as it is measured before being kept
+    result: bytes
+
+
+def store_result(result: QueryResult, owner_id: int | None) -> str | None:
+    """Keep ``result`` for its pages to be fetched, returning the id it is kept under."""
+    pickled = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+    if len(pickled) > MAX_STORED_BYTES:
+        return None
+
+    result_id = uuid.uuid4().hex
+    stored: StoredResult = {'owner_id': owner_id, 'result': pickled}
+    caches['results'].set(_result_key(result_id), stored, RESULT_TIMEOUT)
+    return result_id
+
+
+def get_stored_result(result_id: str, owner_id: int | None) -> QueryResult | None:
+    stored: StoredResult | None = caches['results'].get(_result_key(result_id))
+    if stored is None or stored['owner_id'] != owner_id:
+        return None
+    result: QueryResult = pickle.loads(stored['result'])  # noqa: S301
+    return result
+
+
+def slice_result(result: QueryResult, offset: int, limit: int | None) -> QueryResult:
+    end = None if limit is None else offset + limit
+    page: QueryResult = {'columns': result['columns'], 'rows': result['rows'][offset:end]}
+    if 'truncated' in result:
+        page['truncated'] = result['truncated']
+    return page
+
+
+def _result_key(result_id: str) -> str:
+    return f'query_result_{result_id}'
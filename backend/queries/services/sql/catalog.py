@@ -0,0 +1,43 @@
+import sqlite3
+from threading import Lock
+
+from common.utils.lru import LRUCache
+
+from ..types import RelationalSchema, SQLQuery, schema_fingerprint
+
+
+CATALOG_CACHE_SIZE = 32
+
+
+class Catalog:
+    """In-memory SQLite database with the tables of a schema, and no rows."""
+
+    def __init__(self, schema: RelationalSchema) -> None:
+        self._conn = sqlite3.connect(':memory:', check_same_thread=False)
+        self._lock = Lock()
+        for relation, attributes in schema.items():
+            if relation is not None:
+                # Planning does not depend on column types
+                columns = ', '.join(_quote(attribute) for attribute in attributes)
+                self._conn.execute(f'CREATE TABLE {_quote(relation)} ({columns})')
+
+    def explain(self, query: SQLQuery) -> None:
+        """Plan ``query``, raising ``sqlite3.Error`` if it cannot be planned."""
+        with self._lock:
+            self._conn.execute(f'EXPLAIN QUERY PLAN {query.sql(dialect="sqlite")}')
+
+
+_catalogs: LRUCache[str, Catalog] = LRUCache(maxsize=CATALOG_CACHE_SIZE)
+
+
+def get_catalog(schema: RelationalSchema) -> Catalog:
+    key = schema_fingerprint(schema)
+    catalog = _catalogs.get(key)
+    if catalog is None:
+        catalog = Catalog(schema)
+        _catalogs.set(key, catalog)
+    return catalog
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
@@ -1,9 +1,17 @@
 from databases.models.database import Database
-from databases.services.execution import execute_sql as execute_sql_service
 from databases.types import QueryResult
 
+from ..admission import execute_admitted, execute_trusted
 from ..types import SQLQuery
 
 
-def execute_sql(ast: SQLQuery, db: Database) -> QueryResult:
-    return execute_sql_service(ast.sql(), db.connection_info)
+def execute_sql(
+    ast: SQLQuery,
+    db: Database,
+    admission: bool = True,
+    user_id: int | None = None,
+    min_rows: int | None = None,
+) -> QueryResult:
+    if admission:
+        return execute_admitted(ast.sql(), db, user_id, min_rows)
+    return execute_trusted(ast.sql(), db)
@@ -1,6 +1,14 @@
+import hashlib
 from typing import cast
 
-from queries.services.types import Attributes, RelationalSchema, SQLQuery, flatten
+from common.utils.lru import LRUCache
+from queries.services.types import (
+    AttributesView,
+    RelationalSchema,
+    SQLQuery,
+    flatten,
+    schema_fingerprint,
+)
 from sqlglot.expressions import (
     Expression,
     Identifier,
@@ -15,8 +23,29 @@ from ..types import SQLTable
 from .query import DerivedTableScope, SelectScope, SetOperationScope, SQLScope
 
 
+# Root scopes are shared between normalisation, validation and transpilation of the same AST.
+# Consumers must not modify the AST of a scope.
+_scope_cache: LRUCache[tuple[str, str], SQLScope] = LRUCache(maxsize=256)
+
+
 def build_scope(
     query: SQLQuery, schema: RelationalSchema, parent: SQLScope | None = None
+) -> SQLScope:
+    if parent is not None:
+        return _build_scope(query, schema, parent)
+
+    # Rewritten queries have a different text, so a normaliser rewrite invalidates the entry.
+    # Expressions compare by their hashes, which distinct queries may share
+    digest = hashlib.blake2b(query.sql().encode(), digest_size=16).hexdigest()
+    key = (digest, schema_fingerprint(schema))
+    if (scope := _scope_cache.get(key)) is None:
+        scope = _build_scope(query, schema)
+        _scope_cache.set(key, scope)
+    return scope
+
+
+def _build_scope(
+    query: SQLQuery, schema: RelationalSchema, parent: SQLScope | None = None
 ) -> SQLScope:
     match query:
         case Select():
@@ -98,10 +127,11 @@ def _process_select(scope: SelectScope) -> None:
             scope.projections.add(expr, TypeInferrer(scope).infer(expr))
 
 
-def _process_table(scope: SelectScope, table: SQLTable) -> Attributes:
+def _process_table(scope: SelectScope, table: SQLTable) -> AttributesView:
+    attributes: AttributesView
     match table:
         case Table():
-            attributes = scope.db_schema.get(table.name, {}).copy()
+            attributes = scope.db_schema.get(table.name, {})
 
         case Subquery():
             derived_table_scope = _build_derived_table_scope(table, scope.db_schema, scope)
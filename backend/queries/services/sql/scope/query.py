@@ -3,7 +3,7 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import cast
 
-from queries.services.types import Attributes, RelationalSchema, SQLQuery
+from queries.services.types import Attributes, RelationalSchema, SchemaView, SQLQuery
 from sqlglot.expressions import (
     Column,
     Expression,
@@ -114,7 +114,7 @@ class SelectScope(SQLScope):
             columns = self.tables.find_columns(table)
             if columns is None:
                 return None
-            schema = {table: columns}
+            schema: SchemaView = {table: columns}
         else:
             schema = self.tables.get_schema()
 
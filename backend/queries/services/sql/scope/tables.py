@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-import copy
 from collections.abc import Callable
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, TypeVar, cast
 
 from queries.services.types import (
     Attributes,
-    RelationalSchema,
+    AttributesView,
+    SchemaView,
+    SharedSchema,
     flatten,
     merge_common_column,
 )
@@ -25,25 +26,26 @@ if TYPE_CHECKING:
 class Source:
     table: Table | SQLScope
     name: str | None
-    attributes: Attributes
+    attributes: AttributesView
 
 
 class TablesScope:
     def __init__(self, select_scope: SelectScope, parent: TablesScope | None = None) -> None:
         self.select_scope = select_scope
         self.parent = parent
-        self._joined_schema: RelationalSchema = {}
-        self._tables_schemas: RelationalSchema = {}
+        self._joined_schema: SharedSchema = {}
+        self._tables_schemas: SharedSchema = {}
         self.derived_table_scopes: dict[str, DerivedTableScope] = {}
         self._aliases: dict[str, str] = {}
 
-    def add(self, table: SQLTable, attributes: Attributes) -> None:
+    def add(self, table: SQLTable, attributes: AttributesView) -> None:
         if table.alias:
             self._aliases[table.alias] = table.name
 
+        # Attribute mappings are never modified in place, so both schemas can share them
         name = table.alias_or_name
-        self._tables_schemas[name] = attributes.copy()
-        self._joined_schema[name] = attributes.copy()
+        self._tables_schemas[name] = attributes
+        self._joined_schema[name] = attributes
 
     def __contains__(self, column: Column) -> bool:
         if column.table:
@@ -108,19 +110,17 @@ class TablesScope:
     def merge_column(self, col: str) -> None:
         merge_common_column(self._joined_schema, col)
 
-    def get_schema(self) -> RelationalSchema:
-        return copy.deepcopy(self._joined_schema)
+    def get_schema(self) -> SchemaView:
+        return dict(self._joined_schema)
 
     def get_all_columns(self) -> Attributes:
-        return flatten(self.get_schema())
+        return flatten(self._joined_schema)
 
-    def find_columns(self, table: str) -> Attributes | None:
-        if table not in self._tables_schemas:
-            return None
-        return self._tables_schemas[table].copy()
+    def find_columns(self, table: str) -> AttributesView | None:
+        return self._tables_schemas.get(table)
 
-    def get_columns(self, table: str) -> Attributes:
-        return cast(Attributes, self.find_columns(table))
+    def get_columns(self, table: str) -> AttributesView:
+        return cast(AttributesView, self.find_columns(table))
 
     def _get_source(self, name_or_alias: str | None) -> Source:
         from ..scope.builder import build_scope
@@ -140,7 +140,7 @@ class TablesScope:
             assert self.select_scope.from_ is not None  # noqa: S101
 
             query = select('*').from_(self.select_scope.from_.this)
-            query.set('joins', self.select_scope.joins)
+            query.set('joins', [join.copy() for join in self.select_scope.joins])
             return Source(
                 table=build_scope(
                     query,
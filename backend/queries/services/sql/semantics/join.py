@@ -1,4 +1,4 @@
-from queries.services.types import Attributes
+from queries.services.types import Attributes, AttributesView
 from sqlglot.expressions import Identifier, Join
 
 from ..scope import SelectScope
@@ -48,7 +48,7 @@ class JoinValidator:
             self.expr_validator.validate_boolean(condition)
 
     def _validate_join_columns(
-        self, join_columns: list[str], left: Attributes, right: Attributes, join: Join
+        self, join_columns: list[str], left: Attributes, right: AttributesView, join: Join
     ) -> None:
         for col in join_columns:
             if col not in left:
@@ -1,3 +1,4 @@
+from itertools import product
 from typing import cast
 
 from queries.services.types import RelationalSchema, SQLQuery
@@ -14,11 +15,11 @@ from sqlglot.expressions import (
     SetOperation,
     Subquery,
     Table,
+    and_,
     column,
     not_,
     union,
 )
-from sqlglot.optimizer.normalize import normalize
 
 from ..scope.builder import build_scope
 from ..scope.query import SQLScope
@@ -32,39 +33,66 @@ def normalise(query: SQLQuery, schema: RelationalSchema) -> SQLQuery:
     return transformed
 
 
-def alias_tables(query: SQLQuery) -> SQLQuery:
-    table_counters: dict[str, int] = {}
+def alias_tables(query: SQLQuery, copy: bool = True) -> SQLQuery:
+    if copy:
+        query = query.copy()
 
-    # Initialize counters
-    for table in query.find_all(Table, Subquery):
-        table_counters[table.alias_or_name] = 0
+    table_counters: dict[str, int] = {}
+    tables: list[Table] = []
+    selects: list[Select] = []
+    columns: dict[int, list[Column]] = {}
 
-    def update_column_references(select: Select, name: str, alias: str) -> None:
-        for col in select.find_all(Column):
-            if col.table == name:
-                col.replace(column(col=col.name, table=alias))
+    # Index tables, selects and the columns owned by each select in a single walk
+    for node in query.dfs():
+        match node:
+            case Table():
+                table_counters[node.alias_or_name] = 0
+                tables.append(node)
+            case Subquery():
+                table_counters[node.alias_or_name] = 0
+            case Select():
+                selects.append(node)
+            case Column() if node.table and (select := node.parent_select):
+                columns.setdefault(id(select), []).append(node)
 
     def get_unique_alias(name: str) -> str:
         while (alias := f'{name}{table_counters[name] - 1}') in table_counters:
             table_counters[name] += 1
         return alias
 
-    def assign_aliases(node: Expression) -> Expression:
-        if isinstance(node, Table):
-            name = node.alias_or_name
-            table_counters[name] += 1
-
-            if table_counters[name] == 1:
-                return node
-
-            alias = get_unique_alias(name)
-            update_column_references(cast(Select, node.parent_select), name, alias)
-
-            return node.as_(alias)
+    # Assign aliases, remembering the first rename of each table name per select
+    renames: dict[int, dict[str, tuple[int, str]]] = {}
+    for order, table in enumerate(tables):
+        name = table.alias_or_name
+        table_counters[name] += 1
+
+        if table_counters[name] == 1:
+            continue
+
+        alias = get_unique_alias(name)
+        table.set('alias', exp.TableAlias(this=exp.to_identifier(alias)))
+        if select := table.parent_select:
+            renames.setdefault(id(select), {}).setdefault(name, (order, alias))
+
+    # A rename applies to the select's nested subqueries too, the earliest rename winning
+    scoped_renames: dict[int, dict[str, tuple[int, str]]] = {}
+    for select in selects:
+        parent = select.parent_select
+        inherited = scoped_renames.get(id(parent), {}) if parent else {}
+        if own := renames.get(id(select)):
+            inherited = inherited | {
+                name: rename
+                for name, rename in own.items()
+                if name not in inherited or rename < inherited[name]
+            }
+        scoped_renames[id(select)] = inherited
 
-        return node
+        for col in columns.get(id(select), []):
+            if rename := inherited.get(col.table):
+                _, alias = rename
+                col.set('table', exp.to_identifier(alias))
 
-    return cast(SQLQuery, query.transform(assign_aliases))
+    return query
 
 
 def normalise_subqueries(query: SQLQuery, schema: RelationalSchema) -> SQLQuery:
@@ -189,11 +217,66 @@ def convert_to_dnf_union(select: Select) -> SQLQuery:
         return select
 
 
+# Upper bound on the number of selects a condition may be expanded into
+MAX_DNF_CONJUNCTIONS = 16
+
+
+def estimate_dnf_size(condition: Expression, negated: bool = False) -> int:
+    """Number of conjunctions in the DNF of ``condition``, capped just above the bound.
+
+    Subquery-free subexpressions are kept whole, so only disjunctions involving
+    subqueries contribute to the size.
+    """
+    match condition:
+        case exp.Paren():
+            return estimate_dnf_size(condition.this, negated)
+
+        case exp.Not():
+            return estimate_dnf_size(condition.this, not negated)
+
+        case exp.And() | exp.Or() if condition.find(Select):
+            sizes = [estimate_dnf_size(operand, negated) for operand in _operands(condition)]
+            if isinstance(condition, exp.And) != negated:
+                size = 1
+                for operand_size in sizes:
+                    size = min(size * operand_size, MAX_DNF_CONJUNCTIONS + 1)
+                return size
+            return min(sum(sizes), MAX_DNF_CONJUNCTIONS + 1)
+
+        case _:
+            return 1
+
+
 def _extract_dnf_conjunctions(where: Expression) -> list[Expression]:
-    dnf = normalize(where, dnf=True)
+    if estimate_dnf_size(where) > MAX_DNF_CONJUNCTIONS:
+        # Too costly to expand: keep one select per top-level disjunct, whose
+        # subqueries are still decorrelated into semi-joins
+        where = where.unnest()  # type: ignore[no-untyped-call]
+        return _operands(where) if isinstance(where, Or) else [where]
 
-    if isinstance(dnf, Or):
-        return list(dnf.flatten())  # type: ignore[no-untyped-call]
-    else:
-        # The expression is a single conjunction
-        return [dnf]
+    return [and_(*conjunction) for conjunction in _expand_dnf(where)]
+
+
+def _expand_dnf(condition: Expression, negated: bool = False) -> list[list[Expression]]:
+    match condition:
+        case exp.Paren():
+            return _expand_dnf(condition.this, negated)
+
+        case exp.Not():
+            return _expand_dnf(condition.this, not negated)
+
+        case exp.And() | exp.Or() if condition.find(Select):
+            expansions = [_expand_dnf(operand, negated) for operand in _operands(condition)]
+            if isinstance(condition, exp.And) != negated:
+                return [
+                    [atom for conjunction in combination for atom in conjunction]
+                    for combination in product(*expansions)
+                ]
+            return [conjunction for expansion in expansions for conjunction in expansion]
+
+        case _:
+            return [[not_(condition) if negated else condition]]
+
+
+def _operands(connector: Expression) -> list[Expression]:
+    return list(connector.flatten())  # type: ignore[no-untyped-call]
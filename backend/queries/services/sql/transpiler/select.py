@@ -58,7 +58,8 @@ def _transpile_having(
     scope: SelectScope, subquery: RAQuery, aggregates: dict[AggregateFunction, str]
 ) -> RAQuery:
     if scope.having:
-        condition: Expression = scope.having.this
+        # Scopes are shared between pipeline stages, so rewrite a copy of the condition
+        condition: Expression = scope.having.this.copy()
         aggregate_exprs: Iterator[AggregateFunction] = condition.find_all(*aggregate_functions)
         for aggregate in aggregate_exprs:
             aggregate.replace(column(aggregates[aggregate]))
@@ -1,4 +1,5 @@
 from collections.abc import Callable
+from functools import reduce
 
 from queries.services.ra.ast import (
     Attribute,
@@ -8,7 +9,7 @@ from queries.services.ra.ast import (
     natural_join,
     unnest_cartesian_operands,
 )
-from sqlglot.expressions import And, Exists, Expression, Not, and_
+from sqlglot.expressions import And, Exists, Expression, Not, Or, Paren, Select, and_, not_
 
 from ..scope.query import SelectScope
 from .context import ContextRelationInferrer
@@ -24,7 +25,14 @@ class WhereTranspiler:
     def transpile(self, join_query: RAQuery) -> RAQuery:
         assert self.scope.where  # noqa: S101
 
-        subquery_free, exists, not_exists = self._split_condition(self.scope.where.this)
+        condition = self.scope.where.this
+        subquery_free, _, _ = self._split_condition(condition)
+        if subquery_free and subquery_free.find(Select):
+            return self._transpile_nested(join_query, condition)
+        return self._transpile_conjunction(join_query, condition)
+
+    def _transpile_conjunction(self, join_query: RAQuery, condition: Expression) -> RAQuery:
+        subquery_free, exists, not_exists = self._split_condition(condition)
 
         context_relations, parameters = (
             ContextRelationInferrer(self.scope).infer(subquery_free) if subquery_free else ([], [])
@@ -58,6 +66,65 @@ class WhereTranspiler:
 
         return result
 
+    def _transpile_nested(self, join_query: RAQuery, condition: Expression) -> RAQuery:
+        """Rows of ``join_query`` satisfying ``condition``, whose subqueries are nested in ORs.
+
+        Conditions too large to be expanded into one select per conjunction of their DNF are
+        translated operand by operand instead: the rows satisfying an OR are the union of those
+        satisfying its operands, and the rows satisfying an AND their intersection. Each operand
+        is a conjunction whose subqueries are decorrelated into semi- and anti-joins.
+        """
+        context_relations, parameters = ContextRelationInferrer(self.scope).infer(condition)
+        context_relations = list(dict.fromkeys(context_relations))
+        parameters = list(dict.fromkeys(parameters))
+        # Operands are projected to the same attributes, so their rows can be combined
+        attributes = [
+            Attribute(name=name, relation=table)
+            for table, columns in self.scope.tables.get_schema().items()
+            for name in columns
+        ] + parameters
+
+        def transpile_operand(operand: Expression) -> RAQuery:
+            result = self._transpile_conjunction(join_query, operand)
+            own_relations, _ = ContextRelationInferrer(self.scope).infer(operand)
+            missing = [relation for relation in context_relations if relation not in own_relations]
+            return cartesian([result, *missing]).project(*attributes)
+
+        def transpile(condition: Expression, negated: bool) -> RAQuery:
+            match condition:
+                case Paren():
+                    return transpile(condition.this, negated)
+
+                case Not() if not isinstance(condition.this.unnest(), Exists):
+                    return transpile(condition.this, not negated)
+
+                case And() | Or() if condition.find(Select):
+                    operands = list(condition.flatten())  # type: ignore[no-untyped-call]
+                    if isinstance(condition, And) != negated:
+                        # Predicates and subqueries are kept in a single conjunction
+                        atoms = [
+                            _literal(operand, negated) for operand in operands if _is_atom(operand)
+                        ]
+                        results = [transpile_operand(and_(*atoms))] if atoms else []
+                        results += [
+                            transpile(operand, negated)
+                            for operand in operands
+                            if not _is_atom(operand)
+                        ]
+                        return reduce(lambda left, right: left.intersect(right), results)
+                    return reduce(
+                        lambda left, right: left.union(right),
+                        [transpile(operand, negated) for operand in operands],
+                    )
+
+                case _:
+                    return transpile_operand(_literal(condition, negated))
+
+        result = transpile(condition, negated=False)
+        # Transpiling each operand replaced the parameters with its own
+        self.parameters = parameters
+        return result
+
     def _split_condition(
         self, condition: Expression
     ) -> tuple[Expression | None, list[Exists], list[Exists]]:
@@ -101,3 +168,17 @@ class WhereTranspiler:
             subquery.project(*parameters) for subquery, _, parameters in transpiled_exists
         ]
         return join(relations) if relations else None
+
+
+def _is_atom(condition: Expression) -> bool:
+    condition = condition.unnest()  # type: ignore[no-untyped-call]
+    if isinstance(condition, Not):
+        condition = condition.this.unnest()
+    return isinstance(condition, Exists) or not condition.find(Select)
+
+
+def _literal(condition: Expression, negated: bool) -> Expression:
+    condition = condition.unnest()  # type: ignore[no-untyped-call]
+    if isinstance(condition, Not) and isinstance(inner := condition.this.unnest(), Exists):
+        return inner if negated else not_(inner)
+    return not_(condition) if negated else condition
@@ -1,12 +1,19 @@
+import sqlite3
+
+from django.conf import settings
+
 from databases.models import Database
-from databases.services.execution import execute_sql
+from databases.services.circuit_breaker import DatabaseUnavailableError
+from databases.services.explain import explain_sql
 from queries.services.sql.parser import parse_sql
 from queries.types import QueryError
 from queries.utils.tokens import to_error_position
 from sqlalchemy.exc import SQLAlchemyError
 from sqlglot.errors import ParseError, SqlglotError
 
-from ..types import SQLQuery, to_relational_schema
+from ..admission import cache_plan_estimate
+from ..types import RelationalSchema, SQLQuery, to_relational_schema
+from .catalog import get_catalog
 from .semantics import validate_sql_semantics
 
 
@@ -45,8 +52,8 @@ def validate_sql(query_text: str, db: Database) -> tuple[SQLQuery | None, list[Q
         return tree, semantic_errors
 
     try:
-        execute_sql(f'EXPLAIN {query_text}', db.connection_info)
-    except SQLAlchemyError as e:
+        _explain(query_text, tree, schema, db)
+    except (SQLAlchemyError, sqlite3.Error) as e:
         explain_error: QueryError = {
             'title': 'Error during EXPLAIN',
             'description': str(e),
@@ -54,3 +61,19 @@ def validate_sql(query_text: str, db: Database) -> tuple[SQLQuery | None, list[Q
         return tree, [explain_error]
 
     return tree, []
+
+
+def _explain(query_text: str, tree: SQLQuery, schema: RelationalSchema, db: Database) -> None:
+    if settings.SQL_VALIDATION_MODE != 'catalog':  # type: ignore[misc]
+        try:
+            estimate = explain_sql(query_text, db.execution_connection_info)
+        except DatabaseUnavailableError:
+            # The query is planned locally instead while the target database is down
+            pass
+        else:
+            # Kept for admission control when the query is executed
+            if estimate is not None:
+                cache_plan_estimate(tree.sql(), db, estimate)
+            return
+
+    get_catalog(schema).explain(tree)
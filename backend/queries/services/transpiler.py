@@ -4,9 +4,10 @@ from queries.models import AbstractQuery as Query
 from queries.models import Language
 
 from .ra.ast import RAQuery
+from .ra.compilation import compilation_key, compile_cached
 from .ra.transpiler import RAtoSQLTranspiler
 from .sql.transpiler import SQLtoRATranspiler
-from .types import SQLQuery, to_relational_schema
+from .types import SQLQuery, schema_fingerprint, to_relational_schema
 
 
 def transpile_query(query: Query) -> str | None:
@@ -19,4 +20,8 @@ def transpile_query(query: Query) -> str | None:
             return SQLtoRATranspiler(schema).transpile(cast(SQLQuery, query.ast)).latex()
 
         case Language.RA:
-            return RAtoSQLTranspiler(schema).transpile(cast(RAQuery, query.ast)).sql(pretty=True)
+            ast = cast(RAQuery, query.ast)
+            key = compilation_key(ast, schema_fingerprint(schema), bag=False, target='display')
+            return compile_cached(
+                key, lambda: RAtoSQLTranspiler(schema).transpile(ast).sql(pretty=True)
+            )
@@ -1,9 +1,11 @@
+import hashlib
 from collections import defaultdict
+from collections.abc import Mapping
 
 import queries.services.ra.ast as ra
 import sqlglot.expressions as sql
 from bidict import bidict
-from databases.types import Columns, Schema
+from databases.types import Columns, Schema, TableSizes
 from query_cod.types import DataType
 from sqlglot.expressions import DataType as SQLGlotDataType
 from sqlglot.expressions import Query
@@ -16,17 +18,25 @@ AttributeName = str
 Attributes = dict[AttributeName, DataType]
 RelationalSchema = dict[RelationName | None, Attributes]
 
+# Schemas derived during inference share their attribute mappings with the schemas they are
+# derived from, so attribute mappings are read-only and replaced rather than modified
+AttributesView = Mapping[AttributeName, DataType]
+SchemaView = Mapping[RelationName | None, AttributesView]
+SharedSchema = dict[RelationName | None, AttributesView]
+PrimaryKeys = dict[RelationName, frozenset[AttributeName]]
 
-def merge_common_column(result_schema: RelationalSchema, col: str) -> None:
+
+def merge_common_column(result_schema: SharedSchema, col: str) -> None:
     types = []
-    for schema in result_schema.values():
-        if col in schema:
-            types.append(schema.pop(col))
+    for relation, attributes in list(result_schema.items()):
+        if col in attributes:
+            types.append(attributes[col])
+            result_schema[relation] = {a: t for a, t in attributes.items() if a != col}
     if types:
-        result_schema.setdefault(None, {})[col] = DataType.dominant(types)
+        result_schema[None] = {**result_schema.get(None, {}), col: DataType.dominant(types)}
 
 
-def flatten(schema: RelationalSchema) -> Attributes:
+def flatten(schema: SchemaView) -> Attributes:
     column_types = defaultdict(list)
     for attributes in schema.values():
         for col, t in attributes.items():
@@ -39,6 +49,22 @@ def flatten(schema: RelationalSchema) -> Attributes:
     return flat_schema
 
 
+def schema_fingerprint(schema: SchemaView) -> str:
+    """Stable digest of a relational schema, independent of key order."""
+    relations = sorted(
+        (name or '', sorted((attribute, t.value) for attribute, t in attributes.items()))
+        for name, attributes in schema.items()
+    )
+    return hashlib.blake2b(repr(relations).encode(), digest_size=16).hexdigest()
+
+
+def statistics_fingerprint(primary_keys: PrimaryKeys, table_sizes: TableSizes) -> str:
+    """Stable digest of the keys and sizes of a database's tables."""
+    keys = sorted((name, sorted(key)) for name, key in primary_keys.items())
+    sizes = sorted(table_sizes.items())
+    return hashlib.blake2b(repr((keys, sizes)).encode(), digest_size=16).hexdigest()
+
+
 def to_relational_schema(schema: Schema) -> RelationalSchema:
     return {name: _columns_to_attributes(columns) for name, columns in schema.items()}
 
@@ -47,6 +73,14 @@ def _columns_to_attributes(columns: Columns) -> Attributes:
     return {name: col['type'] for name, col in columns.items()}
 
 
+def to_primary_keys(schema: Schema) -> PrimaryKeys:
+    keys = {
+        name: frozenset(col_name for col_name, col in columns.items() if col['primary_key'])
+        for name, columns in schema.items()
+    }
+    return {name: key for name, key in keys.items() if key}
+
+
 def _data_type_to_sqlglot_type(data_type: DataType) -> SQLGlotDataType:
     match data_type:
         case DataType.SMALLINT:
@@ -1,4 +1,5 @@
-from collections.abc import Callable
+import sqlite3
+from collections.abc import Callable, Iterator
 from typing import Any
 
 import pytest
@@ -70,5 +71,41 @@ def assert_equivalent(
     return _assert_equivalent
 
 
+@pytest.fixture
+def sqlite(
+    schema: RelationalSchema, data: dict[str, list[dict[str, Any]]]
+) -> Iterator[sqlite3.Connection]:
+    conn = sqlite3.connect(':memory:')
+    for table, attributes in schema.items():
+        columns = ', '.join(str(attribute) for attribute in attributes)
+        placeholders = ', '.join('?' for _ in attributes)
+        conn.execute(f'CREATE TABLE {table} ({columns})')
+        conn.executemany(
+            f'INSERT INTO {table} VALUES ({placeholders})',  # noqa: S608
+            [[row[attribute] for attribute in attributes] for row in data[str(table)]],
+        )
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def assert_equivalent_in_sqlite(
+    schema: RelationalSchema, sqlite: sqlite3.Connection
+) -> Callable[..., None]:
+    """Like ``assert_equivalent``, for queries beyond what the sqlglot executor supports."""
+
+    def _assert_equivalent(ra_ast: RAQuery, expected_sql: str, **options: Any) -> None:
+        sql = RAtoSQLTranspiler(schema, **options).transpile(ra_ast).sql(dialect='sqlite')
+        print(sql)
+        assert _fetch(sqlite, sql) == _fetch(sqlite, expected_sql)
+
+    return _assert_equivalent
+
+
+def _fetch(conn: sqlite3.Connection, sql: str) -> tuple[list[str], list[tuple[Any, ...]]]:
+    cursor = conn.execute(sql)
+    return [column[0] for column in cursor.description], sorted(cursor.fetchall())
+
+
 def _tables_equal(t1: Table, t2: Table) -> bool:
     return t1.columns == t2.columns and t1.rows == t2.rows
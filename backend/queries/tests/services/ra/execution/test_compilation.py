@@ -0,0 +1,106 @@
+from unittest.mock import Mock
+
+from django.core.cache import caches
+from django.test import override_settings
+
+import pytest
+from common.utils.lru import LRUCache
+from queries.services.ra import compilation
+from queries.services.ra.ast import GT, RAQuery, Relation, attribute
+from queries.services.ra.compilation import (
+    compilation_cache_stats,
+    compilation_key,
+    compile_cached,
+)
+from redis import RedisError
+
+
+QUERY = Relation('employee').select(GT(attribute('age'), 30)).project('name')
+
+
+@pytest.fixture(autouse=True)
+def compiled(monkeypatch: pytest.MonkeyPatch) -> LRUCache[str, str]:
+    cache: LRUCache[str, str] = LRUCache(maxsize=2)
+    monkeypatch.setattr(compilation, '_compiled', cache)
+    return cache
+
+
+def test_equal_queries_share_key() -> None:
+    same = Relation('employee').select(GT(attribute('age'), 30)).project('name')
+
+    assert compilation_key(QUERY, 'schema', False, 'display') == compilation_key(
+        same, 'schema', False, 'display'
+    )
+
+
+@pytest.mark.parametrize(
+    'other',
+    [
+        (Relation('employee').project('name'), 'schema', False, 'display'),
+        (QUERY, 'other', False, 'display'),
+        (QUERY, 'schema', True, 'display'),
+        (QUERY, 'schema', False, 'execution'),
+    ],
+)
+def test_key_depends_on_query_schema_bag_and_target(other: tuple[RAQuery, str, bool, str]) -> None:
+    assert compilation_key(QUERY, 'schema', False, 'display') != compilation_key(*other)
+
+
+def test_cached_sql_is_not_recompiled() -> None:
+    compile_ = Mock(return_value='SELECT 1')
+
+    assert compile_cached('key', compile_) == 'SELECT 1'
+    assert compile_cached('key', compile_) == 'SELECT 1'
+
+    compile_.assert_called_once()
+    assert compilation_cache_stats() == {
+        'size': 1,
+        'maxsize': 2,
+        'hits': 1,
+        'misses': 1,
+        'evictions': 0,
+    }
+
+
+def test_least_recently_used_sql_is_evicted() -> None:
+    for key in ['a', 'b', 'a', 'c']:
+        compile_cached(key, Mock(return_value=key))
+
+    compile_ = Mock(return_value='b')
+    compile_cached('b', compile_)
+
+    compile_.assert_called_once()
+    assert compilation_cache_stats()['evictions'] == 2
+
+
+@override_settings(
+    CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'compilation': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    }
+)
+def test_shared_cache_is_used_across_processes(compiled: LRUCache[str, str]) -> None:
+    caches['compilation'].set('key', 'SELECT 1')
+    compile_ = Mock()
+
+    assert compile_cached('key', compile_) == 'SELECT 1'
+    compile_.assert_not_called()
+
+    compiled.clear()
+    compile_cached('other', Mock(return_value='SELECT 2'))
+    assert caches['compilation'].get('other') == 'SELECT 2'
+
+
+def test_sql_is_compiled_locally_while_shared_cache_is_down(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    shared = Mock(**{'get.side_effect': RedisError, 'set.side_effect': RedisError})
+    monkeypatch.setattr(compilation, '_shared_cache', lambda: shared)
+
+    assert compile_cached('key', Mock(return_value='SELECT 1')) == 'SELECT 1'
+    shared.set.assert_not_called()
+
+    shared.get.side_effect = None
+    shared.get.return_value = None
+    assert compile_cached('other', Mock(return_value='SELECT 2')) == 'SELECT 2'
+    shared.set.assert_called_once_with('other', 'SELECT 2')
@@ -2,11 +2,18 @@ from collections.abc import Callable
 
 import pytest
 from queries.services.ra.ast import (
+    EQ,
     RAQuery,
     Relation,
+    attribute,
 )
+from queries.services.ra.optimiser.cardinality import CardinalityEstimator
+from queries.services.ra.transpiler import RAtoSQLTranspiler
+from queries.services.ra.transpiler.division import DivisionStrategy, choose_division_strategy
+from queries.services.types import RelationalSchema
 
 
+@pytest.mark.parametrize('strategy', list(DivisionStrategy))
 @pytest.mark.parametrize(
     'ra_ast, expected_sql',
     [
@@ -26,9 +33,110 @@ from queries.services.ra.ast import (
             )
             """,
         ),
+        # Base table dividend
+        (
+            Relation('rotation').divide(Relation('department').project('dept_id')),
+            'SELECT employee_id FROM rotation WHERE employee_id <> 2 GROUP BY employee_id',
+        ),
+        # Empty divisor
+        (
+            Relation('rotation').divide(
+                Relation('department')
+                .select(EQ(attribute('dept_name'), 'Sales'))
+                .project('dept_id')
+            ),
+            'SELECT DISTINCT employee_id FROM rotation',
+        ),
+        # Divisor with several attributes
+        (
+            Relation('employee').divide(
+                Relation('employee').select(EQ(attribute('id'), 1)).project('dept_id', 'senior')
+            ),
+            'SELECT id, name, age FROM employee WHERE dept_id = 1 AND NOT senior',
+        ),
+        # Quotient extended by a cartesian product
+        (
+            Relation('rotation')
+            .divide(Relation('department').project('dept_id'))
+            .cartesian('department'),
+            """
+            SELECT *
+            FROM (SELECT DISTINCT employee_id FROM rotation WHERE employee_id <> 2)
+            CROSS JOIN department
+            """,
+        ),
+        # Quotient on the right of a cartesian product
+        (
+            Relation('department').cartesian(
+                Relation('rotation').divide(Relation('department').project('dept_id'))
+            ),
+            """
+            SELECT *
+            FROM department
+            CROSS JOIN (SELECT DISTINCT employee_id FROM rotation WHERE employee_id <> 2)
+            """,
+        ),
+        # Quotient joined with the dividend
+        (
+            Relation('rotation')
+            .divide(Relation('department').project('dept_id'))
+            .natural_join('rotation'),
+            'SELECT employee_id, dept_id FROM rotation WHERE employee_id <> 2',
+        ),
+        # Quotient joined on a condition
+        (
+            Relation('rotation')
+            .divide(Relation('department').project('dept_id'))
+            .theta_join(Relation('employee'), EQ(attribute('employee_id'), attribute('id'))),
+            """
+            SELECT employee_id, employee.*
+            FROM (SELECT DISTINCT employee_id FROM rotation WHERE employee_id <> 2)
+            INNER JOIN employee ON employee_id = id
+            """,
+        ),
     ],
 )
 def test_division_execution(
-    ra_ast: RAQuery, expected_sql: str, assert_equivalent: Callable[[RAQuery, str], None]
+    ra_ast: RAQuery,
+    expected_sql: str,
+    strategy: DivisionStrategy,
+    assert_equivalent_in_sqlite: Callable[..., None],
+) -> None:
+    assert_equivalent_in_sqlite(ra_ast, expected_sql, division=strategy)
+
+
+@pytest.mark.parametrize(
+    'dividend_rows, divisor_rows, divisor_attributes, expected',
+    [
+        (None, 2, 1, DivisionStrategy.NOT_EXISTS),
+        (5, 2, 1, DivisionStrategy.NOT_EXISTS),
+        (100_000, 50, 1, DivisionStrategy.COUNT),
+        (100_000, 50, 2, DivisionStrategy.JOIN),
+    ],
+)
+def test_division_strategy_is_chosen_from_estimates(
+    dividend_rows: float | None,
+    divisor_rows: float | None,
+    divisor_attributes: int,
+    expected: DivisionStrategy,
 ) -> None:
-    assert_equivalent(ra_ast, expected_sql)
+    assert choose_division_strategy(dividend_rows, divisor_rows, divisor_attributes) == expected
+
+
+def test_cardinality_is_estimated_from_table_sizes() -> None:
+    estimator = CardinalityEstimator({'rotation': 300, 'department': 3})
+
+    assert estimator.estimate(Relation('rotation').select(EQ(attribute('dept_id'), 1))) == 100
+    assert estimator.estimate(Relation('rotation').divide('department')) == 100
+    assert estimator.estimate(Relation('rotation').natural_join('employee')) is None
+
+
+def test_large_division_is_transpiled_with_grouping(schema: RelationalSchema) -> None:
+    transpiler = RAtoSQLTranspiler(schema, table_sizes={'rotation': 100_000, 'department': 50})
+
+    sql = transpiler.transpile(
+        Relation('rotation').divide(Relation('department').project('dept_id'))
+    )
+
+    assert 'GROUP BY' in sql.sql()
+    assert 'NOT EXISTS' not in sql.sql()
@@ -0,0 +1,104 @@
+from typing import Any
+
+import pytest
+from queries.services.ra.ast import (
+    EQ,
+    GT,
+    Aggregation,
+    AggregationFunction,
+    RAQuery,
+    Relation,
+    attribute,
+)
+from queries.services.ra.transpiler import RAtoSQLTranspiler
+from queries.services.types import RelationalSchema, to_sqlglot_schema
+from sqlglot.executor import execute
+
+
+@pytest.fixture
+def transpiler(schema: RelationalSchema) -> RAtoSQLTranspiler:
+    return RAtoSQLTranspiler(schema, flatten=True)
+
+
+def _run(
+    transpiler: RAtoSQLTranspiler,
+    query: RAQuery,
+    schema: RelationalSchema,
+    data: dict[str, list[dict[str, Any]]],
+) -> tuple[tuple[str, ...], list[tuple[Any, ...]]]:
+    sql = transpiler.transpile(query)
+    table = execute(sql, tables=data, schema=to_sqlglot_schema(schema))
+    return table.columns, sorted(table.rows, key=repr)
+
+
+DIVIDEND = Relation('rotation').select(GT(attribute('employee_id'), 1))
+MAX_AGE = Relation('employee').grouped_aggregation(
+    ['dept_id'], [Aggregation(attribute('age'), AggregationFunction.MAX, 'oldest')]
+)
+
+
+@pytest.mark.parametrize(
+    'ra_ast',
+    [
+        DIVIDEND.divide(Relation('department').project('dept_id')),
+        Relation('employee').natural_join(
+            Relation('department').select(EQ(attribute('dept_name'), 'HR')).rename('d')
+        ),
+        Relation('employee').select(GT(attribute('age'), 25)).rename('e').project('e.name'),
+        MAX_AGE.select(GT(attribute('oldest'), 30)),
+        MAX_AGE.top_n(1, 'oldest').select(GT(attribute('oldest'), 30)),
+        DIVIDEND.project('employee_id').union(DIVIDEND.project('employee_id')),
+        Relation('employee')
+        .select(GT(attribute('dept_id'), 0))
+        .rename('e')
+        .cartesian('department'),
+    ],
+)
+def test_flattened_query_is_equivalent(
+    ra_ast: RAQuery,
+    transpiler: RAtoSQLTranspiler,
+    schema: RelationalSchema,
+    data: dict[str, list[dict[str, Any]]],
+) -> None:
+    assert _run(transpiler, ra_ast, schema, data) == _run(
+        RAtoSQLTranspiler(schema), ra_ast, schema, data
+    )
+
+
+def test_repeated_dividend_is_shared(transpiler: RAtoSQLTranspiler) -> None:
+    sql = transpiler.transpile(DIVIDEND.divide(Relation('department').project('dept_id'))).sql()
+
+    assert sql.startswith('WITH shared_1 AS (SELECT * FROM rotation WHERE employee_id > 1) ')
+    assert sql.count('FROM rotation') == 1
+
+
+def test_rename_of_selection_is_folded(transpiler: RAtoSQLTranspiler) -> None:
+    ra_ast = Relation('employee').select(GT(attribute('employee.age'), 25)).rename('e')
+
+    assert transpiler.transpile(ra_ast).sql() == 'SELECT * FROM employee AS e WHERE e.age > 25'
+
+
+def test_folded_rename_qualifies_its_columns(transpiler: RAtoSQLTranspiler) -> None:
+    ra_ast = (
+        Relation('employee').select(GT(attribute('dept_id'), 0)).rename('e').cartesian('department')
+    )
+
+    assert transpiler.transpile(ra_ast).sql() == (
+        'SELECT * FROM employee AS e CROSS JOIN department WHERE e.dept_id > 0'
+    )
+
+
+def test_renamed_join_operand_is_aliased_once(transpiler: RAtoSQLTranspiler) -> None:
+    ra_ast = Relation('employee').natural_join(
+        Relation('department').project('dept_id').rename('d')
+    )
+
+    assert transpiler.transpile(ra_ast).sql() == (
+        'SELECT * FROM employee NATURAL JOIN (SELECT DISTINCT dept_id FROM department) AS d'
+    )
+
+
+def test_selection_on_aggregate_uses_having(transpiler: RAtoSQLTranspiler) -> None:
+    assert transpiler.transpile(MAX_AGE.select(GT(attribute('oldest'), 30))).sql() == (
+        'SELECT dept_id, MAX(age) AS oldest FROM employee GROUP BY dept_id HAVING MAX(age) > 30'
+    )
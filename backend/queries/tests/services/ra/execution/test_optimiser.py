@@ -0,0 +1,199 @@
+from typing import Any
+
+import pytest
+from queries.services.ra.ast import (
+    EQ,
+    GT,
+    LT,
+    Aggregation,
+    AggregationFunction,
+    And,
+    Or,
+    Projection,
+    RAQuery,
+    Relation,
+    Rename,
+    Selection,
+    SetOperator,
+    ThetaJoin,
+    attribute,
+)
+from queries.services.ra.optimiser import RAOptimiser, UniqueProjection
+from queries.services.ra.transpiler import RAtoSQLTranspiler
+from queries.services.types import PrimaryKeys, RelationalSchema, to_sqlglot_schema
+from sqlglot.executor import execute
+
+
+@pytest.fixture
+def primary_keys() -> PrimaryKeys:
+    return {
+        'department': frozenset({'dept_id'}),
+        'employee': frozenset({'id'}),
+        'rotation': frozenset({'employee_id', 'dept_id'}),
+    }
+
+
+@pytest.fixture
+def optimiser(schema: RelationalSchema, primary_keys: PrimaryKeys) -> RAOptimiser:
+    return RAOptimiser(schema, primary_keys)
+
+
+def _run(
+    query: RAQuery, schema: RelationalSchema, data: dict[str, list[dict[str, Any]]]
+) -> tuple[tuple[str, ...], list[tuple[Any, ...]]]:
+    sql = RAtoSQLTranspiler(schema).transpile(query)
+    table = execute(sql, tables=data, schema=to_sqlglot_schema(schema))
+    return table.columns, sorted(table.rows, key=repr)
+
+
+@pytest.mark.parametrize(
+    'ra_ast',
+    [
+        Relation('employee')
+        .cartesian('department')
+        .select(
+            And(
+                EQ(attribute('employee.dept_id'), attribute('department.dept_id')),
+                GT(attribute('age'), 25),
+            )
+        )
+        .project('name', 'dept_name'),
+        Relation('employee')
+        .natural_join('department')
+        .select(And(EQ(attribute('dept_name'), 'HR'), GT(attribute('age'), 25)))
+        .project('name'),
+        Relation('employee')
+        .natural_join(Relation('department').rename('d'))
+        .select(EQ(attribute('d.dept_name'), 'Engineering')),
+        Relation('employee')
+        .theta_join(
+            Relation('department'),
+            EQ(attribute('employee.dept_id'), attribute('department.dept_id')),
+        )
+        .select(Or(GT(attribute('age'), 35), EQ(attribute('dept_name'), 'Engineering')))
+        .select(LT(attribute('id'), 3)),
+        Relation('employee').semi_join('rotation').select(GT(attribute('age'), 25)),
+        Relation('employee').project('id', 'name', 'age').project('name', 'id'),
+        Relation('employee').rename('e').rename('staff').project('staff.name'),
+        Relation('rotation').project('dept_id'),
+        Relation('employee')
+        .grouped_aggregation(
+            ['dept_id'], [Aggregation(attribute('age'), AggregationFunction.MAX, 'oldest')]
+        )
+        .natural_join('department')
+        .select(GT(attribute('oldest'), 30))
+        .project('dept_name', 'oldest'),
+        Relation('employee')
+        .top_n(2, 'age')
+        .cartesian('department')
+        .select(EQ(attribute('name'), 'Alice')),
+        Relation('employee').project('id', 'name').cartesian('department'),
+        Relation('employee')
+        .project('id', 'name')
+        .cartesian('department')
+        .project('name', 'dept_name'),
+        Relation('employee')
+        .project('id', 'dept_id')
+        .theta_join(
+            Relation('department'),
+            EQ(attribute('employee.dept_id'), attribute('department.dept_id')),
+        )
+        .project('id'),
+    ],
+)
+def test_optimised_query_is_equivalent(
+    ra_ast: RAQuery,
+    optimiser: RAOptimiser,
+    schema: RelationalSchema,
+    data: dict[str, list[dict[str, Any]]],
+) -> None:
+    assert _run(optimiser.optimise(ra_ast), schema, data) == _run(ra_ast, schema, data)
+
+
+def test_selection_over_cartesian_becomes_theta_join(optimiser: RAOptimiser) -> None:
+    condition = EQ(attribute('employee.dept_id'), attribute('department.dept_id'))
+    ra_ast = Relation('employee').cartesian('department').select(condition)
+
+    assert optimiser.optimise(ra_ast) == ThetaJoin(
+        Relation('employee'), Relation('department'), condition
+    )
+
+
+def test_selection_is_pushed_below_join(optimiser: RAOptimiser) -> None:
+    age = GT(attribute('age'), 25)
+    dept_name = EQ(attribute('dept_name'), 'HR')
+    ra_ast = Relation('employee').natural_join('department').select(And(age, dept_name))
+
+    assert optimiser.optimise(ra_ast) == (
+        Relation('employee')
+        .select(age)
+        .natural_join(Relation('department').select(dept_name).rename('department'))
+    )
+
+
+def test_selection_is_not_pushed_below_top_n(optimiser: RAOptimiser) -> None:
+    ra_ast = (
+        Relation('employee')
+        .top_n(2, 'age')
+        .cartesian('department')
+        .select(EQ(attribute('name'), 'Alice'))
+    )
+
+    optimised = optimiser.optimise(ra_ast)
+
+    assert isinstance(optimised, ThetaJoin)
+    assert optimised.left == Relation('employee').top_n(2, 'age')
+
+
+def test_consecutive_projections_and_renames_are_merged(optimiser: RAOptimiser) -> None:
+    ra_ast = Projection(
+        Projection(Rename(Rename(Relation('employee'), 'e'), 'staff'), [attribute('name')]),
+        [attribute('name')],
+    )
+
+    assert optimiser.optimise(ra_ast) == Projection(
+        Rename(Relation('employee'), 'staff'), [attribute('name')]
+    )
+
+
+def test_projections_keeping_a_key_are_unique(optimiser: RAOptimiser) -> None:
+    assert isinstance(optimiser.optimise(Relation('employee').project('id')), UniqueProjection)
+    assert isinstance(
+        optimiser.optimise(Relation('employee').natural_join('department').project('id')),
+        UniqueProjection,
+    )
+    assert not isinstance(
+        optimiser.optimise(Relation('rotation').project('dept_id')), UniqueProjection
+    )
+
+
+def test_unique_projection_is_transpiled_without_distinct(
+    optimiser: RAOptimiser, schema: RelationalSchema
+) -> None:
+    optimised = optimiser.optimise(Relation('employee').project('id', 'name'))
+
+    assert RAtoSQLTranspiler(schema).transpile(optimised).sql() == 'SELECT id, name FROM employee'
+
+
+def test_unique_projection_joined_on_keeps_its_columns_and_rows(
+    optimiser: RAOptimiser, schema: RelationalSchema, data: dict[str, list[dict[str, Any]]]
+) -> None:
+    optimised = optimiser.optimise(
+        Relation('employee').project('id', 'name').cartesian('department')
+    )
+
+    columns, rows = _run(optimised, schema, data)
+
+    assert columns == ('id', 'name', 'dept_id', 'dept_name')
+    assert len(rows) == len(set(rows)) == len(data['employee']) * len(data['department'])
+
+
+def test_original_query_is_unchanged(optimiser: RAOptimiser) -> None:
+    ra_ast = Relation('employee').cartesian('department').select(GT(attribute('age'), 25))
+    original = str(ra_ast)
+
+    optimiser.optimise(ra_ast)
+
+    assert isinstance(ra_ast, Selection)
+    assert isinstance(ra_ast.operand, SetOperator)
+    assert str(ra_ast) == original
@@ -0,0 +1,62 @@
+import sqlite3
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import override_settings
+
+import pytest
+from databases.models import Database
+from queries.services.sql.catalog import Catalog, get_catalog
+from queries.services.sql.parser import parse_sql
+from queries.services.sql.validation import validate_sql
+from queries.services.types import RelationalSchema
+from query_cod.types import DataType
+
+
+SCHEMA: RelationalSchema = {
+    'employee': {'id': DataType.INTEGER, 'name': DataType.VARCHAR, 'dept_id': DataType.INTEGER},
+    'department': {'id': DataType.INTEGER, 'name': DataType.VARCHAR},
+}
+
+
+def test_catalog_plans_valid_query() -> None:
+    query = parse_sql(
+        'SELECT e.name, COUNT(*) FROM employee e JOIN department d ON e.dept_id = d.id '
+        "WHERE d.name ILIKE 'r%' GROUP BY e.name"
+    )
+
+    Catalog(SCHEMA).explain(query)
+
+
+def test_catalog_rejects_unknown_column() -> None:
+    with pytest.raises(sqlite3.Error, match='no such column'):
+        Catalog(SCHEMA).explain(parse_sql('SELECT salary FROM employee'))
+
+
+def test_catalog_is_reused_for_equal_schemas() -> None:
+    assert get_catalog(SCHEMA) is get_catalog(dict(reversed(SCHEMA.items())))
+
+
+@override_settings(SQL_VALIDATION_MODE='catalog')
+def test_catalog_validation_does_not_query_target() -> None:
+    db = Database(id=3, database_type=Database.DatabaseType.POSTGRESQL)
+    cache.set(
+        f'database_schema_{db.id}',
+        {
+            'employee': {
+                'id': {
+                    'type': DataType.INTEGER,
+                    'nullable': False,
+                    'primary_key': True,
+                    'references': None,
+                }
+            }
+        },
+    )
+
+    with patch('queries.services.sql.validation.explain_sql') as mock_explain:
+        tree, errors = validate_sql('SELECT id FROM employee', db)
+
+    mock_explain.assert_not_called()
+    assert tree is not None
+    assert errors == []
@@ -0,0 +1,58 @@
+from queries.services.sql.parser import parse_sql
+from queries.services.sql.scope.builder import build_scope
+from queries.services.sql.semantics import validate_sql_semantics
+from queries.services.sql.transpiler import SQLtoRATranspiler
+from queries.services.sql.transpiler.normaliser import alias_tables
+from queries.services.types import RelationalSchema
+from query_cod.types import DataType
+
+
+schema: RelationalSchema = {
+    'employee': {
+        'id': DataType.INTEGER,
+        'name': DataType.VARCHAR,
+        'dept_id': DataType.INTEGER,
+    },
+    'department': {
+        'dept_id': DataType.INTEGER,
+        'dept_name': DataType.VARCHAR,
+    },
+}
+
+
+def test_scope_is_shared_between_equal_queries() -> None:
+    query = 'SELECT name FROM employee WHERE dept_id IN (SELECT dept_id FROM department)'
+
+    scope = build_scope(parse_sql(query), schema)
+
+    assert build_scope(parse_sql(query), dict(reversed(schema.items()))) is scope
+
+
+def test_scope_is_rebuilt_for_rewritten_queries() -> None:
+    query = parse_sql('SELECT * FROM employee, employee')
+
+    scope = build_scope(query, schema)
+
+    assert build_scope(alias_tables(query), schema) is not scope
+    assert build_scope(query, {'employee': schema['employee']}) is not scope
+
+
+def test_scope_is_not_shared_between_queries_with_equal_hashes() -> None:
+    query = parse_sql('SELECT name FROM employee')
+    other = parse_sql('SELECT dept_name FROM department')
+    other._hash = hash(query)
+
+    scope = build_scope(query, schema)
+
+    assert build_scope(other, schema) is not scope
+    assert build_scope(other, schema).query.sql() == 'SELECT dept_name FROM department'
+
+
+def test_transpilation_does_not_modify_shared_scope() -> None:
+    query = parse_sql('SELECT dept_id FROM employee GROUP BY dept_id HAVING COUNT(id) > 10')
+    assert validate_sql_semantics(query, schema) == []
+
+    SQLtoRATranspiler(schema).transpile(query)
+
+    assert query.sql() == 'SELECT dept_id FROM employee GROUP BY dept_id HAVING COUNT(id) > 10'
+    assert build_scope(query, schema).query == query
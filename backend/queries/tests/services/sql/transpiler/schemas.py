@@ -1,7 +1,8 @@
+from queries.services.types import RelationalSchema
 from query_cod.types import DataType
 
 
-movies_schema = {
+movies_schema: RelationalSchema = {
     'Movie': {
         'title': DataType.VARCHAR,
         'year': DataType.INTEGER,
@@ -34,7 +35,7 @@ movies_schema = {
     },
 }
 
-schema = {
+schema: RelationalSchema = {
     'R': {
         'A': DataType.INTEGER,
         'B': DataType.INTEGER,
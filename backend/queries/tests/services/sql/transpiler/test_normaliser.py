@@ -1,7 +1,9 @@
 import pytest
 from queries.services.sql.parser import parse_sql
 from queries.services.sql.transpiler.normaliser import (
+    MAX_DNF_CONJUNCTIONS,
     alias_tables,
+    estimate_dnf_size,
     normalise_conditions,
     normalise_subqueries,
 )
@@ -154,6 +156,35 @@ def test_subquery_normalisation(
             WHERE B < (SELECT D FROM S)
             """,
         ),
+        # Subquery-free disjunctions are not expanded
+        (
+            """
+            SELECT *
+            FROM R
+            WHERE (A = 1 OR B = 2) AND EXISTS (SELECT * FROM S)
+            """,
+            """
+            SELECT *
+            FROM R
+            WHERE (A = 1 OR B = 2) AND EXISTS (SELECT * FROM S)
+            """,
+        ),
+        (
+            """
+            SELECT *
+            FROM R
+            WHERE NOT (EXISTS (SELECT * FROM S) AND A = 1)
+            """,
+            """
+            SELECT *
+            FROM R
+            WHERE NOT EXISTS (SELECT * FROM S)
+            UNION
+            SELECT *
+            FROM R
+            WHERE NOT A = 1
+            """,
+        ),
     ],
 )
 def test_condition_normalisation(
@@ -169,6 +200,44 @@ def test_condition_normalisation(
     assert normalised_query == expected_query
 
 
+@pytest.mark.parametrize(
+    'condition,expected',
+    [
+        ('A = 1 OR B = 2', 1),
+        ('(A = 1 OR B = 2) AND (A = 2 OR EXISTS (SELECT * FROM S))', 2),
+        ('NOT (EXISTS (SELECT * FROM S) AND EXISTS (SELECT * FROM T)) AND (A = 1 OR B = 2)', 2),
+        (
+            ' AND '.join(f'(A = {i} OR EXISTS (SELECT * FROM S WHERE C = {i}))' for i in range(8)),
+            MAX_DNF_CONJUNCTIONS + 1,
+        ),
+    ],
+)
+def test_dnf_size_estimation(condition: str, expected: int) -> None:
+    where = parse_sql(f'SELECT * FROM R WHERE {condition}').args['where'].this
+
+    assert estimate_dnf_size(where) == expected
+
+
+def test_condition_normalisation_does_not_expand_beyond_bound() -> None:
+    conditions = [f'(A = {i} OR EXISTS (SELECT * FROM S WHERE C = {i}))' for i in range(8)]
+    test_query = parse_sql(
+        f'SELECT * FROM R WHERE B = 1 OR {" AND ".join(conditions)} OR B = 2'  # noqa: S608
+    )
+    expected_query = parse_sql(
+        f"""
+        SELECT * FROM R WHERE B = 1
+        UNION
+        SELECT * FROM R WHERE {' AND '.join(conditions)}
+        UNION
+        SELECT * FROM R WHERE B = 2
+        """  # noqa: S608
+    )
+
+    normalised_query = normalise_conditions(test_query)
+
+    assert normalised_query == expected_query
+
+
 @pytest.mark.parametrize(
     'query,expected',
     [
@@ -188,6 +257,22 @@ def test_condition_normalisation(
             SELECT * FROM R, (SELECT R2.A FROM R AS R2) AS R1
             """,
         ),
+        (
+            """
+            SELECT R.A FROM R, R, R WHERE EXISTS (SELECT * FROM S WHERE S.B = R.B)
+            """,
+            """
+            SELECT R1.A FROM R, R AS R1, R AS R2 WHERE EXISTS (SELECT * FROM S WHERE S.B = R1.B)
+            """,
+        ),
+        (
+            """
+            SELECT * FROM R WHERE EXISTS (SELECT * FROM R, S WHERE R.A = S.A)
+            """,
+            """
+            SELECT * FROM R WHERE EXISTS (SELECT * FROM R AS R1, S WHERE R1.A = S.A)
+            """,
+        ),
     ],
 )
 def test_table_aliasing(
@@ -201,3 +286,11 @@ def test_table_aliasing(
     print(normalised_query.sql(pretty=True))
 
     assert normalised_query.sql() == expected_query.sql()
+
+
+def test_table_aliasing_does_not_modify_input() -> None:
+    test_query = parse_sql('SELECT R.A FROM R, R')
+
+    alias_tables(test_query)
+
+    assert test_query.sql() == 'SELECT R.A FROM R, R'
@@ -1,7 +1,10 @@
+from unittest.mock import patch
+
 import pytest
 from queries.services.ra.ast import (
     EQ,
     And,
+    Not,
     RAQuery,
     Relation,
     attribute,
@@ -73,3 +76,57 @@ def test_subquery_transpilation(
     transpiled = SQLtoRATranspiler(schema).transpile(sql)
     print(transpiled)
     assert transpiled == expected_ra
+
+
+def test_conditions_beyond_dnf_bound_are_transpiled_operand_by_operand() -> None:
+    sql = parse_sql(
+        """
+        SELECT *
+        FROM R
+        WHERE (A = 1 OR EXISTS (SELECT * FROM S WHERE S.C = R.B))
+            AND NOT (B = 2 AND EXISTS (SELECT * FROM S WHERE S.C = R.A))
+        """
+    )
+
+    with patch('queries.services.sql.transpiler.normaliser.MAX_DNF_CONJUNCTIONS', 1):
+        transpiled = SQLtoRATranspiler(schema).transpile(sql)
+
+    assert transpiled == (
+        Relation('R')
+        .select(EQ(attribute('A'), 1))
+        .project('R.A', 'R.B')
+        .union(
+            Relation('S')
+            .cartesian('R')
+            .select(EQ(attribute('S.C'), attribute('R.B')))
+            .project('R.A', 'R.B')
+        )
+        .intersect(
+            Relation('R')
+            .select(Not(EQ(attribute('B'), 2)))
+            .project('R.A', 'R.B')
+            .union(
+                Relation('R')
+                .anti_join(
+                    Relation('S')
+                    .rename('S1')
+                    .cartesian('R')
+                    .select(EQ(attribute('S1.C'), attribute('R.A')))
+                    .project('R.A', 'R.B')
+                )
+                .project('R.A', 'R.B')
+            )
+        )
+    )
+
+
+def test_conditions_beyond_dnf_bound_grow_linearly() -> None:
+    conditions = [
+        f'(A = {i} OR EXISTS (SELECT * FROM S WHERE S.C = R.B AND S.C = {i}))' for i in range(8)
+    ]
+    sql = parse_sql(f'SELECT * FROM R WHERE {" AND ".join(conditions)}')  # noqa: S608
+
+    transpiled = str(SQLtoRATranspiler(schema).transpile(sql))
+
+    assert transpiled.count('UNION') == 8
+    assert transpiled.count('INTERSECT') == 7
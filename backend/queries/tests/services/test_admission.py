@@ -0,0 +1,138 @@
+import sqlite3
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.cache import cache
+
+import pytest
+from databases.models import Database
+from databases.services.bulkhead import DatabaseBusyError, database_bulkhead
+from databases.types import PlanEstimate
+from queries.services.admission import (
+    Admission,
+    QueryRejectedError,
+    admit,
+    execute_admitted,
+    get_plan_estimate,
+    stream_admitted,
+)
+from queries.services.sql.validation import validate_sql
+from query_cod.types import DataType
+
+
+ESTIMATE: PlanEstimate = {'cost': 1000, 'rows': 500}
+
+
+@pytest.fixture
+def database() -> Database:
+    return Database(id=1, database_type=Database.DatabaseType.POSTGRESQL)
+
+
+@pytest.fixture
+def target(tmp_path: Path) -> Database:
+    path = tmp_path / 'target.sqlite3'
+    with sqlite3.connect(path) as conn:
+        conn.execute('CREATE TABLE users (id INTEGER PRIMARY KEY)')
+        conn.executemany('INSERT INTO users VALUES (?)', [(i,) for i in range(5)])
+    return Database(
+        id=2,
+        database_type=Database.DatabaseType.SQLITE,
+        database_name=str(path),
+        queued_query_cost=1,
+    )
+
+
+def test_queries_without_estimates_are_admitted(database: Database) -> None:
+    database.max_query_cost = 0
+
+    assert admit(None, database) == Admission()
+
+
+def test_queries_within_thresholds_are_admitted(database: Database) -> None:
+    database.max_query_cost = 1000
+    database.queued_query_cost = 1000
+    database.capped_query_rows = 500
+
+    assert admit(ESTIMATE, database) == Admission()
+
+
+def test_expensive_queries_are_rejected(database: Database) -> None:
+    database.max_query_cost = 999
+
+    with pytest.raises(QueryRejectedError):
+        admit(ESTIMATE, database)
+
+
+def test_costly_queries_are_queued_and_large_results_capped(database: Database) -> None:
+    database.queued_query_cost = 999
+    database.capped_query_rows = 100
+
+    assert admit(ESTIMATE, database) == Admission(queued=True, max_rows=100)
+
+
+def test_validation_estimates_are_reused(database: Database) -> None:
+    cache.set(
+        f'database_schema_{database.id}',
+        {
+            'users': {
+                'id': {
+                    'type': DataType.INTEGER,
+                    'nullable': False,
+                    'primary_key': True,
+                    'references': None,
+                }
+            }
+        },
+    )
+    with patch('queries.services.sql.validation.explain_sql', return_value=ESTIMATE):
+        tree, errors = validate_sql('SELECT id FROM users', database)
+
+    assert tree is not None and not errors
+    with patch('queries.services.admission.explain_sql') as mock_explain:
+        assert get_plan_estimate(tree.sql(), database) == ESTIMATE
+    mock_explain.assert_not_called()
+
+
+def test_admitted_query_is_capped(target: Database) -> None:
+    target.capped_query_rows = 2
+
+    with patch('queries.services.admission.get_plan_estimate', return_value=ESTIMATE):
+        result = execute_admitted('SELECT id FROM users ORDER BY id', target)
+
+    assert result == {'columns': ['id'], 'rows': [[0], [1]], 'truncated': True}
+
+
+def test_queued_query_waits_for_previous_one(target: Database) -> None:
+    with (
+        patch('queries.services.admission.get_plan_estimate', return_value=ESTIMATE),
+        patch('databases.services.bulkhead.QUEUE_TIMEOUT', 0.01),
+    ):
+        with database_bulkhead(target, expensive=True), pytest.raises(DatabaseBusyError):
+            execute_admitted('SELECT 1', target)
+
+        assert execute_admitted('SELECT 1', target)['rows'] == [[1]]
+
+
+def test_streamed_query_holds_slot_until_closed(target: Database) -> None:
+    with (
+        patch('queries.services.admission.get_plan_estimate', return_value=ESTIMATE),
+        patch('databases.services.bulkhead.QUEUE_TIMEOUT', 0.01),
+    ):
+        rows = stream_admitted('SELECT id FROM users ORDER BY id', target)
+        assert next(rows) == ['id']
+        with pytest.raises(DatabaseBusyError):
+            execute_admitted('SELECT 1', target)
+
+        rows.close()
+        assert execute_admitted('SELECT 1', target)['rows'] == [[1]]
+
+
+def test_capped_query_still_returns_the_rows_asked_for(target: Database) -> None:
+    target.capped_query_rows = 2
+
+    with patch('queries.services.admission.get_plan_estimate', return_value=ESTIMATE):
+        capped = execute_admitted('SELECT id FROM users ORDER BY id', target, min_rows=4)
+        whole = execute_admitted('SELECT id FROM users ORDER BY id', target, min_rows=6)
+
+    assert capped == {'columns': ['id'], 'rows': [[0], [1], [2], [3]], 'truncated': True}
+    assert whole == {'columns': ['id'], 'rows': [[i] for i in range(5)]}
@@ -0,0 +1,86 @@
+from datetime import date
+from decimal import Decimal
+
+from databases.types import QueryResult
+from queries.renderers import ColumnarJSONRenderer
+from queries.services.columnar import to_columnar
+from query_cod.types import DataType
+
+
+def test_to_columnar_types_columns_by_their_values() -> None:
+    result: QueryResult = {
+        'columns': ['id', 'balance', 'opened', 'active', 'ratio', 'notes'],
+        'rows': [
+            [1, Decimal('10.50'), date(2024, 1, 2), True, 0.5, None],
+            [2, Decimal('-3'), date(2024, 1, 3), False, 1, None],
+        ],
+    }
+
+    columnar = to_columnar(result)
+
+    assert columnar == {
+        'columns': [
+            {'name': 'id', 'type': DataType.INTEGER, 'values': [1, 2]},
+            {'name': 'balance', 'type': DataType.DECIMAL, 'values': ['10.50', '-3']},
+            {'name': 'opened', 'type': DataType.DATE, 'values': ['2024-01-02', '2024-01-03']},
+            {'name': 'active', 'type': DataType.BOOLEAN, 'values': [True, False]},
+            {'name': 'ratio', 'type': DataType.DOUBLE_PRECISION, 'values': [0.5, 1]},
+            {'name': 'notes', 'type': DataType.NULL, 'values': [None, None]},
+        ],
+        'length': 2,
+    }
+
+
+def test_to_columnar_dictionary_encodes_repeated_strings() -> None:
+    result: QueryResult = {
+        'columns': ['type'],
+        'rows': [['current'], ['deposit'], [None], ['current'], ['current']],
+        'truncated': True,
+    }
+
+    columnar = to_columnar(result)
+
+    assert columnar['columns'] == [
+        {
+            'name': 'type',
+            'type': DataType.VARCHAR,
+            'dictionary': ['current', 'deposit'],
+            'indices': [0, 1, None, 0, 0],
+        }
+    ]
+    assert columnar['truncated'] is True
+
+
+def test_to_columnar_sends_mixed_columns_as_text() -> None:
+    result: QueryResult = {'columns': ['value'], 'rows': [[1], ['a'], [2.5]]}
+
+    [column] = to_columnar(result)['columns']
+
+    assert column == {'name': 'value', 'type': DataType.VARCHAR, 'values': ['1', 'a', '2.5']}
+
+
+def test_to_columnar_without_rows() -> None:
+    columnar = to_columnar({'columns': ['id'], 'rows': []})
+
+    assert columnar == {
+        'columns': [{'name': 'id', 'type': DataType.NULL, 'values': []}],
+        'length': 0,
+    }
+
+
+def test_to_columnar_sends_floats_without_a_number_as_text() -> None:
+    result: QueryResult = {
+        'columns': ['ratio'],
+        'rows': [[float('nan')], [float('inf')], [float('-inf')], [1.5], [None]],
+    }
+
+    columnar = to_columnar(result)
+
+    assert columnar['columns'] == [
+        {
+            'name': 'ratio',
+            'type': DataType.DOUBLE_PRECISION,
+            'values': ['NaN', 'Infinity', '-Infinity', 1.5, None],
+        }
+    ]
+    assert b'"NaN"' in ColumnarJSONRenderer().render(columnar)
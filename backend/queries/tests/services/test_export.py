@@ -0,0 +1,65 @@
+import json
+from collections.abc import Iterator
+from datetime import date
+from decimal import Decimal
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from queries.services.export import export_error, export_rows
+
+
+ROWS: list[list[Any]] = [
+    [1, 'Ada, Lovelace', Decimal('1.50'), date(2024, 1, 2)],
+    [2, None, None, None],
+]
+
+
+def test_csv_export_quotes_values_and_leaves_nulls_empty() -> None:
+    content = ''.join(export_rows('csv', ['id', 'name', 'amount', 'day'], ROWS))
+
+    assert content.splitlines() == [
+        'id,name,amount,day',
+        '1,"Ada, Lovelace",1.50,2024-01-02',
+        '2,,,',
+    ]
+
+
+def test_ndjson_export_writes_an_object_per_row() -> None:
+    content = ''.join(export_rows('ndjson', ['id', 'name', 'amount', 'day'], ROWS))
+
+    assert [json.loads(line) for line in content.splitlines()] == [
+        {'id': 1, 'name': 'Ada, Lovelace', 'amount': '1.50', 'day': '2024-01-02'},
+        {'id': 2, 'name': None, 'amount': None, 'day': None},
+    ]
+
+
+def test_export_consumes_rows_a_chunk_at_a_time() -> None:
+    consumed = []
+
+    def rows() -> Iterator[list[int]]:
+        for i in range(5):
+            consumed.append(i)
+            yield [i]
+
+    with patch('queries.services.export.CHUNK_ROWS', 2):
+        chunks = export_rows('ndjson', ['id'], rows())
+        assert next(chunks) == '{"id": 0}\n{"id": 1}\n'
+
+    assert consumed == [0, 1]
+
+
+def test_export_rejects_unknown_formats() -> None:
+    with pytest.raises(ValueError):
+        export_rows('xlsx', ['id'], [])
+
+
+@pytest.mark.parametrize(
+    'file_format, line',
+    [
+        ('csv', 'ERROR: Interrupted\r\n'),
+        ('ndjson', '{"error": "Interrupted"}\n'),
+    ],
+)
+def test_export_error_is_a_line_of_the_format(file_format: str, line: str) -> None:
+    assert export_error(file_format, 'Interrupted') == line
@@ -0,0 +1,48 @@
+from typing import Any
+
+from queries.services.live import TreeDiff, diff_tree, flatten_tree
+
+
+def node(node_id: int, *children: dict[str, Any], **fields: Any) -> dict[str, Any]:
+    return {'id': node_id, 'children': list(children), 'validation_errors': [], **fields}
+
+
+def test_flatten_tree_replaces_children_with_their_ids() -> None:
+    tree = node(0, node(1, name='users'), node(2, name='teams'))
+
+    assert flatten_tree(tree) == {
+        0: node(0) | {'children': [1, 2]},
+        1: node(1, name='users'),
+        2: node(2, name='teams'),
+    }
+
+
+def test_diff_tree_sends_the_whole_tree_first() -> None:
+    tree = node(0, node(1, name='users'))
+
+    diff, nodes = diff_tree({}, tree)
+
+    assert diff == {'root': 0, 'nodes': list(flatten_tree(tree).values()), 'removed': []}
+    assert nodes == flatten_tree(tree)
+
+
+def test_diff_tree_sends_only_the_nodes_that_changed() -> None:
+    previous = flatten_tree(node(0, node(1, name='users'), node(2, name='teams')))
+    tree = node(0, node(1, name='accounts'))
+
+    diff, _ = diff_tree(previous, tree)
+
+    assert diff == {
+        'root': 0,
+        'nodes': [node(0) | {'children': [1]}, node(1, name='accounts')],
+        'removed': [2],
+    }
+
+
+def test_diff_tree_removes_every_node_of_trees_that_no_longer_build() -> None:
+    previous = flatten_tree(node(0, node(1)))
+
+    diff, nodes = diff_tree(previous, None)
+
+    assert diff == TreeDiff(root=None, nodes=[], removed=[0, 1])
+    assert nodes == {}
@@ -0,0 +1,26 @@
+from unittest.mock import patch
+
+from databases.types import QueryResult
+from queries.services.results import get_stored_result, slice_result, store_result
+
+
+RESULT: QueryResult = {'columns': ['id'], 'rows': [[1], [2], [3]], 'truncated': True}
+
+
+def test_stored_result_is_only_returned_to_its_owner() -> None:
+    result_id = store_result(RESULT, owner_id=1)
+    assert result_id is not None
+
+    assert get_stored_result(result_id, owner_id=1) == RESULT
+    assert get_stored_result(result_id, owner_id=2) is None
+    assert get_stored_result('unknown', owner_id=1) is None
+
+
+def test_large_results_are_not_stored() -> None:
+    with patch('queries.services.results.MAX_STORED_BYTES', 16):
+        assert store_result(RESULT, owner_id=1) is None
+
+
+def test_slice_result_keeps_columns_and_truncation() -> None:
+    assert slice_result(RESULT, 1, 1) == {'columns': ['id'], 'rows': [[2]], 'truncated': True}
+    assert slice_result(RESULT, 2, None)['rows'] == [[3]]
@@ -0,0 +1,35 @@
+from queries.services.ra.scope.utils import merge_schemas
+from queries.services.types import RelationalSchema, SharedSchema, merge_common_column
+from query_cod.types import DataType
+
+
+def test_merge_common_column_replaces_shared_attributes() -> None:
+    employee = {'id': DataType.INTEGER, 'dept_id': DataType.INTEGER}
+    department = {'dept_id': DataType.INTEGER, 'name': DataType.VARCHAR}
+    schema: SharedSchema = {'employee': employee, 'department': department}
+
+    merge_common_column(schema, 'dept_id')
+
+    assert schema == {
+        'employee': {'id': DataType.INTEGER},
+        'department': {'name': DataType.VARCHAR},
+        None: {'dept_id': DataType.INTEGER},
+    }
+    assert employee == {'id': DataType.INTEGER, 'dept_id': DataType.INTEGER}
+    assert department == {'dept_id': DataType.INTEGER, 'name': DataType.VARCHAR}
+
+
+def test_merge_schemas_shares_unchanged_relations() -> None:
+    left: RelationalSchema = {'employee': {'id': DataType.INTEGER}, None: {'a': DataType.INTEGER}}
+    right: RelationalSchema = {'department': {'id': DataType.INTEGER}, None: {'b': DataType.DATE}}
+
+    merged = merge_schemas(left, right)
+
+    assert merged == {
+        'employee': {'id': DataType.INTEGER},
+        None: {'a': DataType.INTEGER, 'b': DataType.DATE},
+        'department': {'id': DataType.INTEGER},
+    }
+    assert merged['employee'] is left['employee']
+    assert merged['department'] is right['department']
+    assert left[None] == {'a': DataType.INTEGER}
@@ -1,6 +1,13 @@
+from datetime import date
+from decimal import Decimal
+
+from databases.types import QueryResult
 from queries.serializers.execution import (
     QueryExecutionSerializer,
+    QueryResultDataSerializer,
+    render_query_result,
 )
+from rest_framework import serializers
 
 
 def test_query_execution_serializer_valid_data() -> None:
@@ -15,3 +22,28 @@ def test_query_execution_serializer_valid_data() -> None:
     serializer.is_valid(raise_exception=True)
     assert serializer.validated_data['success'] is True
     assert len(serializer.validated_data['results']['rows']) == 2
+
+
+def test_render_query_result_matches_field_rendering() -> None:
+    result: QueryResult = {
+        'columns': ['id', 'name', 'balance', 'opened', 'active'],
+        'rows': [
+            [1, 'Alice', Decimal('10.50'), date(2024, 1, 2), True],
+            [2, None, Decimal('-3'), None, False],
+            [3, 'Carol', None, date(2024, 3, 4), None],
+        ],
+        'truncated': True,
+    }
+    serializer = QueryResultDataSerializer()
+
+    rendered = render_query_result(result)
+
+    assert rendered == serializers.Serializer.to_representation(serializer, result)
+    assert rendered['rows'][0] == ['1', 'Alice', '10.50', '2024-01-02', 'True']
+    assert QueryResultDataSerializer(result).data == rendered
+
+
+def test_render_query_result_without_rows() -> None:
+    result: QueryResult = {'columns': ['id'], 'rows': []}
+
+    assert render_query_result(result) == result
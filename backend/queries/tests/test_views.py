@@ -0,0 +1,98 @@
+from django.urls import reverse
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+from model_bakery import baker
+from projects.models import Query
+from rest_framework import status
+from rest_framework.test import APIClient
+from users.models import User
+
+
+@pytest.fixture
+def executed_query(user: User, monkeypatch: MonkeyPatch) -> Query:
+    monkeypatch.setattr(
+        'projects.views.query.execute_query',
+        lambda query: {'columns': ['id'], 'rows': [[1], [2], [3]]},
+    )
+    return baker.make(Query, project__user=user)
+
+
+@pytest.mark.django_db
+def test_execution_returns_first_page_of_stored_result(
+    auth_client: APIClient, executed_query: Query
+) -> None:
+    url = reverse('queries-execute', kwargs={'pk': executed_query.id})
+    response = auth_client.post(f'{url}?limit=2')
+
+    data = response.json()
+    assert data['results'] == {'columns': ['id'], 'rows': [['1'], ['2']]}
+    assert data['count'] == 3
+
+    url = reverse('results-detail', kwargs={'pk': data['result_id']})
+    response = auth_client.get(url, {'offset': 2, 'limit': 2})
+
+    assert response.status_code == status.HTTP_200_OK
+    page = response.json()
+    assert page['count'] == 3
+    assert page['next'] is None
+    assert page['previous'] is not None
+    assert page['results'] == {'columns': ['id'], 'rows': [['3']]}
+
+
+@pytest.mark.django_db
+def test_execution_without_limit_returns_all_rows(
+    auth_client: APIClient, executed_query: Query
+) -> None:
+    url = reverse('queries-execute', kwargs={'pk': executed_query.id})
+    response = auth_client.post(url)
+
+    data = response.json()
+    assert data['results']['rows'] == [['1'], ['2'], ['3']]
+    # Results returned whole are not kept
+    assert 'result_id' not in data
+
+
+@pytest.mark.django_db
+def test_result_too_large_to_keep_still_returns_first_page(
+    auth_client: APIClient, executed_query: Query, monkeypatch: MonkeyPatch
+) -> None:
+    monkeypatch.setattr('queries.services.results.MAX_STORED_BYTES', 16)
+    url = reverse('queries-execute', kwargs={'pk': executed_query.id})
+
+    data = auth_client.post(f'{url}?limit=2').json()
+
+    assert data['results']['rows'] == [['1'], ['2']]
+    assert data['count'] == 3
+    assert 'result_id' not in data
+
+
+@pytest.mark.django_db
+def test_capped_result_is_stored_without_limit(
+    auth_client: APIClient, executed_query: Query, monkeypatch: MonkeyPatch
+) -> None:
+    monkeypatch.setattr(
+        'projects.views.query.execute_query',
+        lambda query: {'columns': ['id'], 'rows': [[1], [2]], 'truncated': True},
+    )
+    url = reverse('queries-execute', kwargs={'pk': executed_query.id})
+    data = auth_client.post(url).json()
+
+    response = auth_client.get(reverse('results-detail', kwargs={'pk': data['result_id']}))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['results']['rows'] == [['1'], ['2']]
+
+
+@pytest.mark.django_db
+def test_stored_result_is_hidden_from_other_users(
+    auth_client: APIClient, executed_query: Query
+) -> None:
+    url = reverse('queries-execute', kwargs={'pk': executed_query.id})
+    result_id = auth_client.post(f'{url}?limit=2').json()['result_id']
+
+    other_client = APIClient()
+    other_client.force_authenticate(baker.make(User))
+    response = other_client.get(reverse('results-detail', kwargs={'pk': result_id}))
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -1,6 +1,7 @@
-from typing import NotRequired, TypedDict
+from typing import Any, NotRequired, TypedDict
 
 from databases.types import QueryResult
+from query_cod.types import DataType
 
 
 class ErrorPosition(TypedDict):
@@ -18,4 +19,29 @@ class QueryError(TypedDict):
 
 class QueryExecutionResponse(TypedDict):
     results: NotRequired[QueryResult]
+    result_id: NotRequired[str]
+    count: NotRequired[int]
+    error: NotRequired[QueryError]
     success: bool
+
+
+class ResultColumn(TypedDict):
+    name: str
+    type: DataType
+    values: NotRequired[list[Any]]
+    # Dictionary-encoded columns store each distinct value once
+    dictionary: NotRequired[list[str]]
+    indices: NotRequired[list[int | None]]
+
+
+class ColumnarQueryResult(TypedDict):
+    columns: list[ResultColumn]
+    length: int
+    truncated: NotRequired[bool]
+
+
+class QueryResultPage(TypedDict):
+    count: int
+    next: str | None
+    previous: str | None
+    results: QueryResult
@@ -1,19 +1,97 @@
+from typing import Any
+
+from django.db import transaction
+
+from common.views import conditional_response
+from databases.services.bulkhead import DatabaseBusyError
+from databases.services.circuit_breaker import DatabaseUnavailableError
 from databases.types import QueryResult
 from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from .serializers.execution import QueryExecutionSerializer
+from .renderers import (
+    COLUMNAR_RENDERERS,
+    EXECUTION_RENDERERS,
+    ColumnarJSONRenderer,
+    MessagePackRenderer,
+)
+from .serializers.execution import (
+    ColumnarQueryExecutionSerializer,
+    ColumnarQueryResultPageSerializer,
+    QueryExecutionSerializer,
+    QueryResultPageSerializer,
+    render_query_result,
+)
 from .serializers.tree import QueryTreeSerializer
+from .serializers.validation import QueryValidationSerializer
+from .services.admission import QueryRejectedError
+from .services.columnar import to_columnar
 from .services.execution import execute_subquery
+from .services.results import get_stored_result, slice_result, store_result
+
+
+# Seconds clients are asked to wait before retrying a query on a busy or unreachable database
+RETRY_AFTER = 5
+
+EXECUTION_RESPONSES = {
+    (code, media_type): serializer
+    for code in (200, 503)
+    for media_type, serializer in [
+        ('application/json', QueryExecutionSerializer),
+        (ColumnarJSONRenderer.media_type, ColumnarQueryExecutionSerializer),
+        (MessagePackRenderer.media_type, ColumnarQueryExecutionSerializer),
+    ]
+}
+
+LIMIT_PARAMETER = OpenApiParameter(
+    name='limit',
+    type=int,
+    location=OpenApiParameter.QUERY,
+    description='Number of rows to return, the rest are fetched from the stored result',
+)
+
+
+class ResultPagination(LimitOffsetPagination):
+    default_limit = 100
+    max_limit = 1000
+
+
+def stored_results(results: QueryResult, request: Request) -> dict[str, Any]:
+    """Keep ``results`` for their pages to be fetched, returning only the first if limited.
+
+    Only results fetched a page at a time, or capped, are kept. Results too large to keep have no
+    ``result_id``, so only their first page can be fetched.
+    """
+    stored: dict[str, Any] = {'count': len(results['rows'])}
+    paged = 'limit' in request.query_params
+    result_id = (
+        store_result(results, request.user.pk) if paged or results.get('truncated') else None
+    )
+    if result_id is not None:
+        stored['result_id'] = result_id
+    if paged:
+        results = slice_result(results, 0, ResultPagination().get_limit(request))
+    stored['results'] = render_results(results, request)
+    return stored
+
+
+def render_results(results: QueryResult, request: Request) -> Any:
+    if isinstance(request.accepted_renderer, COLUMNAR_RENDERERS):
+        return to_columnar(results)
+    return render_query_result(results)
 
 
 class SubqueriesMixin:
     @extend_schema(
         request=None,
-        responses=QueryExecutionSerializer,
+        responses=EXECUTION_RESPONSES,
         parameters=[
+            LIMIT_PARAMETER,
             OpenApiParameter(
                 name='subquery_id',
                 type=int,
@@ -22,10 +100,23 @@ class SubqueriesMixin:
             ),
         ],
     )
-    @action(detail=True, methods=['post'], url_path='subqueries/(?P<subquery_id>[0-9]+)/executions')
+    @action(
+        detail=True,
+        methods=['post'],
+        url_path='subqueries/(?P<subquery_id>[0-9]+)/executions',
+        renderer_classes=EXECUTION_RENDERERS,
+    )
+    @transaction.non_atomic_requests
     def execute_subquery(self, request: Request, pk: str, subquery_id: str) -> Response:
         query = self.get_object()  # type: ignore[attr-defined]
-        results = execute_subquery(query, int(subquery_id))
+        try:
+            results = execute_subquery(query, int(subquery_id))
+        except QueryRejectedError as e:
+            return self._handle_rejection(e)
+        except DatabaseBusyError as e:
+            return self._handle_unavailable('Database busy', e)
+        except DatabaseUnavailableError as e:
+            return self._handle_unavailable('Database unavailable', e)
         return self._handle_execution(results)
 
     @extend_schema(
@@ -35,11 +126,84 @@ class SubqueriesMixin:
     @action(detail=True, methods=['get'], url_path='tree')
     def tree(self, request: Request, pk: str) -> Response:
         query = self.get_object()  # type: ignore[attr-defined]
-        serializer = QueryTreeSerializer(query)
-        return Response(serializer.data)
+        return conditional_response(
+            request, _validation_version(query), lambda: Response(QueryTreeSerializer(query).data)
+        )
+
+    @extend_schema(
+        request=None,
+        responses=QueryValidationSerializer,
+    )
+    @action(detail=True, methods=['get'], url_path='validation')
+    def validation(self, request: Request, pk: str) -> Response:
+        """Errors in the saved text of the query.
+
+        Kept apart from the query itself, so saving its text never waits on validating it.
+        """
+        query = self.get_object()  # type: ignore[attr-defined]
+        return conditional_response(
+            request,
+            _validation_version(query),
+            lambda: Response(QueryValidationSerializer(query).data),
+        )
 
     def _handle_execution(self, results: QueryResult | None) -> Response:
-        if results:
-            return Response({'success': True, 'results': results})
-        else:
+        if not results:
             return Response({'success': False})
+        request = self.request  # type: ignore[attr-defined]
+        return Response({'success': True, **stored_results(results, request)})
+
+    def _handle_rejection(self, error: QueryRejectedError) -> Response:
+        return Response(
+            {'success': False, 'error': {'title': 'Query rejected', 'description': str(error)}}
+        )
+
+    def _handle_unavailable(self, title: str, error: Exception) -> Response:
+        return Response(
+            {'success': False, 'error': {'title': title, 'description': str(error)}},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={'Retry-After': str(RETRY_AFTER)},
+        )
+
+
+def _validation_version(query: Any) -> tuple[object, ...]:
+    # Queries are validated against the schema, which changes without them
+    return (
+        type(query).__name__,
+        query.pk,
+        query.modified,
+        query.language,
+        query.database.schema_fingerprint,
+    )
+
+
+class ResultViewSet(viewsets.ViewSet):
+    renderer_classes = EXECUTION_RENDERERS
+
+    @extend_schema(
+        responses={
+            (200, 'application/json'): QueryResultPageSerializer,
+            (200, ColumnarJSONRenderer.media_type): ColumnarQueryResultPageSerializer,
+            (200, MessagePackRenderer.media_type): ColumnarQueryResultPageSerializer,
+        },
+        parameters=[
+            OpenApiParameter(name='id', type=str, location=OpenApiParameter.PATH),
+            OpenApiParameter(name='limit', type=int, location=OpenApiParameter.QUERY),
+            OpenApiParameter(name='offset', type=int, location=OpenApiParameter.QUERY),
+        ],
+    )
+    def retrieve(self, request: Request, pk: str) -> Response:
+        """Rows of a stored result, which never executes the query again."""
+        result = get_stored_result(pk, request.user.pk)
+        if result is None:
+            raise NotFound('The result has expired, execute the query again')
+
+        paginator = ResultPagination()
+        # Stored results never change, so offsets are as stable as keys
+        rows: list[list[Any]] | None = paginator.paginate_queryset(
+            result['rows'],  # type: ignore[arg-type]
+            request,
+            view=self,
+        )
+        page: QueryResult = {**result, 'rows': rows or []}
+        return paginator.get_paginated_response(render_results(page, request))
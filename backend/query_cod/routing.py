@@ -0,0 +1,10 @@
+from django.urls import path
+
+from exercises.consumers import AttemptValidationConsumer
+from projects.consumers import QueryValidationConsumer
+
+
+websocket_urlpatterns = [
+    path('ws/queries/<int:pk>/validation/', QueryValidationConsumer.as_asgi()),
+    path('ws/attempts/<int:pk>/validation/', AttemptValidationConsumer.as_asgi()),
+]
@@ -33,7 +33,46 @@ CACHES = {
     }
 }
 
+# SQL compiled from relational algebra is cached in each process, and shared between processes
+# through Redis when a URL is configured
+COMPILATION_CACHE_SIZE = config('COMPILATION_CACHE_SIZE', cast=int, default=1024)
+COMPILATION_CACHE_REDIS_URL = config('COMPILATION_CACHE_REDIS_URL', default='')
+if COMPILATION_CACHE_REDIS_URL:
+    CACHES['compilation'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': COMPILATION_CACHE_REDIS_URL,
+        'TIMEOUT': 28800,  # 8 hours
+    }
+
+# Executed results are kept for a few minutes, so their pages are fetched without executing the
+# query again. Processes share them through Redis when a URL is configured. Each process keeps at
+# most MAX_ENTRIES results of up to MAX_STORED_BYTES otherwise
+RESULT_CACHE_REDIS_URL = config('RESULT_CACHE_REDIS_URL', default='')
+CACHES['results'] = (
+    {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': RESULT_CACHE_REDIS_URL,
+    }
+    if RESULT_CACHE_REDIS_URL
+    else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'query_cod_results',
+        'OPTIONS': {'MAX_ENTRIES': config('RESULT_CACHE_MAX_ENTRIES', cast=int, default=64)},
+    }
+)
+
+# Queries running and queued on each target database are counted in Redis when a URL is
+# configured, so their limits hold for every process. Each process counts its own otherwise
+BULKHEAD_REDIS_URL = config('BULKHEAD_REDIS_URL', default='')
+
+# SQL queries that pass semantic validation are planned to catch any remaining errors: 'explain'
+# plans them on the target database, 'catalog' on a local copy of its schema with no data. The
+# catalog is SQLite, so functions only PostgreSQL provides are reported as errors
+SQL_VALIDATION_MODE = config('SQL_VALIDATION_MODE', default='explain')
+
 INSTALLED_APPS = [
+    # Runs the ASGI application with runserver, so WebSockets are served in development
+    'daphne',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -59,6 +98,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.gzip.GZipMiddleware',
+    'common.middleware.BrotliMiddleware',
+    'common.middleware.ConnectionHoldTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django_permissions_policy.PermissionsPolicyMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -102,6 +143,12 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'query_cod.wsgi.application'
+# Serves the WebSockets queries are validated through as they are edited
+ASGI_APPLICATION = 'query_cod.asgi.application'
+
+# Consumers only ever send to their own sockets, never to groups or other processes' channels, so
+# no channel layer is configured
+CHANNEL_LAYERS: dict[str, dict[str, str]] = {}
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -9,6 +9,9 @@ DEBUG = False
 SECRET_KEY = config('SECRET_KEY')
 
 DATABASES['default']['ATOMIC_REQUESTS'] = True
+# Reuse connections across requests, checking they are still usable before each one
+DATABASES['default']['CONN_MAX_AGE'] = config('CONN_MAX_AGE', default=60, cast=int)
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
 
 ALLOWED_HOSTS = config('ALLOWED_HOSTS', cast=Csv())
 
@@ -48,6 +51,16 @@ CELERY_BROKER_URL = config('RABBITMQ_URL', default='') or config('REDIS_URL')
 CELERY_RESULT_BACKEND = config('REDIS_URL')
 CELERY_SEND_TASK_ERROR_EMAILS = True
 
+# Pages of results are fetched from whichever worker process serves the request
+RESULT_CACHE_REDIS_URL = config('RESULT_CACHE_REDIS_URL', default=config('REDIS_URL'))
+CACHES['results'] = {
+    'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+    'LOCATION': RESULT_CACHE_REDIS_URL,
+}
+
+# Limits on the queries of target databases hold across worker processes
+BULKHEAD_REDIS_URL = config('BULKHEAD_REDIS_URL', default=config('REDIS_URL'))
+
 # Redbeat https://redbeat.readthedocs.io/en/latest/config.html#redbeat-redis-url
 redbeat_redis_url = config('REDBEAT_REDIS_URL', default='')
 
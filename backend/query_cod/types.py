@@ -113,4 +113,7 @@ class DataType(str, Enum):
     def dominant(types: list['DataType']) -> 'DataType':
         if not types:
             raise ValueError()
-        return max(types, key=lambda t: DataType._precedence_map().get(t, -1))
+        if len(types) == 1:
+            return types[0]
+        precedence = DataType._precedence_map()
+        return max(types, key=lambda t: precedence.get(t, -1))
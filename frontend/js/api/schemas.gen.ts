@@ -57,13 +57,6 @@ export const $Attempt = {
     text: {
       type: "string",
     },
-    validation_errors: {
-      type: "array",
-      items: {
-        $ref: "#/components/schemas/QueryError",
-      },
-      readOnly: true,
-    },
     completed: {
       type: "boolean",
     },
@@ -75,15 +68,8 @@ export const $Attempt = {
       ],
       readOnly: true,
     },
-    assistant_messages: {
-      type: "array",
-      items: {
-        $ref: "#/components/schemas/Message",
-      },
-      readOnly: true,
-    },
   },
-  required: ["assistant_messages", "id", "language", "validation_errors"],
+  required: ["id", "language"],
 } as const;
 
 export const $AuthorEnum = {
@@ -93,6 +79,89 @@ export const $AuthorEnum = {
 * \`assistant\` - Assistant`,
 } as const;
 
+export const $ColumnarQueryExecution = {
+  type: "object",
+  properties: {
+    results: {
+      allOf: [
+        {
+          $ref: "#/components/schemas/ColumnarQueryResult",
+        },
+      ],
+      description: "Query result data if the query execution was successful",
+    },
+    result_id: {
+      type: "string",
+      description:
+        "Identifies the stored result, to fetch its rows a page at a time. Missing if the result was too large to keep",
+    },
+    count: {
+      type: "integer",
+      description: "Number of rows in the whole result",
+    },
+    error: {
+      allOf: [
+        {
+          $ref: "#/components/schemas/QueryError",
+        },
+      ],
+      description: "Reason the query was not executed, if it was rejected",
+    },
+    success: {
+      type: "boolean",
+      description: "Indicates if the query execution was successful",
+    },
+  },
+  required: ["success"],
+} as const;
+
+export const $ColumnarQueryResult = {
+  type: "object",
+  properties: {
+    columns: {
+      type: "array",
+      items: {
+        $ref: "#/components/schemas/ResultColumn",
+      },
+    },
+    length: {
+      type: "integer",
+      description: "Number of rows in the result",
+    },
+    truncated: {
+      type: "boolean",
+      description: "Set when only the first rows of the result were fetched",
+    },
+  },
+  required: ["columns", "length"],
+} as const;
+
+export const $ColumnarQueryResultPage = {
+  type: "object",
+  properties: {
+    count: {
+      type: "integer",
+      description: "Number of rows in the whole result",
+    },
+    next: {
+      type: "string",
+      format: "uri",
+      nullable: true,
+      description: "Link to the next page of rows",
+    },
+    previous: {
+      type: "string",
+      format: "uri",
+      nullable: true,
+      description: "Link to the previous page of rows",
+    },
+    results: {
+      $ref: "#/components/schemas/ColumnarQueryResult",
+    },
+  },
+  required: ["count", "next", "previous", "results"],
+} as const;
+
 export const $Database = {
   type: "object",
   properties: {
@@ -345,6 +414,15 @@ export const $Feedback = {
     results: {
       $ref: "#/components/schemas/QueryResultData",
     },
+    result_id: {
+      type: "string",
+      description:
+        "Identifies the stored result, to fetch its rows a page at a time. Missing if the result was too large to keep",
+    },
+    count: {
+      type: "integer",
+      description: "Number of rows in the whole result",
+    },
   },
   required: ["correct"],
 } as const;
@@ -600,6 +678,35 @@ export const $OuterJoinNode = {
   required: ["children", "id", "operator", "ra_node_type", "validation_errors"],
 } as const;
 
+export const $PaginatedMessageList = {
+  type: "object",
+  required: ["count", "results"],
+  properties: {
+    count: {
+      type: "integer",
+      example: 123,
+    },
+    next: {
+      type: "string",
+      nullable: true,
+      format: "uri",
+      example: "http://api.example.org/accounts/?offset=400&limit=100",
+    },
+    previous: {
+      type: "string",
+      nullable: true,
+      format: "uri",
+      example: "http://api.example.org/accounts/?offset=200&limit=100",
+    },
+    results: {
+      type: "array",
+      items: {
+        $ref: "#/components/schemas/Message",
+      },
+    },
+  },
+} as const;
+
 export const $PaginatedUserList = {
   type: "object",
   required: ["count", "results"],
@@ -655,13 +762,6 @@ export const $PatchedAttempt = {
     text: {
       type: "string",
     },
-    validation_errors: {
-      type: "array",
-      items: {
-        $ref: "#/components/schemas/QueryError",
-      },
-      readOnly: true,
-    },
     completed: {
       type: "boolean",
     },
@@ -673,13 +773,6 @@ export const $PatchedAttempt = {
       ],
       readOnly: true,
     },
-    assistant_messages: {
-      type: "array",
-      items: {
-        $ref: "#/components/schemas/Message",
-      },
-      readOnly: true,
-    },
   },
 } as const;
 
@@ -758,20 +851,6 @@ export const $PatchedQuery = {
       format: "date-time",
       readOnly: true,
     },
-    validation_errors: {
-      type: "array",
-      items: {
-        $ref: "#/components/schemas/QueryError",
-      },
-      readOnly: true,
-    },
-    assistant_messages: {
-      type: "array",
-      items: {
-        $ref: "#/components/schemas/Message",
-      },
-      readOnly: true,
-    },
   },
 } as const;
 
@@ -928,30 +1007,8 @@ export const $Query = {
       format: "date-time",
       readOnly: true,
     },
-    validation_errors: {
-      type: "array",
-      items: {
-        $ref: "#/components/schemas/QueryError",
-      },
-      readOnly: true,
-    },
-    assistant_messages: {
-      type: "array",
-      items: {
-        $ref: "#/components/schemas/Message",
-      },
-      readOnly: true,
-    },
   },
-  required: [
-    "assistant_messages",
-    "created",
-    "id",
-    "language",
-    "modified",
-    "name",
-    "validation_errors",
-  ],
+  required: ["created", "id", "language", "modified", "name"],
 } as const;
 
 export const $QueryError = {
@@ -984,6 +1041,23 @@ export const $QueryExecution = {
       ],
       description: "Query result data if the query execution was successful",
     },
+    result_id: {
+      type: "string",
+      description:
+        "Identifies the stored result, to fetch its rows a page at a time. Missing if the result was too large to keep",
+    },
+    count: {
+      type: "integer",
+      description: "Number of rows in the whole result",
+    },
+    error: {
+      allOf: [
+        {
+          $ref: "#/components/schemas/QueryError",
+        },
+      ],
+      description: "Reason the query was not executed, if it was rejected",
+    },
     success: {
       type: "boolean",
       description: "Indicates if the query execution was successful",
@@ -1014,10 +1088,40 @@ export const $QueryResultData = {
       },
       description: "List of query result rows",
     },
+    truncated: {
+      type: "boolean",
+      description: "Set when only the first rows of the result were fetched",
+    },
   },
   required: ["columns", "rows"],
 } as const;
 
+export const $QueryResultPage = {
+  type: "object",
+  properties: {
+    count: {
+      type: "integer",
+      description: "Number of rows in the whole result",
+    },
+    next: {
+      type: "string",
+      format: "uri",
+      nullable: true,
+      description: "Link to the next page of rows",
+    },
+    previous: {
+      type: "string",
+      format: "uri",
+      nullable: true,
+      description: "Link to the previous page of rows",
+    },
+    results: {
+      $ref: "#/components/schemas/QueryResultData",
+    },
+  },
+  required: ["count", "next", "previous", "results"],
+} as const;
+
 export const $QuerySummary = {
   type: "object",
   properties: {
@@ -1059,6 +1163,20 @@ export const $QueryTree = {
   required: ["ra_tree", "sql_tree"],
 } as const;
 
+export const $QueryValidation = {
+  type: "object",
+  properties: {
+    validation_errors: {
+      type: "array",
+      items: {
+        $ref: "#/components/schemas/QueryError",
+      },
+      readOnly: true,
+    },
+  },
+  required: ["validation_errors"],
+} as const;
+
 export const $RAJoinNode = {
   type: "object",
   properties: {
@@ -1227,6 +1345,41 @@ export const $RenameNode = {
   required: ["alias", "children", "id", "ra_node_type", "validation_errors"],
 } as const;
 
+export const $ResultColumn = {
+  type: "object",
+  properties: {
+    name: {
+      type: "string",
+    },
+    type: {
+      $ref: "#/components/schemas/TypeEnum",
+    },
+    values: {
+      type: "array",
+      items: {
+        nullable: true,
+      },
+      description: "Values of the column, unless it is dictionary-encoded",
+    },
+    dictionary: {
+      type: "array",
+      items: {
+        type: "string",
+      },
+      description: "Distinct values of a dictionary-encoded column",
+    },
+    indices: {
+      type: "array",
+      items: {
+        type: "integer",
+        nullable: true,
+      },
+      description: "Position in the dictionary of the value in each row",
+    },
+  },
+  required: ["name", "type"],
+} as const;
+
 export const $SQLJoinNode = {
   type: "object",
   properties: {
@@ -1519,6 +1672,17 @@ export const $SqlNodeTypeEnum = {
 * \`SetOp\` - SetOp`,
 } as const;
 
+export const $Submission = {
+  oneOf: [
+    {
+      $ref: "#/components/schemas/Feedback",
+    },
+    {
+      $ref: "#/components/schemas/QueryExecution",
+    },
+  ],
+} as const;
+
 export const $TableNode = {
   type: "object",
   properties: {
@@ -1637,6 +1801,44 @@ export const $TopNNode = {
   ],
 } as const;
 
+export const $TypeEnum = {
+  enum: [
+    "smallint",
+    "integer",
+    "decimal",
+    "numeric",
+    "real",
+    "float",
+    "double-precision",
+    "char",
+    "varchar",
+    "bit",
+    "bit-varying",
+    "date",
+    "time",
+    "timestamp",
+    "null",
+    "boolean",
+  ],
+  type: "string",
+  description: `* \`smallint\` - smallint
+* \`integer\` - integer
+* \`decimal\` - decimal
+* \`numeric\` - numeric
+* \`real\` - real
+* \`float\` - float
+* \`double-precision\` - double-precision
+* \`char\` - char
+* \`varchar\` - varchar
+* \`bit\` - bit
+* \`bit-varying\` - bit-varying
+* \`date\` - date
+* \`time\` - time
+* \`timestamp\` - timestamp
+* \`null\` - null
+* \`boolean\` - boolean`,
+} as const;
+
 export const $User = {
   type: "object",
   properties: {
@@ -8,6 +8,8 @@ import type {
   AttemptsUpdateResponse,
   AttemptsPartialUpdateData,
   AttemptsPartialUpdateResponse,
+  AttemptsMessagesListData,
+  AttemptsMessagesListResponse,
   AttemptsMessagesCreateData,
   AttemptsMessagesCreateResponse,
   AttemptsSubmitCreateData,
@@ -16,6 +18,8 @@ import type {
   AttemptsSubqueriesExecutionsCreateResponse,
   AttemptsTreeRetrieveData,
   AttemptsTreeRetrieveResponse,
+  AttemptsValidationRetrieveData,
+  AttemptsValidationRetrieveResponse,
   AuthLoginCreateData,
   AuthLoginCreateResponse,
   AuthLogoutCreateResponse,
@@ -82,6 +86,10 @@ import type {
   QueriesDestroyResponse,
   QueriesExecutionsCreateData,
   QueriesExecutionsCreateResponse,
+  QueriesExportRetrieveData,
+  QueriesExportRetrieveResponse,
+  QueriesMessagesListData,
+  QueriesMessagesListResponse,
   QueriesMessagesCreateData,
   QueriesMessagesCreateResponse,
   QueriesSubqueriesExecutionsCreateData,
@@ -90,6 +98,10 @@ import type {
   QueriesTranspileCreateResponse,
   QueriesTreeRetrieveData,
   QueriesTreeRetrieveResponse,
+  QueriesValidationRetrieveData,
+  QueriesValidationRetrieveResponse,
+  ResultsRetrieveData,
+  ResultsRetrieveResponse,
 } from "./types.gen";
 
 export class AttemptsService {
@@ -115,10 +127,11 @@ export class AttemptsService {
   }
 
   /**
+   * Save the fields sent, responding with only those and the ones the save updates.
    * @param data The data for the request.
    * @param data.id A unique integer value identifying this attempt.
    * @param data.requestBody
-   * @returns Attempt
+   * @returns PatchedAttempt
    * @throws ApiError
    */
   public static attemptsPartialUpdate(
@@ -135,6 +148,31 @@ export class AttemptsService {
     });
   }
 
+  /**
+   * Messages with the assistant, most recent first.
+   * @param data The data for the request.
+   * @param data.id A unique integer value identifying this attempt.
+   * @param data.limit Number of results to return per page.
+   * @param data.offset The initial index from which to return the results.
+   * @returns PaginatedMessageList
+   * @throws ApiError
+   */
+  public static attemptsMessagesList(
+    data: AttemptsMessagesListData,
+  ): CancelablePromise<AttemptsMessagesListResponse> {
+    return __request(OpenAPI, {
+      method: "GET",
+      url: "/api/attempts/{id}/messages/",
+      path: {
+        id: data.id,
+      },
+      query: {
+        limit: data.limit,
+        offset: data.offset,
+      },
+    });
+  }
+
   /**
    * @param data The data for the request.
    * @param data.id A unique integer value identifying this attempt.
@@ -159,7 +197,8 @@ export class AttemptsService {
   /**
    * @param data The data for the request.
    * @param data.id A unique integer value identifying this attempt.
-   * @returns Feedback
+   * @param data.limit Number of rows to return, the rest are fetched from the stored result
+   * @returns Submission
    * @throws ApiError
    */
   public static attemptsSubmitCreate(
@@ -171,6 +210,9 @@ export class AttemptsService {
       path: {
         id: data.id,
       },
+      query: {
+        limit: data.limit,
+      },
     });
   }
 
@@ -178,6 +220,8 @@ export class AttemptsService {
    * @param data The data for the request.
    * @param data.id A unique integer value identifying this attempt.
    * @param data.subqueryId
+   * @param data.limit Number of rows to return, the rest are fetched from the stored result
+   * @param data.format
    * @returns QueryExecution
    * @throws ApiError
    */
@@ -191,6 +235,10 @@ export class AttemptsService {
         id: data.id,
         subquery_id: data.subqueryId,
       },
+      query: {
+        format: data.format,
+        limit: data.limit,
+      },
     });
   }
 
@@ -211,6 +259,27 @@ export class AttemptsService {
       },
     });
   }
+
+  /**
+   * Errors in the saved text of the query.
+   *
+   * Kept apart from the query itself, so saving its text never waits on validating it.
+   * @param data The data for the request.
+   * @param data.id A unique integer value identifying this attempt.
+   * @returns QueryValidation
+   * @throws ApiError
+   */
+  public static attemptsValidationRetrieve(
+    data: AttemptsValidationRetrieveData,
+  ): CancelablePromise<AttemptsValidationRetrieveResponse> {
+    return __request(OpenAPI, {
+      method: "GET",
+      url: "/api/attempts/{id}/validation/",
+      path: {
+        id: data.id,
+      },
+    });
+  }
 }
 
 export class AuthService {
@@ -782,10 +851,11 @@ export class QueriesService {
   }
 
   /**
+   * Save the fields sent, responding with only those and the ones the save updates.
    * @param data The data for the request.
    * @param data.id A unique integer value identifying this query.
    * @param data.requestBody
-   * @returns Query
+   * @returns PatchedQuery
    * @throws ApiError
    */
   public static queriesPartialUpdate(
@@ -823,6 +893,8 @@ export class QueriesService {
   /**
    * @param data The data for the request.
    * @param data.id A unique integer value identifying this query.
+   * @param data.limit Number of rows to return, the rest are fetched from the stored result
+   * @param data.format
    * @returns QueryExecution
    * @throws ApiError
    */
@@ -835,6 +907,60 @@ export class QueriesService {
       path: {
         id: data.id,
       },
+      query: {
+        format: data.format,
+        limit: data.limit,
+      },
+    });
+  }
+
+  /**
+   * Rows of the query as a file, streamed from the database as they are fetched.
+   *
+   * Results are capped as they are when the query is executed.
+   * @param data The data for the request.
+   * @param data.id A unique integer value identifying this query.
+   * @param data.fileFormat
+   * @returns string
+   * @throws ApiError
+   */
+  public static queriesExportRetrieve(
+    data: QueriesExportRetrieveData,
+  ): CancelablePromise<QueriesExportRetrieveResponse> {
+    return __request(OpenAPI, {
+      method: "GET",
+      url: "/api/queries/{id}/export/",
+      path: {
+        id: data.id,
+      },
+      query: {
+        file_format: data.fileFormat,
+      },
+    });
+  }
+
+  /**
+   * Messages with the assistant, most recent first.
+   * @param data The data for the request.
+   * @param data.id A unique integer value identifying this query.
+   * @param data.limit Number of results to return per page.
+   * @param data.offset The initial index from which to return the results.
+   * @returns PaginatedMessageList
+   * @throws ApiError
+   */
+  public static queriesMessagesList(
+    data: QueriesMessagesListData,
+  ): CancelablePromise<QueriesMessagesListResponse> {
+    return __request(OpenAPI, {
+      method: "GET",
+      url: "/api/queries/{id}/messages/",
+      path: {
+        id: data.id,
+      },
+      query: {
+        limit: data.limit,
+        offset: data.offset,
+      },
     });
   }
 
@@ -863,6 +989,8 @@ export class QueriesService {
    * @param data The data for the request.
    * @param data.id A unique integer value identifying this query.
    * @param data.subqueryId
+   * @param data.limit Number of rows to return, the rest are fetched from the stored result
+   * @param data.format
    * @returns QueryExecution
    * @throws ApiError
    */
@@ -876,6 +1004,10 @@ export class QueriesService {
         id: data.id,
         subquery_id: data.subqueryId,
       },
+      query: {
+        format: data.format,
+        limit: data.limit,
+      },
     });
   }
 
@@ -914,4 +1046,54 @@ export class QueriesService {
       },
     });
   }
+
+  /**
+   * Errors in the saved text of the query.
+   *
+   * Kept apart from the query itself, so saving its text never waits on validating it.
+   * @param data The data for the request.
+   * @param data.id A unique integer value identifying this query.
+   * @returns QueryValidation
+   * @throws ApiError
+   */
+  public static queriesValidationRetrieve(
+    data: QueriesValidationRetrieveData,
+  ): CancelablePromise<QueriesValidationRetrieveResponse> {
+    return __request(OpenAPI, {
+      method: "GET",
+      url: "/api/queries/{id}/validation/",
+      path: {
+        id: data.id,
+      },
+    });
+  }
+}
+
+export class ResultsService {
+  /**
+   * Rows of a stored result, which never executes the query again.
+   * @param data The data for the request.
+   * @param data.id
+   * @param data.format
+   * @param data.limit
+   * @param data.offset
+   * @returns QueryResultPage
+   * @throws ApiError
+   */
+  public static resultsRetrieve(
+    data: ResultsRetrieveData,
+  ): CancelablePromise<ResultsRetrieveResponse> {
+    return __request(OpenAPI, {
+      method: "GET",
+      url: "/api/results/{id}/",
+      path: {
+        id: data.id,
+      },
+      query: {
+        format: data.format,
+        limit: data.limit,
+        offset: data.offset,
+      },
+    });
+  }
 }
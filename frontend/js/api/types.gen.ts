@@ -16,10 +16,8 @@ export type AliasNode = {
 export type Attempt = {
   readonly id: number;
   text?: string;
-  readonly validation_errors: Array<QueryError>;
   completed?: boolean;
   readonly language: LanguageEnum;
-  readonly assistant_messages: Array<Message>;
 };
 
 /**
@@ -28,6 +26,57 @@ export type Attempt = {
  */
 export type AuthorEnum = "user" | "assistant";
 
+export type ColumnarQueryExecution = {
+  /**
+   * Query result data if the query execution was successful
+   */
+  results?: ColumnarQueryResult;
+  /**
+   * Identifies the stored result, to fetch its rows a page at a time. Missing if the result was too large to keep
+   */
+  result_id?: string;
+  /**
+   * Number of rows in the whole result
+   */
+  count?: number;
+  /**
+   * Reason the query was not executed, if it was rejected
+   */
+  error?: QueryError;
+  /**
+   * Indicates if the query execution was successful
+   */
+  success: boolean;
+};
+
+export type ColumnarQueryResult = {
+  columns: Array<ResultColumn>;
+  /**
+   * Number of rows in the result
+   */
+  length: number;
+  /**
+   * Set when only the first rows of the result were fetched
+   */
+  truncated?: boolean;
+};
+
+export type ColumnarQueryResultPage = {
+  /**
+   * Number of rows in the whole result
+   */
+  count: number;
+  /**
+   * Link to the next page of rows
+   */
+  next: string | null;
+  /**
+   * Link to the previous page of rows
+   */
+  previous: string | null;
+  results: ColumnarQueryResult;
+};
+
 export type Database = {
   readonly id: number;
   name: string;
@@ -114,6 +163,14 @@ export type ExerciseSummary = {
 export type Feedback = {
   correct: boolean;
   results?: QueryResultData;
+  /**
+   * Identifies the stored result, to fetch its rows a page at a time. Missing if the result was too large to keep
+   */
+  result_id?: string;
+  /**
+   * Number of rows in the whole result
+   */
+  count?: number;
 };
 
 export type GroupByNode = {
@@ -176,6 +233,13 @@ export type OuterJoinNode = {
   condition?: string;
 };
 
+export type PaginatedMessageList = {
+  count: number;
+  next?: string | null;
+  previous?: string | null;
+  results: Array<Message>;
+};
+
 export type PaginatedUserList = {
   count: number;
   next?: string | null;
@@ -192,10 +256,8 @@ export type PasswordResetConfirm = {
 export type PatchedAttempt = {
   readonly id?: number;
   text?: string;
-  readonly validation_errors?: Array<QueryError>;
   completed?: boolean;
   readonly language?: LanguageEnum;
-  readonly assistant_messages?: Array<Message>;
 };
 
 export type PatchedProject = {
@@ -216,8 +278,6 @@ export type PatchedQuery = {
   language?: LanguageEnum;
   readonly created?: string;
   readonly modified?: string;
-  readonly validation_errors?: Array<QueryError>;
-  readonly assistant_messages?: Array<Message>;
 };
 
 export type PatchedUser = {
@@ -253,8 +313,6 @@ export type Query = {
   language: LanguageEnum;
   readonly created: string;
   readonly modified: string;
-  readonly validation_errors: Array<QueryError>;
-  readonly assistant_messages: Array<Message>;
 };
 
 export type QueryError = {
@@ -269,6 +327,18 @@ export type QueryExecution = {
    * Query result data if the query execution was successful
    */
   results?: QueryResultData;
+  /**
+   * Identifies the stored result, to fetch its rows a page at a time. Missing if the result was too large to keep
+   */
+  result_id?: string;
+  /**
+   * Number of rows in the whole result
+   */
+  count?: number;
+  /**
+   * Reason the query was not executed, if it was rejected
+   */
+  error?: QueryError;
   /**
    * Indicates if the query execution was successful
    */
@@ -284,6 +354,26 @@ export type QueryResultData = {
    * List of query result rows
    */
   rows: Array<Array<string | null>>;
+  /**
+   * Set when only the first rows of the result were fetched
+   */
+  truncated?: boolean;
+};
+
+export type QueryResultPage = {
+  /**
+   * Number of rows in the whole result
+   */
+  count: number;
+  /**
+   * Link to the next page of rows
+   */
+  next: string | null;
+  /**
+   * Link to the previous page of rows
+   */
+  previous: string | null;
+  results: QueryResultData;
 };
 
 export type QuerySummary = {
@@ -297,6 +387,10 @@ export type QueryTree = {
   readonly ra_tree: RATree;
 };
 
+export type QueryValidation = {
+  readonly validation_errors: Array<QueryError>;
+};
+
 export type RAJoinNode = {
   id: number;
   readonly children: Array<RATree>;
@@ -360,6 +454,23 @@ export type RenameNode = {
   alias: string;
 };
 
+export type ResultColumn = {
+  name: string;
+  type: TypeEnum;
+  /**
+   * Values of the column, unless it is dictionary-encoded
+   */
+  values?: Array<unknown | null>;
+  /**
+   * Distinct values of a dictionary-encoded column
+   */
+  dictionary?: Array<string>;
+  /**
+   * Position in the dictionary of the value in each row
+   */
+  indices?: Array<number | null>;
+};
+
 export type SQLJoinNode = {
   id: number;
   readonly children: Array<SQLTree>;
@@ -449,6 +560,8 @@ export type SqlNodeTypeEnum =
   | "OrderBy"
   | "SetOp";
 
+export type Submission = Feedback | QueryExecution;
+
 export type TableNode = {
   id: number;
   readonly children: Array<SQLTree>;
@@ -474,6 +587,42 @@ export type TopNNode = {
   attribute: string;
 };
 
+/**
+ * * `smallint` - smallint
+ * * `integer` - integer
+ * * `decimal` - decimal
+ * * `numeric` - numeric
+ * * `real` - real
+ * * `float` - float
+ * * `double-precision` - double-precision
+ * * `char` - char
+ * * `varchar` - varchar
+ * * `bit` - bit
+ * * `bit-varying` - bit-varying
+ * * `date` - date
+ * * `time` - time
+ * * `timestamp` - timestamp
+ * * `null` - null
+ * * `boolean` - boolean
+ */
+export type TypeEnum =
+  | "smallint"
+  | "integer"
+  | "decimal"
+  | "numeric"
+  | "real"
+  | "float"
+  | "double-precision"
+  | "char"
+  | "varchar"
+  | "bit"
+  | "bit-varying"
+  | "date"
+  | "time"
+  | "timestamp"
+  | "null"
+  | "boolean";
+
 export type User = {
   readonly id: number;
   email: string;
@@ -517,7 +666,24 @@ export type AttemptsPartialUpdateData = {
   requestBody?: PatchedAttempt;
 };
 
-export type AttemptsPartialUpdateResponse = Attempt;
+export type AttemptsPartialUpdateResponse = PatchedAttempt;
+
+export type AttemptsMessagesListData = {
+  /**
+   * A unique integer value identifying this attempt.
+   */
+  id: number;
+  /**
+   * Number of results to return per page.
+   */
+  limit?: number;
+  /**
+   * The initial index from which to return the results.
+   */
+  offset?: number;
+};
+
+export type AttemptsMessagesListResponse = PaginatedMessageList;
 
 export type AttemptsMessagesCreateData = {
   /**
@@ -534,15 +700,24 @@ export type AttemptsSubmitCreateData = {
    * A unique integer value identifying this attempt.
    */
   id: number;
+  /**
+   * Number of rows to return, the rest are fetched from the stored result
+   */
+  limit?: number;
 };
 
-export type AttemptsSubmitCreateResponse = Feedback;
+export type AttemptsSubmitCreateResponse = Submission;
 
 export type AttemptsSubqueriesExecutionsCreateData = {
+  format?: "columnar" | "json" | "msgpack";
   /**
    * A unique integer value identifying this attempt.
    */
   id: number;
+  /**
+   * Number of rows to return, the rest are fetched from the stored result
+   */
+  limit?: number;
   subqueryId: number;
 };
 
@@ -557,6 +732,15 @@ export type AttemptsTreeRetrieveData = {
 
 export type AttemptsTreeRetrieveResponse = QueryTree;
 
+export type AttemptsValidationRetrieveData = {
+  /**
+   * A unique integer value identifying this attempt.
+   */
+  id: number;
+};
+
+export type AttemptsValidationRetrieveResponse = QueryValidation;
+
 export type AuthLoginCreateData = {
   requestBody: Login;
 };
@@ -791,7 +975,7 @@ export type QueriesPartialUpdateData = {
   requestBody?: PatchedQuery;
 };
 
-export type QueriesPartialUpdateResponse = Query;
+export type QueriesPartialUpdateResponse = PatchedQuery;
 
 export type QueriesDestroyData = {
   /**
@@ -803,14 +987,46 @@ export type QueriesDestroyData = {
 export type QueriesDestroyResponse = void;
 
 export type QueriesExecutionsCreateData = {
+  format?: "columnar" | "json" | "msgpack";
   /**
    * A unique integer value identifying this query.
    */
   id: number;
+  /**
+   * Number of rows to return, the rest are fetched from the stored result
+   */
+  limit?: number;
 };
 
 export type QueriesExecutionsCreateResponse = QueryExecution;
 
+export type QueriesExportRetrieveData = {
+  fileFormat?: "csv" | "ndjson";
+  /**
+   * A unique integer value identifying this query.
+   */
+  id: number;
+};
+
+export type QueriesExportRetrieveResponse = string;
+
+export type QueriesMessagesListData = {
+  /**
+   * A unique integer value identifying this query.
+   */
+  id: number;
+  /**
+   * Number of results to return per page.
+   */
+  limit?: number;
+  /**
+   * The initial index from which to return the results.
+   */
+  offset?: number;
+};
+
+export type QueriesMessagesListResponse = PaginatedMessageList;
+
 export type QueriesMessagesCreateData = {
   /**
    * A unique integer value identifying this query.
@@ -822,10 +1038,15 @@ export type QueriesMessagesCreateData = {
 export type QueriesMessagesCreateResponse = Message;
 
 export type QueriesSubqueriesExecutionsCreateData = {
+  format?: "columnar" | "json" | "msgpack";
   /**
    * A unique integer value identifying this query.
    */
   id: number;
+  /**
+   * Number of rows to return, the rest are fetched from the stored result
+   */
+  limit?: number;
   subqueryId: number;
 };
 
@@ -849,6 +1070,24 @@ export type QueriesTreeRetrieveData = {
 
 export type QueriesTreeRetrieveResponse = QueryTree;
 
+export type QueriesValidationRetrieveData = {
+  /**
+   * A unique integer value identifying this query.
+   */
+  id: number;
+};
+
+export type QueriesValidationRetrieveResponse = QueryValidation;
+
+export type ResultsRetrieveData = {
+  format?: "columnar" | "json" | "msgpack";
+  id: string;
+  limit?: number;
+  offset?: number;
+};
+
+export type ResultsRetrieveResponse = QueryResultPage;
+
 export type $OpenApiTs = {
   "/api/attempts/{id}/": {
     put: {
@@ -860,11 +1099,17 @@ export type $OpenApiTs = {
     patch: {
       req: AttemptsPartialUpdateData;
       res: {
-        200: Attempt;
+        200: PatchedAttempt;
       };
     };
   };
   "/api/attempts/{id}/messages/": {
+    get: {
+      req: AttemptsMessagesListData;
+      res: {
+        200: PaginatedMessageList;
+      };
+    };
     post: {
       req: AttemptsMessagesCreateData;
       res: {
@@ -876,7 +1121,8 @@ export type $OpenApiTs = {
     post: {
       req: AttemptsSubmitCreateData;
       res: {
-        200: Feedback;
+        200: Submission;
+        503: QueryExecution;
       };
     };
   };
@@ -885,6 +1131,7 @@ export type $OpenApiTs = {
       req: AttemptsSubqueriesExecutionsCreateData;
       res: {
         200: QueryExecution;
+        503: QueryExecution;
       };
     };
   };
@@ -896,6 +1143,14 @@ export type $OpenApiTs = {
       };
     };
   };
+  "/api/attempts/{id}/validation/": {
+    get: {
+      req: AttemptsValidationRetrieveData;
+      res: {
+        200: QueryValidation;
+      };
+    };
+  };
   "/api/auth/login/": {
     post: {
       req: AuthLoginCreateData;
@@ -1144,7 +1399,7 @@ export type $OpenApiTs = {
     patch: {
       req: QueriesPartialUpdateData;
       res: {
-        200: Query;
+        200: PatchedQuery;
       };
     };
     delete: {
@@ -1162,10 +1417,27 @@ export type $OpenApiTs = {
       req: QueriesExecutionsCreateData;
       res: {
         200: QueryExecution;
+        503: QueryExecution;
+      };
+    };
+  };
+  "/api/queries/{id}/export/": {
+    get: {
+      req: QueriesExportRetrieveData;
+      res: {
+        200: string;
+        400: QueryExecution;
+        503: QueryExecution;
       };
     };
   };
   "/api/queries/{id}/messages/": {
+    get: {
+      req: QueriesMessagesListData;
+      res: {
+        200: PaginatedMessageList;
+      };
+    };
     post: {
       req: QueriesMessagesCreateData;
       res: {
@@ -1178,6 +1450,7 @@ export type $OpenApiTs = {
       req: QueriesSubqueriesExecutionsCreateData;
       res: {
         200: QueryExecution;
+        503: QueryExecution;
       };
     };
   };
@@ -1197,4 +1470,20 @@ export type $OpenApiTs = {
       };
     };
   };
+  "/api/queries/{id}/validation/": {
+    get: {
+      req: QueriesValidationRetrieveData;
+      res: {
+        200: QueryValidation;
+      };
+    };
+  };
+  "/api/results/{id}/": {
+    get: {
+      req: ResultsRetrieveData;
+      res: {
+        200: QueryResultPage;
+      };
+    };
+  };
 };
@@ -1,24 +1,27 @@
 import { useEffect, useState } from "react";
 
-import { Attempt, Message, Query } from "api";
+import { Attempt, Message, PaginatedMessageList, Query } from "api";
 
 import { Chat } from "../ui/chat";
 import { Message as ChatMessage } from "../ui/chat-message";
 
 type AssistantProps = {
   query: Query | Attempt;
+  fetchMessagesApi: (args: {
+    id: number;
+    offset?: number;
+  }) => Promise<PaginatedMessageList>;
   sendMessageApi: (args: {
     id: number;
     requestBody: Message;
   }) => Promise<Message>;
   suggestions?: string[];
-  onUnmount?: () => Promise<void>;
 };
 
 const Assistant = ({
   query,
+  fetchMessagesApi,
   sendMessageApi,
-  onUnmount,
   suggestions = [],
 }: AssistantProps) => {
   const toChatMessage = ({ id, content, author }: Message): ChatMessage => ({
@@ -27,15 +30,24 @@ const Assistant = ({
     role: author,
   });
 
-  const [messages, setMessages] = useState<ChatMessage[]>(
-    query.assistant_messages.map((message) => toChatMessage(message)),
-  );
+  const [messages, setMessages] = useState<ChatMessage[]>([]);
 
   useEffect(() => {
-    return () => {
-      onUnmount?.();
+    const fetchMessages = async () => {
+      // The most recent messages come first, a page at a time
+      const history: Message[] = [];
+      let page: PaginatedMessageList;
+      do {
+        page = await fetchMessagesApi({ id: query.id, offset: history.length });
+        history.push(...page.results);
+      } while (page.next && page.results.length > 0);
+      setMessages((newMessages) => [
+        ...history.reverse().map((message) => toChatMessage(message)),
+        ...newMessages,
+      ]);
     };
-  }, [onUnmount]);
+    fetchMessages();
+  }, [query.id]);
 
   const [input, setInput] = useState<string>("");
   const [isGenerating, setIsGenerating] = useState<boolean>(false);
@@ -22,12 +22,17 @@ const SubmitAttemptButton = ({
   const submitAttempt = async (attempt: Attempt): Promise<void> => {
     setIsSubmitting(true);
     try {
-      const feedback = await AttemptsService.attemptsSubmitCreate({
+      const submission = await AttemptsService.attemptsSubmitCreate({
         id: attempt.id,
       });
 
-      setCorrect(feedback.correct);
-      setFeedback(feedback);
+      // Attempts too expensive to run are turned away, with the reason why
+      if (!("correct" in submission)) {
+        toast(submission.error ?? { title: "Error submitting attempt" });
+        return;
+      }
+      setCorrect(submission.correct);
+      setFeedback(submission);
     } catch (err) {
       toast({
         title: "Error submitting attempt",
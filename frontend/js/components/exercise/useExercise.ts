@@ -1,11 +1,12 @@
 import { useEffect, useState } from "react";
 
 import { Attempt, AttemptsService, Exercise, ExercisesService } from "api";
+import { Validated } from "components/query/types";
 import { useErrorToast } from "hooks/useErrorToast";
 
 export const useExercise = (exerciseId: number) => {
   const [exercise, setExercise] = useState<Exercise>();
-  const [attempt, setAttempt] = useState<Attempt>();
+  const [attempt, setAttempt] = useState<Validated<Attempt>>();
   const toast = useErrorToast();
 
   const fetchExercise = async () => {
@@ -13,8 +14,11 @@ export const useExercise = (exerciseId: number) => {
       const result = await ExercisesService.exercisesRetrieve({
         id: exerciseId,
       });
+      const validation = await AttemptsService.attemptsValidationRetrieve({
+        id: result.attempt.id,
+      });
       setExercise(result);
-      setAttempt(result.attempt);
+      setAttempt({ ...result.attempt, ...validation });
     } catch {
       toast({ title: "Error loading exercise" });
     }
@@ -26,11 +30,17 @@ export const useExercise = (exerciseId: number) => {
 
   const updateText = async (value: string) => {
     if (!attempt) return;
-    const updated = await AttemptsService.attemptsPartialUpdate({
+    // Saves only respond with the fields they change, and are validated after
+    const changes = await AttemptsService.attemptsPartialUpdate({
       id: attempt.id,
       requestBody: { text: value },
     });
-    setAttempt(updated);
+    const validation = await AttemptsService.attemptsValidationRetrieve({
+      id: attempt.id,
+    });
+    setAttempt(
+      (attempt) => attempt && { ...attempt, ...changes, ...validation },
+    );
   };
 
   return { exercise, attempt, fetchExercise, setAttempt, updateText };
@@ -9,6 +9,7 @@ import QueryEditor from "../query/QueryEditor";
 import ErrorAlert from "../query/QueryEditor/ErrorAlert";
 import QueryPage from "../query/QueryPage";
 import TranspileQueryButton from "../query/TranspileQueryButton";
+import { Validated } from "../query/types";
 import { Spinner } from "../ui/spinner";
 
 import { useProjectQuery } from "./useProjectQuery";
@@ -71,6 +72,7 @@ const ProjectQuery = ({
       {tab === Tab.Assistant && query && (
         <Assistant
           key={query.id}
+          fetchMessagesApi={QueriesService.queriesMessagesList}
           query={query}
           sendMessageApi={QueriesService.queriesMessagesCreate}
         />
@@ -80,11 +82,11 @@ const ProjectQuery = ({
 };
 
 type ProjectQueryEditorProps = {
-  query?: Query;
+  query?: Validated<Query>;
   isLoading: boolean;
   loadingError?: Error;
   updateText: (text: string) => Promise<void>;
-  setQuery: (query: Query) => void;
+  setQuery: (query: Validated<Query>) => void;
 };
 
 const ProjectQueryEditor = ({
@@ -116,7 +118,7 @@ const ProjectQueryEditor = ({
       <QueryEditor
         key={query.id}
         query={query}
-        setQuery={(query) => setQuery(query as Query)}
+        setQuery={(query) => setQuery(query as Validated<Query>)}
         updateText={updateText}
       />
     );
@@ -125,7 +127,7 @@ const ProjectQueryEditor = ({
 };
 
 type ProjectQueryHeaderProps = {
-  query?: Query;
+  query?: Validated<Query>;
   tab: Tab;
   setQueryId: (queryId?: number) => void;
   setQueryResult: (result?: QueryResultData) => void;
@@ -1,9 +1,10 @@
 import { useEffect, useState } from "react";
 
-import { QueriesService, Query, QueryResultData } from "api";
+import { PatchedQuery, QueriesService, Query, QueryResultData } from "api";
+import { Validated } from "components/query/types";
 
 export const useProjectQuery = (queryId?: number) => {
-  const [query, setQuery] = useState<Query>();
+  const [query, setQuery] = useState<Validated<Query>>();
   const [queryResult, setQueryResult] = useState<QueryResultData>();
   const [isLoading, setIsLoading] = useState(false);
   const [loadingError, setLoadingError] = useState<Error | null>();
@@ -17,8 +18,11 @@ export const useProjectQuery = (queryId?: number) => {
       }
       setIsLoading(true);
       try {
-        const result = await QueriesService.queriesRetrieve({ id: queryId });
-        setQuery(result);
+        const [result, validation] = await Promise.all([
+          QueriesService.queriesRetrieve({ id: queryId }),
+          QueriesService.queriesValidationRetrieve({ id: queryId }),
+        ]);
+        setQuery({ ...result, ...validation });
         setLoadingError(null);
       } catch (err) {
         if (err instanceof Error) {
@@ -31,13 +35,22 @@ export const useProjectQuery = (queryId?: number) => {
     fetchQuery();
   }, [queryId]);
 
+  // Saves only respond with the fields they change, and are validated after
+  const applyChanges = async (changes: PatchedQuery) => {
+    if (!queryId) return;
+    const validation = await QueriesService.queriesValidationRetrieve({
+      id: queryId,
+    });
+    setQuery((query) => query && { ...query, ...changes, ...validation });
+  };
+
   const updateText = async (value: string) => {
     if (!queryId) return;
-    const result = await QueriesService.queriesPartialUpdate({
+    const changes = await QueriesService.queriesPartialUpdate({
       id: queryId,
       requestBody: { text: value },
     });
-    setQuery(result);
+    await applyChanges(changes);
   };
 
   return {
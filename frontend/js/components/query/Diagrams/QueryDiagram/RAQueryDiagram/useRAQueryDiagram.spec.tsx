@@ -1,7 +1,8 @@
 import { renderHook, waitFor } from "@testing-library/react";
 import { ReactNode } from "react";
 
-import { Query, RATree } from "api";
+import { RATree } from "api";
+import { Query } from "components/query/types";
 import { QueryContext } from "contexts/QueryContext";
 
 import useRAQueryDiagram from "./useRAQueryDiagram";
@@ -60,7 +61,6 @@ describe("useRAQueryDiagram", () => {
     modified: new Date().toISOString(),
     validation_errors: [],
     language: "ra",
-    assistant_messages: [],
   };
 
   beforeEach(() => {
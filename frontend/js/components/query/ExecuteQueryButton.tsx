@@ -8,7 +8,13 @@ import {
   TooltipContent,
   TooltipTrigger,
 } from "@/components/ui/tooltip";
-import { QueriesService, Query, QueryResultData } from "api";
+import {
+  ApiError,
+  QueriesService,
+  Query,
+  QueryExecution,
+  QueryResultData,
+} from "api";
 import { useErrorToast } from "hooks/useErrorToast";
 
 type ExecuteQueryButtonProps = {
@@ -35,10 +41,16 @@ const ExecuteQueryButton = ({
       });
 
       setQueryResult(execution.results);
+      if (execution.error) {
+        toast(execution.error);
+      }
     } catch (err) {
-      toast({
-        title: "Error executing query",
-      });
+      // Busy databases explain why the query was turned away
+      const error =
+        err instanceof ApiError
+          ? (err.body as QueryExecution | undefined)?.error
+          : undefined;
+      toast(error ?? { title: "Error executing query" });
     } finally {
       setIsExecuting(false);
     }
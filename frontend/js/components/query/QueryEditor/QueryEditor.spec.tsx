@@ -1,7 +1,7 @@
 import { render, screen } from "@testing-library/react";
 
 import "@testing-library/jest-dom";
-import { Query } from "api";
+import { Query } from "components/query/types";
 
 import RAEditor from "./RAEditor";
 import SQLEditor from "./SQLEditor";
@@ -28,7 +28,6 @@ describe("QueryEditor", () => {
     created: new Date().toISOString(),
     modified: new Date().toISOString(),
     validation_errors: [],
-    assistant_messages: [],
   };
 
   const mockRAQuery: Query = {
@@ -2,7 +2,8 @@ import { render, screen } from "@testing-library/react";
 import "@testing-library/jest-dom";
 import { userEvent } from "@testing-library/user-event";
 
-import { QueriesService, Query } from "api";
+import { QueriesService } from "api";
+import { Query } from "components/query/types";
 import { useAutosave } from "hooks/useAutosave";
 
 import RAEditor from ".";
@@ -36,7 +37,6 @@ describe("RAEditor", () => {
     created: new Date().toISOString(),
     modified: new Date().toISOString(),
     validation_errors: [],
-    assistant_messages: [],
   };
 
   const mockUpdateText = jest.fn();
@@ -3,7 +3,8 @@ import { render, screen } from "@testing-library/react";
 import "@testing-library/jest-dom";
 import { editor } from "monaco-editor";
 
-import { QueriesService, Query } from "api";
+import { QueriesService } from "api";
+import { Query } from "components/query/types";
 import { useAutosave } from "hooks/useAutosave";
 
 import SQLEditor from ".";
@@ -46,7 +47,6 @@ describe("SQLEditor", () => {
     created: new Date().toISOString(),
     modified: new Date().toISOString(),
     validation_errors: [],
-    assistant_messages: [],
   };
 
   const mockUpdateText = jest.fn();
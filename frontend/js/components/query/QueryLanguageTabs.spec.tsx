@@ -25,8 +25,6 @@ describe("QueryLanguageTabs", () => {
     language: "sql",
     created: new Date().toISOString(),
     modified: new Date().toISOString(),
-    validation_errors: [],
-    assistant_messages: [],
   };
 
   const mockSetQuery = jest.fn();
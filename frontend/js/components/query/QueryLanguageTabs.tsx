@@ -31,13 +31,13 @@ const QueryLanguageTabs = ({
     setIsLoading(true);
     setLanguage(newLanguage);
     try {
-      const updatedQuery = await QueriesService.queriesPartialUpdate({
+      const changes = await QueriesService.queriesPartialUpdate({
         id: query.id,
         requestBody: {
           language: newLanguage,
         },
       });
-      setQuery(updatedQuery);
+      setQuery({ ...query, ...changes });
     } catch (err) {
       setLanguage(oldLanguage);
       toast({
@@ -15,6 +15,7 @@ import ProjectQuery from "../project/ProjectQuery";
 import { DiagramsProps } from "./Diagrams";
 import QueryEditor from "./QueryEditor";
 import QueryResult from "./QueryResult";
+import { Validated } from "./types";
 
 jest.mock("api");
 const mockToast = jest.fn();
@@ -41,7 +42,7 @@ jest.mock("./Diagrams", () => {
 });
 
 describe("ProjectQuery", () => {
-  const mockQuery: Query = {
+  const mockQuery: Validated<Query> = {
     id: 1,
     name: "Test Query",
     text: "SELECT * FROM users",
@@ -49,7 +50,6 @@ describe("ProjectQuery", () => {
     created: new Date().toISOString(),
     modified: new Date().toISOString(),
     validation_errors: [],
-    assistant_messages: [],
   };
 
   const mockExecutionResult = {
@@ -80,6 +80,9 @@ describe("ProjectQuery", () => {
   beforeEach(() => {
     jest.clearAllMocks();
     (QueriesService.queriesRetrieve as jest.Mock).mockResolvedValue(mockQuery);
+    (QueriesService.queriesValidationRetrieve as jest.Mock).mockResolvedValue({
+      validation_errors: mockQuery.validation_errors,
+    });
     (QueriesService.queriesExecutionsCreate as jest.Mock).mockResolvedValue(
       mockExecutionResult,
     );
@@ -5,9 +5,13 @@ import {
   Query as ProjectQuery,
   QueriesSubqueriesExecutionsCreateResponse,
   QueriesTreeRetrieveResponse,
+  QueryValidation,
 } from "api";
 
-export type Query = ProjectQuery | Attempt;
+// Queries are validated apart from being fetched and saved
+export type Validated<T> = T & QueryValidation;
+
+export type Query = Validated<ProjectQuery | Attempt>;
 
 type SubqueriesResponse =
   | QueriesTreeRetrieveResponse
@@ -101,10 +101,10 @@ const ExercisePage = () => {
           )}
           {tab === Tab.Assistant && attempt && (
             <Assistant
+              fetchMessagesApi={AttemptsService.attemptsMessagesList}
               query={attempt}
               sendMessageApi={AttemptsService.attemptsMessagesCreate}
               suggestions={["How can I approach this problem?"]}
-              onUnmount={fetchExercise}
             />
           )}
           {tab === Tab.Feedback && feedback && (